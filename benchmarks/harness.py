@@ -0,0 +1,153 @@
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Setup runs once per case; the returned callable is the measured operation.
+Setup = Callable[[], Callable[[], None]]
+
+
+@dataclass
+class Result:
+    name: str
+    ops_per_sec: float
+    p50_us: float
+    p95_us: float
+    p99_us: float
+    peak_kib: float
+    iterations: int
+
+
+def measure(name: str, setup: Setup, iterations: int, warmup: int = 3) -> Result:
+    """
+    Times `iterations` calls of the operation built by `setup` (one fresh setup for
+    timing, another under tracemalloc for peak memory, so tracing doesn't skew timings).
+    """
+    op = setup()
+    for _ in range(warmup):
+        op()
+
+    gc.collect()
+    gc.disable()
+    samples: List[float] = []
+    try:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            t0 = time.perf_counter_ns()
+            op()
+            samples.append((time.perf_counter_ns() - t0) / 1000.0)
+        elapsed = time.perf_counter() - start
+    finally:
+        gc.enable()
+
+    op = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        op()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples.sort()
+    return Result(
+        name=name,
+        ops_per_sec=iterations / elapsed if elapsed else float("inf"),
+        p50_us=statistics.median(samples),
+        p95_us=_percentile(samples, 95),
+        p99_us=_percentile(samples, 99),
+        peak_kib=peak / 1024.0,
+        iterations=iterations,
+    )
+
+
+def retained_bytes(build: Callable[[], object]) -> int:
+    """Memory still held by what `build` returns (allocations it freed don't count)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        kept = build()
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def _percentile(sorted_samples: List[float], pct: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    k = min(len(sorted_samples) - 1, int(round(pct / 100.0 * (len(sorted_samples) - 1))))
+    return sorted_samples[k]
+
+
+# -------------------------
+# Reporting / baselines
+# -------------------------
+def print_table(results: List[Result], baseline: Optional[Dict[str, dict]] = None) -> None:
+    header = f"{'benchmark':<48} {'ops/s':>12} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'peak KiB':>10}"
+    if baseline is not None:
+        header += f" {'vs base':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        line = (
+            f"{r.name:<48} {r.ops_per_sec:>12.1f} {r.p50_us:>10.1f} "
+            f"{r.p95_us:>10.1f} {r.p99_us:>10.1f} {r.peak_kib:>10.1f}"
+        )
+        if baseline is not None:
+            base = baseline.get(r.name)
+            line += f" {_change(r, base):>9}" if base else f" {'new':>9}"
+        print(line)
+
+
+def print_footprints(footprints: List[Tuple[str, int, int]]) -> None:
+    """(name, bytes retained, tasks) rows."""
+    header = f"{'footprint':<48} {'tasks':>12} {'KiB':>10} {'bytes/task':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, size, tasks in footprints:
+        print(f"{name:<48} {tasks:>12} {size / 1024.0:>10.1f} {size / max(1, tasks):>10.1f}")
+
+
+def _change(result: Result, base: dict) -> str:
+    ratio = result.ops_per_sec / base["ops_per_sec"] - 1.0 if base["ops_per_sec"] else 0.0
+    return f"{ratio:+.1%}"
+
+
+def regressions(results: List[Result], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Benchmarks whose throughput fell more than `threshold` (0.15 = 15%) below the baseline."""
+    slower = []
+    for r in results:
+        base = baseline.get(r.name)
+        if base and base["ops_per_sec"] and r.ops_per_sec < base["ops_per_sec"] * (1.0 - threshold):
+            slower.append(f"{r.name}: {r.ops_per_sec:.1f} ops/s vs {base['ops_per_sec']:.1f} baseline")
+    return slower
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, dict]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    return {row["name"]: row for row in data["results"]}
+
+
+def save_results(path: Path, results: List[Result]) -> None:
+    """Stores results with the machine they ran on (baselines only compare on the same box)."""
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "results": [asdict(r) for r in results],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
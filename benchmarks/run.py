@@ -0,0 +1,453 @@
+"""
+Benchmarks for the store, merge, render and repository hot paths.
+
+    python -m benchmarks.run                      # 100 / 10k / 100k tasks
+    python -m benchmarks.run --sizes 100,10000 --only store
+    python -m benchmarks.run --save               # record benchmarks/baseline.json
+    python -m benchmarks.run --compare            # fail on >15% throughput regressions
+    python -m benchmarks.run --only footprint       # bytes per cached task
+    python -m benchmarks.run --only sessions        # many web sessions, with/without the shared cache
+
+Baselines are machine-specific: record and compare them on the same box.
+"""
+import argparse
+import asyncio
+import itertools
+import sys
+import tempfile
+from collections import deque
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from benchmarks.harness import (  # noqa: E402
+    Result,
+    Setup,
+    load_baseline,
+    measure,
+    print_footprints,
+    print_table,
+    regressions,
+    retained_bytes,
+    save_results,
+)
+from todoesvan.data.model import PageCursor, Task, TaskBatch  # noqa: E402
+from todoesvan.data.repositories.base import TaskRepository  # noqa: E402
+from todoesvan.data.repositories.cached_repository import SharedCacheRepository  # noqa: E402
+from todoesvan.data.repositories.memory_repository import InMemoryTaskRepository  # noqa: E402
+from todoesvan.data.repositories.sqlite_repository import SqliteTaskRepository  # noqa: E402
+from todoesvan.data.repositories.threaded_repository import ThreadedTaskRepository  # noqa: E402
+from todoesvan.services.task_service import AsyncTaskService, TaskService  # noqa: E402
+from todoesvan.state.task_store import TaskStore  # noqa: E402
+
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+DEFAULT_SIZES = (100, 10_000, 100_000)
+IN_FLIGHT = (0, 100)
+SESSIONS = 20  # browser sessions connecting at once (web mode)
+COMPLETED_EVERY = 4  # one task in four starts completed
+
+
+class SyncScheduler:
+    """
+    Deterministic stand-in for page.run_task: coroutines are queued and only run
+    when drain() is called. With discard=True they're dropped instead, which keeps
+    optimistic ops queued (in flight) for as long as the benchmark wants.
+    """
+
+    def __init__(self, discard: bool = False):
+        self.discard = discard
+        self.loop = asyncio.new_event_loop()
+        self._queue: Deque[Tuple[Callable[..., Any], Tuple[Any, ...]]] = deque()
+
+    def __call__(self, fn: Callable[..., Any], *args: Any) -> None:
+        if not self.discard:
+            self._queue.append((fn, args))
+
+    def drain(self) -> None:
+        while self._queue:
+            fn, args = self._queue.popleft()
+            self.loop.run_until_complete(fn(*args))
+
+
+def _iterations(n: int) -> int:
+    return max(10, min(2000, 2_000_000 // n))
+
+
+# -------------------------
+# Fixtures (cached per size: building 100k rows once is enough). Cases that
+# write get a fresh_* copy, so the shared ones stay as built.
+# -------------------------
+def _subjects(n: int) -> List[str]:
+    return [f"Task {i}" for i in range(n)]
+
+
+def _fill(repo: TaskRepository, n: int) -> TaskRepository:
+    created = repo.bulk_create(_subjects(n))
+    repo.bulk_set_completed([t.id for t in created[::COMPLETED_EVERY]], True)
+    return repo
+
+
+@lru_cache(maxsize=None)
+def memory_repo(n: int) -> InMemoryTaskRepository:
+    return _fill(InMemoryTaskRepository(), n)
+
+
+_tmp = tempfile.TemporaryDirectory(prefix="todoesvan-bench-")
+
+
+@lru_cache(maxsize=None)
+def sqlite_repo(n: int) -> SqliteTaskRepository:
+    return _fill(SqliteTaskRepository(str(Path(_tmp.name) / f"tasks-{n}.sqlite3")), n)
+
+
+def fresh_memory_repo(n: int) -> InMemoryTaskRepository:
+    return _fill(InMemoryTaskRepository(), n)
+
+
+_fresh_ids = itertools.count()
+
+
+def fresh_sqlite_repo(n: int) -> SqliteTaskRepository:
+    path = Path(_tmp.name) / f"tasks-{n}-{next(_fresh_ids)}.sqlite3"
+    return _fill(SqliteTaskRepository(str(path)), n)
+
+
+def _store(
+    n: int, in_flight: int, discard: bool, repo: Optional[TaskRepository] = None
+) -> Tuple[TaskStore, SyncScheduler]:
+    """
+    Store with all n tasks loaded, plus `in_flight` queued optimistic toggles. Its writes
+    land in `repo` (default: the shared fixture, so only with discard=True or read-only).
+    """
+    scheduler = SyncScheduler()
+    store = TaskStore(
+        service=TaskService(repo or memory_repo(n)),
+        schedule=scheduler,
+        on_change=lambda changes: None,
+        on_error=lambda msg: None,
+        page_size=n,
+        flush_window=0.0,
+        frame_interval=0.0,
+    )
+    store.warm_cache_both()
+    scheduler.drain()
+
+    scheduler.discard = True
+    for task in list(store.tasks(False))[:in_flight]:
+        store.toggle_completed(task.id, True)
+    store.flush()
+    scheduler.discard = discard
+    return store, scheduler
+
+
+# -------------------------
+# Cases
+# -------------------------
+def store_cases(n: int) -> Dict[str, Setup]:
+    cases: Dict[str, Setup] = {}
+
+    for k in IN_FLIGHT:
+        if k >= n:
+            continue
+
+        def toggle(k: int = k) -> Callable[[], None]:
+            store, _ = _store(n, k, discard=True)
+            ids = [t.id for t in store.tasks(False)[k:]]
+            state = {"i": 0}
+
+            def op() -> None:
+                # Action + the coalesced change delivery a render would wait for.
+                tid = ids[state["i"] % len(ids)]
+                state["i"] += 1
+                task = store._index.get(tid)
+                if task is not None:
+                    store.toggle_completed(tid, not task.completed)
+                store.flush()
+
+            return op
+
+        def create(k: int = k) -> Callable[[], None]:
+            store, _ = _store(n, k, discard=True)
+
+            def op() -> None:
+                store.create_task("benchmark")
+                store.flush()
+
+            return op
+
+        def reload(k: int = k) -> Callable[[], None]:
+            store, scheduler = _store(n, k, discard=False)
+            # Keep the queued toggles local: only the reload coroutine runs.
+            store._offline = True
+
+            def op() -> None:
+                store.warm_cache_both()
+                scheduler.drain()
+
+            return op
+
+        def merge(k: int = k) -> Callable[[], None]:
+            store, _ = _store(n, k, discard=True)
+            server = memory_repo(n).get_tasks(False)
+            return lambda: store._merge_with_local_overrides(False, server)
+
+        cases[f"store.toggle[n={n},in_flight={k}]"] = toggle
+        cases[f"store.create[n={n},in_flight={k}]"] = create
+        cases[f"store.full_reload[n={n},in_flight={k}]"] = reload
+        cases[f"store.merge[n={n},in_flight={k}]"] = merge
+
+    def round_trip() -> Callable[[], None]:
+        store, scheduler = _store(n, 0, discard=False, repo=fresh_memory_repo(n))
+        ids = [t.id for t in store.tasks(False)]
+        state = {"i": 0}
+
+        def op() -> None:
+            # Optimistic toggle -> batched write -> change delivered.
+            tid = ids[state["i"] % len(ids)]
+            state["i"] += 1
+            task = store._index.get(tid)
+            if task is not None:
+                store.toggle_completed(tid, not task.completed)
+            scheduler.drain()
+
+        return op
+
+    def same_rows() -> Callable[[], None]:
+        store, _ = _store(n, 0, discard=True)
+        # A refresh that changed nothing: every row is compared.
+        entries = store._merge_with_local_overrides(False, memory_repo(n).get_tasks(False))
+        return lambda: store._same_rows(False, entries)
+
+    def filter_tasks() -> Callable[[], None]:
+        store, _ = _store(n, 0, discard=True)
+        # Type-ahead keystrokes: short prefix, then a selective substring.
+        return lambda: (store.filter_tasks("ta 1", False), store.filter_tasks("task 123", False))
+
+    cases[f"store.round_trip[n={n}]"] = round_trip
+    cases[f"store.same_rows[n={n}]"] = same_rows
+    cases[f"store.filter[n={n}]"] = filter_tasks
+    return cases
+
+
+def render_cases(n: int) -> Dict[str, Setup]:
+    try:
+        from todoesvan.components.organisms.todo_list import TodoList
+    except ImportError:
+        return {}  # flet not installed
+
+    def _list(virtualized: bool) -> Any:
+        return TodoList(
+            on_delete_task=lambda tid: None,
+            on_status_change=lambda tid, c: None,
+            on_update_subject=lambda tid, s: None,
+            virtualized=virtualized,
+        )
+
+    def first(virtualized: bool) -> Setup:
+        def setup() -> Callable[[], None]:
+            tasks = memory_repo(n).get_tasks(False)
+
+            def op() -> None:
+                _list(virtualized).render_tasks(tasks)
+
+            return op
+
+        return setup
+
+    def update(virtualized: bool) -> Setup:
+        def setup() -> Callable[[], None]:
+            tasks = memory_repo(n).get_tasks(False)
+            todo = _list(virtualized)
+            todo.render_tasks(tasks)
+            state = {"i": 0}
+
+            def op() -> None:
+                # One subject changed: the keyed diff should patch a single row.
+                state["i"] += 1
+                tasks[0].subject = f"Edited {state['i']}"
+                todo.render_tasks(tasks, pending_ids={tasks[0].id})
+
+            return op
+
+        return setup
+
+    cases: Dict[str, Setup] = {
+        f"render.first[n={n},virtualized]": first(True),
+        f"render.update[n={n},virtualized]": update(True),
+    }
+    if n <= 10_000:  # non-virtualized builds every row
+        cases[f"render.first[n={n}]"] = first(False)
+        cases[f"render.update[n={n}]"] = update(False)
+    return cases
+
+
+def repository_cases(n: int) -> Dict[str, Setup]:
+    cases: Dict[str, Setup] = {}
+    engines = (
+        ("memory", memory_repo, fresh_memory_repo),
+        ("sqlite", sqlite_repo, fresh_sqlite_repo),
+    )
+    for engine, factory, fresh in engines:
+
+        def first_page(factory: Callable[[int], TaskRepository] = factory) -> Callable[[], None]:
+            repo = factory(n)
+            return lambda: repo.get_tasks_page(False, 50)
+
+        def deep_page(factory: Callable[[int], TaskRepository] = factory) -> Callable[[], None]:
+            repo = factory(n)
+            middle = repo.get_tasks_page(False, max(1, n // 3)).tasks[-1]
+            cursor = PageCursor(created_at=middle.created_at, id=middle.id)
+            return lambda: repo.get_tasks_page(False, 50, cursor)
+
+        def overview(factory: Callable[[int], TaskRepository] = factory) -> Callable[[], None]:
+            repo = factory(n)
+            return lambda: repo.get_overview(50, 50)
+
+        def changes(fresh: Callable[[int], TaskRepository] = fresh) -> Callable[[], None]:
+            repo = fresh(n)
+            # Delta of one 50-row write.
+            page = repo.get_tasks_page(False, 50).tasks
+            repo.apply_batch(TaskBatch(subjects=[(t.id, t.subject) for t in page]))
+            since = repo.current_revision() - 1
+            return lambda: repo.get_changes_since(since)
+
+        def batch(fresh: Callable[[int], TaskRepository] = fresh) -> Callable[[], None]:
+            repo = fresh(n)
+            ids = [t.id for t in repo.get_tasks_page(False, 50).tasks]
+            state = {"done": False}
+
+            def op() -> None:
+                # 50 toggles in one transaction; alternating keeps the table's shape.
+                state["done"] = not state["done"]
+                repo.apply_batch(TaskBatch(completed=[(tid, state["done"]) for tid in ids]))
+
+            return op
+
+        def search(factory: Callable[[int], TaskRepository] = factory) -> Callable[[], None]:
+            repo = factory(n)
+            # Two prefix terms, both tabs: "12" also hits 120, 1200, ...
+            return lambda: repo.search("task 12", None, 50)
+
+        cases[f"repo.{engine}.first_page[n={n}]"] = first_page
+        cases[f"repo.{engine}.keyset_page[n={n}]"] = deep_page
+        cases[f"repo.{engine}.overview[n={n}]"] = overview
+        cases[f"repo.{engine}.changes_since[n={n}]"] = changes
+        cases[f"repo.{engine}.apply_batch_50[n={n}]"] = batch
+        cases[f"repo.{engine}.search[n={n}]"] = search
+    return cases
+
+
+def session_cases(n: int) -> Dict[str, Setup]:
+    """SESSIONS stores loading their first pages, each with its own reads or through the shared cache."""
+
+    def connect(shared: bool) -> Setup:
+        def setup() -> Callable[[], None]:
+            repo: Any = ThreadedTaskRepository(sqlite_repo(n))
+            if shared:
+                repo = SharedCacheRepository(repo)
+            scheduler = SyncScheduler()
+
+            def op() -> None:
+                for _ in range(SESSIONS):
+                    store = TaskStore(
+                        service=AsyncTaskService(repo),
+                        schedule=scheduler,
+                        on_change=lambda changes: None,
+                        on_error=lambda msg: None,
+                        flush_window=0.0,
+                        frame_interval=0.0,
+                    )
+                    store.warm_cache_both()
+                scheduler.drain()
+
+            return op
+
+        return setup
+
+    return {
+        f"sessions.connect[n={n},sessions={SESSIONS}]": connect(False),
+        f"sessions.connect_shared[n={n},sessions={SESSIONS}]": connect(True),
+    }
+
+
+def footprint_cases(n: int) -> Dict[str, Tuple[Callable[[], Any], int]]:
+    """What cached tasks cost in memory: (build, number of tasks) per case."""
+    repo = memory_repo(n)
+    cached = repo.get_tasks(False) + repo.get_tasks(True)
+    rows = [(t.id, t.subject, t.completed, t.created_at) for t in cached]
+
+    def tasks() -> Any:
+        # Rows as a driver returns them: only the Task objects are new.
+        return [Task(*row) for row in rows]
+
+    def store() -> Any:
+        return _store(n, 0, discard=True)
+
+    return {
+        f"footprint.tasks[n={n}]": (tasks, len(rows)),
+        f"footprint.store[n={n}]": (store, len(rows)),
+    }
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(n) for n in DEFAULT_SIZES))
+    parser.add_argument("--only", default="", help="run benchmarks whose name contains this")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="exit 1 on regressions vs the baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed throughput drop (0.15 = 15%%)")
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results: List[Result] = []
+    footprints: List[Tuple[str, int, int]] = []
+    for n in sizes:
+        cases: Dict[str, Setup] = {}
+        cases.update(store_cases(n))
+        cases.update(render_cases(n))
+        cases.update(repository_cases(n))
+        for name, setup in cases.items():
+            if args.only in name:
+                results.append(measure(name, setup, _iterations(n)))
+        for name, setup in session_cases(n).items():
+            if args.only in name:
+                results.append(measure(name, setup, max(5, _iterations(n) // SESSIONS)))
+        for name, (build, count) in footprint_cases(n).items():
+            if args.only in name:
+                footprints.append((name, retained_bytes(build), count))
+
+    baseline = load_baseline(args.baseline)
+    print_table(results, baseline)
+    if footprints:
+        print()
+        print_footprints(footprints)
+
+    if args.json:
+        save_results(args.json, results)
+    if args.save:
+        save_results(args.baseline, results)
+        print(f"\nBaseline saved to {args.baseline}")
+    if args.compare:
+        if baseline is None:
+            print(f"\nNo baseline at {args.baseline}; run with --save first.")
+            return 1
+        slower = regressions(results, baseline, args.threshold)
+        if slower:
+            print(f"\nRegressions (>{args.threshold:.0%} slower):")
+            for line in slower:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
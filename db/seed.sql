@@ -1,12 +1,4 @@
--- Table TASK
-CREATE TABLE task (
-    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-    subject TEXT NOT NULL,
-    description TEXT,
-    completed BOOLEAN NOT NULL DEFAULT FALSE,
-    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
-);
-
+-- Sample tasks for a fresh development database (after the migrations).
 INSERT INTO task (subject, description, completed)
 VALUES
 ('Revisar pull requests', 'Verificar los cambios en el repositorio principal', false),
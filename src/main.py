@@ -1,14 +1,26 @@
+# First: startup times are measured from here.
+from todoesvan.utils import startup  # noqa: I001
+
 import flet as ft
 
+from todoesvan.data.repositories.factory import close_storage
 from todoesvan.utils.assets import ASSETS_DIR
+from todoesvan.utils.logging import configure_logging
 from todoesvan.views.app_view import main
 
 
 def run_app() -> None:
-    ft.app(
-        target=main,
-        assets_dir=str(ASSETS_DIR),
-    )
+    # .env, metrics and migrations are set up by the data layer on first use,
+    # after the first frame (see repositories.factory.get_repository).
+    configure_logging()
+    startup.mark("imports")
+    try:
+        ft.app(
+            target=main,
+            assets_dir=str(ASSETS_DIR),
+        )
+    finally:
+        close_storage()
 
 if __name__ == "__main__":
     run_app()
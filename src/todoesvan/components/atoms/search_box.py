@@ -0,0 +1,32 @@
+from typing import Callable
+
+import flet as ft
+
+from todoesvan.utils.theme import AppColors, UISizes
+
+
+class SearchBox(ft.TextField):
+    """Search field; reports every keystroke (the store debounces the queries)."""
+
+    def __init__(self, on_search: Callable[[str], None]):
+        super().__init__(
+            on_change=self._on_change,
+            hint_text="Search tasks",
+            hint_style=ft.TextStyle(color=AppColors.TEXT_MUTED),
+            text_style=ft.TextStyle(color=AppColors.TEXT_PRIMARY),
+            prefix_icon=ft.Icons.SEARCH,
+            height=UISizes.INPUT_HEIGHT,
+            border_color=AppColors.BORDER_DEFAULT,
+            focused_border_color=AppColors.ACCENT,
+        )
+        self._on_search = on_search
+
+    def is_isolated(self) -> bool:
+        return True
+
+    def _on_change(self, e: ft.ControlEvent) -> None:
+        self._on_search(self.value or "")
+
+    @property
+    def query(self) -> str:
+        return self.value or ""
@@ -0,0 +1,40 @@
+import flet as ft
+
+from todoesvan.utils.theme import AppColors, UISizes
+
+
+class StatusBanner(ft.Container):
+    """Aviso de conexión: visible solo sin base de datos (los cambios quedan guardados localmente)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.visible = False
+        self.padding = ft.padding.symmetric(horizontal=UISizes.GAP_MD, vertical=UISizes.GAP_SM)
+        self.border_radius = 10
+        self.bgcolor = AppColors.BG_SECONDARY
+
+        self.text = ft.Text("", color=AppColors.EDIT, size=12)
+        self.content = ft.Row(
+            [ft.Icon(ft.Icons.CLOUD_OFF, color=AppColors.EDIT, size=16), self.text],
+            spacing=UISizes.GAP_SM,
+        )
+
+    def is_isolated(self) -> bool:
+        return True
+
+    def set_status(self, offline: bool, queued: int) -> None:
+        if offline:
+            text = "Offline. "
+            if queued:
+                text += f"{queued} change(s) saved on this device, will sync on reconnect."
+            else:
+                text += "Showing the last known tasks."
+        else:
+            text = ""
+
+        if self.visible == offline and self.text.value == text:
+            return
+        self.visible = offline
+        self.text.value = text
+        if self.page:
+            self.update()
@@ -1,4 +1,4 @@
-from typing import Callable
+from typing import Callable, Optional, Tuple
 
 import flet as ft
 
@@ -22,3 +22,13 @@ class TodoTabs(ft.Tabs):
             ft.Tab(text="Active"),
             ft.Tab(text="Completed"),
         ]
+        self._counts: Optional[Tuple[int, int]] = None
+
+    def set_counts(self, pending: int, completed: int) -> None:
+        if self._counts == (pending, completed):
+            return
+        self._counts = (pending, completed)
+        self.tabs[0].text = f"Active ({pending})"
+        self.tabs[1].text = f"Completed ({completed})"
+        if self.page:
+            self.update()
@@ -0,0 +1,74 @@
+from typing import Callable
+
+import flet as ft
+
+from todoesvan.utils.theme import AppColors
+
+
+class BulkActionsBar(ft.Row):
+    """Barra de acciones masivas: selección múltiple, completar/restaurar, borrar, limpiar."""
+
+    def __init__(
+        self,
+        on_toggle_selecting: Callable[[], None],
+        on_select_all: Callable[[], None],
+        on_set_completed: Callable[[], None],
+        on_delete_selected: Callable[[], None],
+        on_clear_completed: Callable[[], None],
+    ):
+        super().__init__()
+        self.alignment = ft.MainAxisAlignment.SPACE_BETWEEN
+        self.vertical_alignment = ft.CrossAxisAlignment.CENTER
+
+        self.select_btn = ft.IconButton(
+            icon=ft.Icons.CHECKLIST,
+            icon_color=AppColors.TEXT_MUTED,
+            tooltip="Select tasks",
+            on_click=lambda e: on_toggle_selecting(),
+        )
+        self.count_text = ft.Text("", color=AppColors.TEXT_MUTED, size=12)
+
+        self.select_all_btn = ft.TextButton("Select all", on_click=lambda e: on_select_all())
+        self.complete_btn = ft.IconButton(
+            icon=ft.Icons.DONE_ALL,
+            icon_color=AppColors.INTENT_POSITIVE,
+            tooltip="Mark selected as done",
+            on_click=lambda e: on_set_completed(),
+        )
+        self.delete_btn = ft.IconButton(
+            icon=ft.Icons.DELETE_SWEEP,
+            icon_color=AppColors.INTENT_DESTRUCTIVE,
+            tooltip="Delete selected",
+            on_click=lambda e: on_delete_selected(),
+        )
+        self.clear_btn = ft.TextButton(
+            "Clear completed",
+            style=ft.ButtonStyle(color=AppColors.INTENT_DESTRUCTIVE),
+            on_click=lambda e: on_clear_completed(),
+        )
+
+        self.controls = [
+            ft.Row([self.select_btn, self.count_text], spacing=4),
+            ft.Row([self.select_all_btn, self.complete_btn, self.delete_btn, self.clear_btn], spacing=0),
+        ]
+        self.set_state(selecting=False, selected_count=0, completed_tab=False)
+
+    def is_isolated(self) -> bool:
+        return True
+
+    def set_state(self, selecting: bool, selected_count: int, completed_tab: bool) -> None:
+        self.select_btn.icon_color = AppColors.ACCENT if selecting else AppColors.TEXT_MUTED
+        self.count_text.value = f"{selected_count} selected" if selecting else ""
+
+        self.select_all_btn.visible = selecting
+        self.complete_btn.visible = selecting
+        self.complete_btn.icon = ft.Icons.REPLAY if completed_tab else ft.Icons.DONE_ALL
+        self.complete_btn.tooltip = "Restore selected" if completed_tab else "Mark selected as done"
+        self.complete_btn.disabled = selected_count == 0
+        self.delete_btn.visible = selecting
+        self.delete_btn.disabled = selected_count == 0
+
+        self.clear_btn.visible = completed_tab and not selecting
+
+        if self.page:
+            self.update()
@@ -17,6 +17,11 @@ class TaskItem(ft.Row):
         on_delete: Callable[[int], None],
         on_toggle: Callable[[int, bool], None],
         on_update_subject: Optional[Callable[[int, str], None]] = None,
+        selectable: bool = False,
+        selected: bool = False,
+        on_select: Optional[Callable[[int, bool], None]] = None,
+        on_open_details: Optional[Callable[[int], None]] = None,
+        single_line: bool = False,
     ):
         super().__init__()
         self.task = task
@@ -24,9 +29,15 @@ class TaskItem(ft.Row):
         self.on_delete = on_delete
         self.on_toggle = on_toggle
         self.on_update_subject = on_update_subject
+        self.on_select = on_select
+        self.on_open_details = on_open_details
 
         self._editing = False
         self._original_subject = task.subject
+        # Fixed-height rows (virtualized lists): a one-line subject, and the edit
+        # field's counter and error are kept inside the row instead of below it.
+        self.single_line = single_line
+        self._edit_error = False
 
         self.vertical_alignment = ft.CrossAxisAlignment.CENTER
         self.alignment = ft.MainAxisAlignment.SPACE_BETWEEN
@@ -39,12 +50,20 @@ class TaskItem(ft.Row):
             disabled=self.pending,
         )
 
+        # --- Selección múltiple ---
+        self.select_box = ft.Checkbox(
+            value=selected,
+            on_change=self._select_changed,
+            active_color=AppColors.ACCENT,
+            visible=selectable,
+        )
+
         # --- Textos ---
         self.title_text = ft.Text(
             value=self.task.subject,
             size=16,
             color=AppColors.TEXT_PRIMARY,
-            max_lines=3,
+            max_lines=1 if single_line else 3,
             overflow=ft.TextOverflow.ELLIPSIS,
         )
 
@@ -52,6 +71,7 @@ class TaskItem(ft.Row):
             value=self.task.subject,
             dense=True,
             max_length=50,
+            counter_text="" if single_line else None,
             border=ft.InputBorder.NONE,
             border_width=0,
             bgcolor="transparent",
@@ -68,7 +88,7 @@ class TaskItem(ft.Row):
         )
 
         self.left = ft.Row(
-            controls=[self.checkbox, self.title_container],
+            controls=[self.select_box, self.checkbox, self.title_container],
             spacing=10,
             expand=True,
             vertical_alignment=ft.CrossAxisAlignment.CENTER,
@@ -84,6 +104,16 @@ class TaskItem(ft.Row):
             disabled=self.pending or (self.on_update_subject is None),
         )
 
+        self.details_btn = ft.IconButton(
+            icon=ft.Icons.NOTES,
+            icon_color=AppColors.TEXT_MUTED,
+            icon_size=self.ICON_SIZE,
+            width=self.BTN_SIZE,
+            tooltip="Details",
+            on_click=self._details_clicked,
+            disabled=self.pending,
+        )
+
         self.delete_btn = ft.IconButton(
             icon=ft.Icons.DELETE,
             icon_color=AppColors.INTENT_DESTRUCTIVE,
@@ -104,6 +134,7 @@ class TaskItem(ft.Row):
 
         # Slots para mantener espacio
         self.empty_slot = ft.Container(width=self.BTN_SIZE, height=self.BTN_SIZE)
+        self.details_slot = ft.Container(width=self.BTN_SIZE, height=self.BTN_SIZE)
         self.spinner_slot = ft.Container(
             width=self.BTN_SIZE,
             height=self.BTN_SIZE,
@@ -119,11 +150,48 @@ class TaskItem(ft.Row):
     def is_isolated(self) -> bool:
         return True
 
+    def sync(
+        self, task: Task, pending: bool, selectable: bool = False, selected: bool = False
+    ) -> bool:
+        """Aplica el nuevo estado in-place. Devuelve True si cambió algo visible."""
+        self.task = task
+        changed = False
+
+        if self.select_box.visible != selectable or self.select_box.value != selected:
+            self.select_box.visible = selectable
+            self.select_box.value = selected
+            changed = True
+
+        if self.pending != pending:
+            self.pending = pending
+            changed = True
+
+        if self.title_text.value != task.subject:
+            self.title_text.value = task.subject
+            changed = True
+
+        if self.checkbox.value != task.completed:
+            self.checkbox.value = task.completed
+            changed = True
+
+        if changed:
+            self.edit_btn.disabled = self.pending or (self.on_update_subject is None)
+            self.details_btn.disabled = self.pending
+            self.delete_btn.disabled = self.pending
+            self.save_btn.disabled = self.pending
+            self._sync_ui()
+
+        return changed
+
     def _sync_ui(self):
         if self.pending:
             self._editing = False
             self.title_container.content = self.title_text
-            self.right.controls = [self.empty_slot, self.spinner_slot]
+            # Mismo ancho que los botones que reemplaza
+            slots = [self.empty_slot, self.spinner_slot]
+            if self.on_open_details:
+                slots.insert(0, self.details_slot)
+            self.right.controls = slots
             self.checkbox.disabled = True
             return
 
@@ -134,7 +202,10 @@ class TaskItem(ft.Row):
             self.checkbox.disabled = True
         else:
             self.title_container.content = self.title_text
-            self.right.controls = [self.edit_btn, self.delete_btn]
+            buttons = [self.edit_btn, self.delete_btn]
+            if self.on_open_details:
+                buttons.insert(0, self.details_btn)
+            self.right.controls = buttons
             self.checkbox.disabled = False
 
     def _start_edit(self, e: ft.ControlEvent):
@@ -143,7 +214,7 @@ class TaskItem(ft.Row):
         self._editing = True
         self._original_subject = self.task.subject
         self.title_input.value = self.task.subject
-        self.title_input.error_text = None
+        self._set_edit_error(None)
         self._sync_ui()
         self.title_container.update() # Importante updatear container al cambiar contenido
         self.update()
@@ -152,14 +223,14 @@ class TaskItem(ft.Row):
     def _exit_edit_mode_ui(self):
         """Helper para salir del modo edición visualmente"""
         self._editing = False
-        self.title_input.error_text = None
+        self._set_edit_error(None)
         self._sync_ui()
         self.title_container.update()
         self.update()
 
     def _edit_changed(self, e: ft.ControlEvent):
-        if self.title_input.error_text and (self.title_input.value or "").strip():
-            self.title_input.error_text = None
+        if self._edit_error and (self.title_input.value or "").strip():
+            self._set_edit_error(None)
             self.update()
 
     def _commit_edit(self, e: ft.ControlEvent):
@@ -171,7 +242,7 @@ class TaskItem(ft.Row):
         cleaned = raw.strip()
 
         if not cleaned:
-            self.title_input.error_text = "Task cannot be empty"
+            self._set_edit_error("Task cannot be empty")
             self.update()
             self.title_input.focus()
             return
@@ -193,10 +264,29 @@ class TaskItem(ft.Row):
         if self.on_update_subject:
             self.on_update_subject(self.task.id, cleaned)
 
+    def _set_edit_error(self, message: Optional[str]) -> None:
+        self._edit_error = message is not None
+        if not self.single_line:
+            self.title_input.error_text = message
+            return
+        # Only shown while the field is empty: the hint takes the error's place.
+        self.title_input.hint_text = message
+        self.title_input.hint_style = (
+            ft.TextStyle(color=AppColors.INTENT_DESTRUCTIVE) if message else None
+        )
+
     def _status_changed(self, e):
         if self.on_toggle and not self.pending and not self._editing:
             self.on_toggle(self.task.id, self.checkbox.value)
 
+    def _select_changed(self, e):
+        if self.on_select:
+            self.on_select(self.task.id, bool(self.select_box.value))
+
     def _delete_clicked(self, e):
         if self.on_delete and not self.pending and not self._editing:
             self.on_delete(self.task.id)
+
+    def _details_clicked(self, e):
+        if self.on_open_details and not self.pending and not self._editing:
+            self.on_open_details(self.task.id)
@@ -0,0 +1,93 @@
+from typing import Callable, Optional
+
+import flet as ft
+
+from todoesvan.data.model import Task
+from todoesvan.utils.theme import AppColors, UISizes
+
+
+class TaskDetailsSheet(ft.BottomSheet):
+    """Task details; the description is loaded on demand, so it may arrive after show()."""
+
+    def __init__(
+        self,
+        on_save_description: Callable[[int, str], None],
+        on_retry_description: Callable[[int], None],
+    ):
+        self.on_save_description = on_save_description
+        self.on_retry_description = on_retry_description
+        self.task_id: Optional[int] = None
+        self._loaded: Optional[str] = None
+
+        self.title_text = ft.Text("", size=18, weight="bold", color=AppColors.TEXT_PRIMARY)
+        self.description_input = ft.TextField(
+            multiline=True,
+            min_lines=3,
+            max_lines=8,
+            hint_text="Add a description",
+            hint_style=ft.TextStyle(color=AppColors.TEXT_MUTED),
+            text_style=ft.TextStyle(color=AppColors.TEXT_PRIMARY),
+            border_color=AppColors.BORDER_DEFAULT,
+            focused_border_color=AppColors.ACCENT,
+        )
+        self.spinner = ft.ProgressRing(width=16, height=16, stroke_width=2, visible=False)
+        self.save_btn = ft.TextButton("Save", on_click=self._save_clicked)
+        self.error_row = ft.Row(
+            [
+                ft.Text("Couldn't load the description.", color=AppColors.TEXT_MUTED),
+                ft.TextButton("Retry", on_click=self._retry_clicked),
+            ],
+            spacing=UISizes.GAP_SM,
+            visible=False,
+        )
+
+        super().__init__(
+            content=ft.Container(
+                padding=UISizes.PAGE_PADDING,
+                bgcolor=AppColors.BG_SECONDARY,
+                content=ft.Column(
+                    tight=True,
+                    spacing=UISizes.GAP_MD,
+                    controls=[
+                        ft.Row([self.title_text, self.spinner], spacing=UISizes.GAP_SM),
+                        self.error_row,
+                        self.description_input,
+                        ft.Row([self.save_btn], alignment=ft.MainAxisAlignment.END),
+                    ],
+                ),
+            ),
+            on_dismiss=self._dismissed,
+        )
+
+    def show(self, task: Task, description: Optional[str], failed: bool = False) -> None:
+        """description=None means it is still loading (set_description fills it in)."""
+        self.task_id = task.id
+        self.title_text.value = task.subject
+        self._loaded = None
+        self.description_input.value = ""
+        self.set_description(description, failed)
+
+    def set_description(self, description: Optional[str], failed: bool = False) -> None:
+        """failed: the load gave up; editing stays off (saving would overwrite the real text)."""
+        loading = description is None
+        self.spinner.visible = loading and not failed
+        self.error_row.visible = loading and failed
+        self.description_input.disabled = loading
+        self.save_btn.disabled = loading
+        # Don't overwrite what the user is already typing.
+        if not loading and (self._loaded is None or self.description_input.value == self._loaded):
+            self.description_input.value = description
+            self._loaded = description
+
+    def _save_clicked(self, e: ft.ControlEvent) -> None:
+        if self.task_id is not None:
+            self.on_save_description(self.task_id, self.description_input.value or "")
+        self.open = False
+        self.update()
+
+    def _retry_clicked(self, e: ft.ControlEvent) -> None:
+        if self.task_id is not None:
+            self.on_retry_description(self.task_id)
+
+    def _dismissed(self, e: ft.ControlEvent) -> None:
+        self.task_id = None
@@ -1,69 +1,310 @@
-from typing import Callable, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 import flet as ft
 
 from todoesvan.components.molecules.task_item import TaskItem
 from todoesvan.data.model import Task
+from todoesvan.utils import metrics
 from todoesvan.utils.theme import AppColors
 
 
 class TodoList(ft.Column):
+    # Ask for the next page when the user is this close (px) to the end.
+    LOAD_MORE_THRESHOLD = 300
+
+    # Virtualized mode: rows built beyond each edge of the viewport.
+    OVERSCAN = 10
+    # Viewport guess (px) until the first scroll event reports the real one.
+    DEFAULT_VIEWPORT = 900
+
     def __init__(
         self,
         on_delete_task: Callable[[int], None],
         on_status_change: Callable[[int, bool], None],
         on_update_subject: Callable[[int, str], None],
+        on_load_more: Optional[Callable[[], None]] = None,
+        on_selection_change: Optional[Callable[[Set[int]], None]] = None,
+        on_open_details: Optional[Callable[[int], None]] = None,
+        on_window_change: Optional[Callable[[List[int]], None]] = None,
+        virtualized: bool = False,
+        item_extent: int = 64,
     ):
         super().__init__()
+        self.controls: List[ft.Control] = []
         self.on_delete_task = on_delete_task
         self.on_status_change = on_status_change
         self.on_update_subject = on_update_subject
+        self.on_load_more = on_load_more
+        self.on_selection_change = on_selection_change
+        self.on_open_details = on_open_details
+        # Called with the ids of the rows built, e.g. to prefetch their details.
+        self.on_window_change = on_window_change
+
+        # Multi-select (drives the bulk actions)
+        self._selecting = False
+        self._selected: Set[int] = set()
+
+        # Virtualized mode only builds rows near the viewport; every row gets
+        # exactly item_extent px so the rest can be replaced by two spacers
+        # (rows are single-line there, so their content fits that height).
+        self.virtualized = virtualized
+        self.item_extent = item_extent
+
+        self._tasks: List[Task] = []
+        self._pending_ids: Set[int] = set()
+        self._refreshing = False
+        self._has_more = False
+        self._loading_more = False
+
+        self._scroll_offset = 0.0
+        self._viewport = float(self.DEFAULT_VIEWPORT)
+        self._window: Tuple[int, int] = (0, 0)
+
+        # Keyed rows (task.id -> (row control, item)); reused across renders.
+        self._rows: Dict[int, Tuple[ft.Control, TaskItem]] = {}
+
+        # Persistent non-task controls, so reusing them doesn't count as a change.
+        self._loading_placeholder = ft.Container(
+            content=ft.Text("Loading...", color=AppColors.TEXT_MUTED, italic=True),
+            alignment=ft.alignment.center,
+            padding=20,
+        )
+        self._empty_placeholder = ft.Container(
+            content=ft.Text("Nothing here!", color=AppColors.TEXT_MUTED, italic=True),
+            alignment=ft.alignment.center,
+            padding=20,
+        )
+        self._top_spacer = ft.Container(height=0)
+        self._bottom_spacer = ft.Container(height=0)
+        self._spacers_changed = False
+        self._more_spinner = ft.Container(
+            content=ft.ProgressRing(width=16, height=16, stroke_width=2),
+            alignment=ft.alignment.center,
+            padding=10,
+        )
+        # Fallback when the first page doesn't fill the viewport (no scroll events).
+        self._more_button = ft.Container(
+            content=ft.TextButton("Load more", on_click=lambda e: self._request_more()),
+            alignment=ft.alignment.center,
+        )
 
         self.expand = True
         self.scroll = ft.ScrollMode.AUTO
         self.scrollbar = False
+        if virtualized:
+            self.spacing = 0
+        self.on_scroll = self._on_scroll
+        self.on_scroll_interval = 100
 
     def show_loading(self) -> None:
         self.controls.clear()
+        self._rows.clear()
         if self.page:
             self.update()
 
+    # -------------------------
+    # Selection
+    # -------------------------
+    @property
+    def selecting(self) -> bool:
+        return self._selecting
+
+    @property
+    def selected_ids(self) -> Set[int]:
+        return set(self._selected)
+
+    def set_selecting(self, enabled: bool) -> None:
+        self._selecting = enabled
+        self._selected.clear()
+        self._reconcile()
+        self._selection_changed()
+
+    def select_all(self) -> None:
+        if not self._selecting:
+            return
+        self._selected = {t.id for t in self._tasks if t.id not in self._pending_ids}
+        self._reconcile()
+        self._selection_changed()
+
+    def _on_item_select(self, task_id: int, selected: bool) -> None:
+        if selected:
+            self._selected.add(task_id)
+        else:
+            self._selected.discard(task_id)
+        self._selection_changed()
+
+    def _selection_changed(self) -> None:
+        if self.on_selection_change:
+            self.on_selection_change(set(self._selected))
+
+    @metrics.timed("render.tasks")
     def render_tasks(
         self,
         tasks: List[Task],
         pending_ids: Optional[Set[int]] = None,
         refreshing: bool = False,
+        has_more: bool = False,
+        loading_more: bool = False,
     ) -> None:
-        pending_ids = pending_ids or set()
-        self.controls.clear()
+        self._tasks = tasks
+        self._pending_ids = pending_ids or set()
+        self._refreshing = refreshing
+        self._has_more = has_more
+        self._loading_more = loading_more
 
-        if refreshing and not tasks:
-            self.controls.append(
-                ft.Container(
-                    content=ft.Text("Loading...", color=AppColors.TEXT_MUTED, italic=True),
-                    alignment=ft.alignment.center,
-                    padding=20,
-                )
-            )
-        elif not tasks:
-            self.controls.append(
-                ft.Container(
-                    content=ft.Text("Nothing here!", color=AppColors.TEXT_MUTED, italic=True),
-                    alignment=ft.alignment.center,
-                    padding=20,
-                )
-            )
-        else:
-            for task in tasks:
-                self.controls.append(
-                    TaskItem(
-                        task=task,
-                        pending=(task.id in pending_ids),
-                        on_delete=self.on_delete_task,
-                        on_toggle=self.on_status_change,
-                        on_update_subject=self.on_update_subject,
-                    )
-                )
+        # Drop selected ids that left the tab (moved, deleted, tab switch).
+        if self._selected:
+            visible = {t.id for t in tasks}
+            if not self._selected <= visible:
+                self._selected &= visible
+                self._selection_changed()
 
-        if self.page:
+        self._reconcile()
+
+    # -------------------------
+    # Keyed reconciliation
+    # -------------------------
+    def _reconcile(self) -> None:
+        """
+        Diffs the desired rows against the mounted ones by task.id:
+          - unchanged rows are reused untouched
+          - changed rows are patched in place and updated on their own (TaskItem is isolated)
+          - the column itself is only updated when rows were added/removed/moved
+        """
+        new_controls, changed_items = self._desired_controls()
+
+        old_controls: List[ft.Control] = list(self.controls)
+        structure_changed = len(new_controls) != len(old_controls) or any(
+            a is not b for a, b in zip(new_controls, old_controls)
+        )
+        if structure_changed:
+            self.controls = new_controls
+            if self.on_window_change and self._tasks:
+                first, last = self._window
+                self.on_window_change([t.id for t in self._tasks[first:last]])
+
+        if not self.page:
+            return
+
+        if structure_changed or self._spacers_changed:
             self.update()
+        for item in changed_items:
+            item.update()
+
+    def _desired_controls(self) -> Tuple[List[ft.Control], List[TaskItem]]:
+        tasks = self._tasks
+        self._spacers_changed = False
+
+        if self._refreshing and not tasks:
+            self._rows.clear()
+            return [self._loading_placeholder], []
+        if not tasks:
+            self._rows.clear()
+            return [self._empty_placeholder], []
+
+        first, last = self._window = self._compute_window()
+        controls: List[ft.Control] = []
+        changed_items: List[TaskItem] = []
+        rows: Dict[int, Tuple[ft.Control, TaskItem]] = {}
+
+        if first > 0:
+            self._set_spacer(self._top_spacer, first * self.item_extent)
+            controls.append(self._top_spacer)
+
+        for task in tasks[first:last]:
+            pending = task.id in self._pending_ids
+            selected = task.id in self._selected
+            existing = self._rows.get(task.id)
+            if existing is not None:
+                row, item = existing
+                if item.sync(task, pending, self._selecting, selected):
+                    changed_items.append(item)
+            else:
+                row, item = self._build_row(task, pending, selected)
+            rows[task.id] = (row, item)
+            controls.append(row)
+
+        if last < len(tasks):
+            self._set_spacer(self._bottom_spacer, (len(tasks) - last) * self.item_extent)
+            controls.append(self._bottom_spacer)
+
+        footer = self._footer()
+        if footer:
+            controls.append(footer)
+
+        # Rows that left the window/tab are dropped so the cache stays bounded.
+        self._rows = rows
+        return controls, changed_items
+
+    def _set_spacer(self, spacer: ft.Container, height: int) -> None:
+        if spacer.height != height:
+            spacer.height = height
+            self._spacers_changed = True
+
+    def _build_row(
+        self, task: Task, pending: bool, selected: bool
+    ) -> Tuple[ft.Control, TaskItem]:
+        item = TaskItem(
+            task=task,
+            pending=pending,
+            on_delete=self.on_delete_task,
+            on_toggle=self.on_status_change,
+            on_update_subject=self.on_update_subject,
+            selectable=self._selecting,
+            selected=selected,
+            on_select=self._on_item_select,
+            on_open_details=self.on_open_details,
+            single_line=self.virtualized,
+        )
+        if not self.virtualized:
+            return item, item
+        row = ft.Container(
+            content=item,
+            height=self.item_extent,
+            clip_behavior=ft.ClipBehavior.HARD_EDGE,
+        )
+        return row, item
+
+    def _footer(self) -> Optional[ft.Control]:
+        if self._loading_more:
+            return self._more_spinner
+        if self._has_more:
+            return self._more_button
+        return None
+
+    # -------------------------
+    # Windowing
+    # -------------------------
+    def _compute_window(self) -> Tuple[int, int]:
+        n = len(self._tasks)
+        if not self.virtualized:
+            return 0, n
+
+        first_visible = int(self._scroll_offset // self.item_extent)
+        visible_count = int(self._viewport // self.item_extent) + 1
+
+        first = max(0, first_visible - self.OVERSCAN)
+        last = min(n, first_visible + visible_count + self.OVERSCAN)
+        return min(first, last), last
+
+    def _window_is_stale(self) -> bool:
+        first, last = self._window
+        new_first, new_last = self._compute_window()
+        # Hysteresis: only rebuild once the viewport eats into the overscan margin.
+        margin = self.OVERSCAN // 2
+        return abs(new_first - first) > margin or abs(new_last - last) > margin
+
+    def _request_more(self) -> None:
+        if self.on_load_more and self._has_more and not self._loading_more:
+            self.on_load_more()
+
+    def _on_scroll(self, e: ft.OnScrollEvent) -> None:
+        if self.virtualized and self._tasks:
+            self._scroll_offset = max(0.0, e.pixels)
+            if e.viewport_dimension:
+                self._viewport = e.viewport_dimension
+            if self._window_is_stale():
+                self._reconcile()
+
+        if e.max_scroll_extent - e.pixels <= self.LOAD_MORE_THRESHOLD:
+            self._request_more()
@@ -0,0 +1,190 @@
+import json
+import re
+import select
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from todoesvan.data.model import Task
+from todoesvan.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    op: str  # "INSERT" | "UPDATE" | "DELETE" | "RESYNC"
+    task_id: int
+    revision: int
+    task: Optional[Task] = None  # None for deletes and payloads without the row
+
+    # Sent after (re)connecting: notifications may have been missed.
+    RESYNC = "RESYNC"
+
+
+Subscriber = Callable[[TaskEvent], None]
+
+# Postgres trims trailing zeros from the fraction ("...:56.12") and may send an hours-only
+# offset ("+05"); datetime.fromisoformat before Python 3.11 takes neither.
+_TIMESTAMP = re.compile(r"^(?P<base>[^.+Z]*?)(?:\.(?P<frac>\d+))?(?P<tz>Z|[+-]\d{2}(?::?\d{2}){0,2})?$")
+
+
+def _parse_timestamp(text: str) -> datetime:
+    match = _TIMESTAMP.match(text)
+    if match is None:
+        raise ValueError(f"Not a timestamp: {text!r}")
+    value = match["base"]
+    if match["frac"]:
+        value += "." + match["frac"][:6].ljust(6, "0")
+    tz = match["tz"]
+    if tz == "Z":
+        tz = "+00:00"
+    elif tz and len(tz) == 3:
+        tz += ":00"
+    return datetime.fromisoformat(value + (tz or ""))
+
+
+class ChangeFeed:
+    """
+    One shared LISTEN connection per process, fed by the task_notify trigger.
+    Subscribers are called on the listener thread and must hop to their own loop.
+    """
+
+    CHANNEL = "task_changes"
+
+    def __init__(
+        self,
+        connect: Optional[Callable[[], Any]] = None,
+        channel: str = CHANNEL,
+        poll_timeout: float = 1.0,
+        reconnect_delay: float = 2.0,
+    ):
+        self._connect = connect
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self.reconnect_delay = reconnect_delay
+
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Subscriber, first: bool = False) -> Callable[[], None]:
+        """
+        Registers a subscriber (starting the listener) and returns an unsubscribe.
+        first=True runs it before the others (caches that must drop stale reads
+        before any session reacts to the event).
+        """
+        with self._lock:
+            if first:
+                self._subscribers.insert(0, callback)
+            else:
+                self._subscribers.append(callback)
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="task-change-feed", daemon=True
+                )
+                self._thread.start()
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    # -------------------------
+    # Listener thread
+    # -------------------------
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            conn = None
+            try:
+                conn = self._open()
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel};")
+
+                self._dispatch(TaskEvent(op=TaskEvent.RESYNC, task_id=0, revision=0))
+
+                while not self._stop.is_set():
+                    ready, _, _ = select.select([conn], [], [], self.poll_timeout)
+                    if not ready:
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        note = conn.notifies.pop(0)
+                        event = self._parse(note.payload)
+                        if event:
+                            self._dispatch(event)
+
+            except Exception:
+                logger.exception("Change feed connection lost; reconnecting")
+                self._stop.wait(self.reconnect_delay)
+
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+    def _open(self) -> Any:
+        if self._connect is None:
+            # Imported lazily: only the Postgres engine has a change feed.
+            from todoesvan.data.database import open_listen_connection
+
+            self._connect = open_listen_connection
+        return self._connect()
+
+    def _dispatch(self, event: TaskEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("Change feed subscriber failed")
+
+    @staticmethod
+    def _parse(payload: str) -> Optional[TaskEvent]:
+        try:
+            data: Dict[str, Any] = json.loads(payload)
+            task_id = int(data["id"])
+            op = str(data["op"])
+            revision = int(data.get("revision") or 0)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed change notification: %s", payload)
+            return None
+
+        task = None
+        if op != "DELETE" and "subject" in data:
+            try:
+                task = Task(
+                    id=task_id,
+                    subject=data["subject"],
+                    completed=bool(data["completed"]),
+                    created_at=_parse_timestamp(data["created_at"]),
+                )
+            except (ValueError, KeyError, TypeError):
+                task = None  # subscribers fall back to a delta sync
+
+        return TaskEvent(op=op, task_id=task_id, revision=revision, task=task)
+
+
+_feed: Optional[ChangeFeed] = None
+_feed_lock = threading.Lock()
+
+
+def get_change_feed() -> ChangeFeed:
+    """Process-wide change feed (one listener connection for every session)."""
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            _feed = ChangeFeed()
+        return _feed
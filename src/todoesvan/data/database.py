@@ -1,28 +1,326 @@
 import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Iterator, List, Optional, Tuple
 
 import psycopg2
-from dotenv import load_dotenv
+import psycopg2.extensions
 
+from todoesvan.data.errors import DatabaseUnavailable, PoolTimeout, QueryTimeout
+from todoesvan.utils import metrics
+from todoesvan.utils.env import load_env
 from todoesvan.utils.logging import get_logger
 
-load_dotenv()
-
 logger = get_logger(__name__)
 
-# Load environment variables
-load_dotenv()
-
-def get_db_connection():
-    """Establishes connection to the PostgreSQL database."""
-    try:
-        conn = psycopg2.connect(
-            host=os.getenv("DB_HOST"),
-            database=os.getenv("DB_NAME"),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            port=os.getenv("DB_PORT")
-        )
+
+def statement_timeout_ms() -> int:
+    """DB_STATEMENT_TIMEOUT (seconds, 0 = no limit) in the milliseconds PostgreSQL expects."""
+    load_env()
+    return int(float(os.getenv("DB_STATEMENT_TIMEOUT", "15")) * 1000)
+
+
+def _connect() -> Any:
+    load_env()
+    return psycopg2.connect(
+        host=os.getenv("DB_HOST"),
+        database=os.getenv("DB_NAME"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        port=os.getenv("DB_PORT"),
+        # Server-side, so a statement nobody waits for anymore still ends.
+        options=f"-c statement_timeout={statement_timeout_ms()}",
+    )
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    size: int
+    idle: int
+    in_use: int
+    waiting: int
+    checkouts: int
+    avg_checkout_ms: float
+    max_checkout_ms: float
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of warm connections shared by asyncio.to_thread workers.
+      - fill() opens min_size connections up front; more are opened lazily, up to max_size
+      - pings connections that sat idle longer than check_after before handing them out
+      - closes idle connections above min_size after idle_timeout seconds
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        min_size: int = 1,
+        max_size: int = 5,
+        idle_timeout: float = 300.0,
+        check_after: float = 30.0,
+        checkout_timeout: float = 10.0,
+    ):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Invalid pool size.")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.check_after = check_after
+        self.checkout_timeout = checkout_timeout
+
+        self._cond = threading.Condition()
+        self._idle: List[Tuple[Any, float]] = []  # (conn, last_used), most recent last
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._closed = False
+
+        # Metrics
+        self._checkouts = 0
+        self._checkout_total = 0.0
+        self._checkout_max = 0.0
+
+    # -------------------------
+    # Checkout / return
+    # -------------------------
+    def getconn(self) -> Any:
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+        conn: Any = None
+        last_used = 0.0
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed.")
+                self._evict_idle_locked(start)
+
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout("Timed out waiting for a database connection.")
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+            self._in_use += 1
+
+        # Network work happens outside the lock.
+        try:
+            if conn is not None and not self._is_healthy(conn, start - last_used):
+                self._close_quietly(conn)
+                conn = None
+            if conn is None:
+                conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        elapsed = time.monotonic() - start
+        with self._cond:
+            self._checkouts += 1
+            self._checkout_total += elapsed
+            self._checkout_max = max(self._checkout_max, elapsed)
         return conn
-    except Exception:
-        logger.exception("Failed to connect to database")
-        return None
+
+    def putconn(self, conn: Any, discard: bool = False) -> None:
+        if not discard and not conn.closed:
+            try:
+                status = conn.get_transaction_status()
+                if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or conn.closed or self._closed:
+                self._size -= 1
+                keep = False
+            else:
+                self._idle.append((conn, time.monotonic()))
+                keep = True
+            self._cond.notify()
+
+        if not keep:
+            self._close_quietly(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Checks out a connection and commits (or rolls back) on exit.
+        Connection-level failures surface as DatabaseUnavailable; note that a link
+        dropped during COMMIT leaves it unknown whether the transaction landed.
+        """
+        try:
+            conn = self.getconn()
+        except psycopg2.OperationalError as ex:
+            raise DatabaseUnavailable(str(ex).strip()) from ex
+
+        discard = False
+        try:
+            with conn:
+                yield conn
+        except psycopg2.extensions.QueryCanceledError as ex:
+            # The statement hit DB_STATEMENT_TIMEOUT; the connection itself is fine.
+            raise QueryTimeout(str(ex).strip()) from ex
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as ex:
+            discard = True
+            # Statement-level errors (timeouts, lock failures) keep the link open.
+            if conn.closed:
+                raise DatabaseUnavailable(str(ex).strip()) from ex
+            raise
+        finally:
+            self.putconn(conn, discard=discard)
+
+    # -------------------------
+    # Maintenance
+    # -------------------------
+    def fill(self) -> int:
+        """Opens connections until min_size are held; returns how many it opened."""
+        opened = 0
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return opened
+                self._size += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+            opened += 1
+
+    def stats(self) -> PoolStats:
+        with self._cond:
+            avg = (self._checkout_total / self._checkouts) if self._checkouts else 0.0
+            return PoolStats(
+                size=self._size,
+                idle=len(self._idle),
+                in_use=self._in_use,
+                waiting=self._waiting,
+                checkouts=self._checkouts,
+                avg_checkout_ms=avg * 1000.0,
+                max_checkout_ms=self._checkout_max * 1000.0,
+            )
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _evict_idle_locked(self, now: float) -> None:
+        # Oldest connections sit at the front of the idle list.
+        while (
+            self._idle
+            and self._size > self.min_size
+            and now - self._idle[0][1] > self.idle_timeout
+        ):
+            conn, _ = self._idle.pop(0)
+            self._size -= 1
+            self._close_quietly(conn)
+
+    def _is_healthy(self, conn: Any, idle_for: float) -> bool:
+        if conn.closed:
+            return False
+        if idle_for < self.check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1;")
+            conn.rollback()
+            return True
+        except Exception:
+            logger.warning("Discarding stale pooled connection")
+            return False
+
+    @staticmethod
+    def _close_quietly(conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Process-wide pool, configured from DB_POOL_* environment variables. Its min_size
+    connections are opened on creation; its stats are exported as pool_* gauges.
+    """
+    global _pool
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is not None:
+            return _pool
+        load_env()
+        pool = ConnectionPool(
+            _connect,
+            min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+            max_size=int(os.getenv("DB_POOL_MAX_SIZE", "5")),
+            idle_timeout=float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300")),
+            check_after=float(os.getenv("DB_POOL_CHECK_AFTER", "30")),
+            checkout_timeout=float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", "10")),
+        )
+        try:
+            pool.fill()
+        except psycopg2.Error as ex:
+            # Unreachable right now: checkouts connect (and report it) on demand.
+            logger.warning("Could not pre-open database connections: %s", str(ex).strip())
+        metrics.register_gauges("pool", lambda: asdict(pool.stats()))
+        _pool = pool
+    return _pool
+
+
+def close_pool() -> None:
+    """Closes the process-wide pool, if one was opened (app shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            metrics.unregister_gauges("pool")
+            _pool.close()
+            _pool = None
+
+
+@contextmanager
+def db_connection() -> Iterator[Any]:
+    """Pooled connection for a single unit of work (one transaction)."""
+    with get_pool().connection() as conn:
+        yield conn
+
+
+def open_listen_connection() -> Any:
+    """Dedicated, unpooled connection for a long-lived LISTEN (the change feed); the caller closes it."""
+    return _connect()
@@ -0,0 +1,14 @@
+class DatabaseUnavailable(RuntimeError):
+    """The database can't be reached right now (connect failed or the link dropped)."""
+
+
+class PoolTimeout(RuntimeError):
+    """Every pooled connection stayed busy for the checkout timeout: retry shortly."""
+
+
+class StorageSetupError(RuntimeError):
+    """Startup work for the storage engine failed (e.g. a migration); needs fixing, not retrying."""
+
+
+class QueryTimeout(RuntimeError):
+    """A statement ran longer than DB_STATEMENT_TIMEOUT and the server cancelled it."""
@@ -0,0 +1,259 @@
+"""
+Versioned PostgreSQL schema migrations.
+
+Migrations are the SQL files in data/migrations, named NNNN_description.sql and
+applied in version order, each in its own transaction together with its row in
+schema_migrations. An advisory lock keeps concurrent app starts from racing.
+
+    python -m todoesvan.data.migrate status
+    python -m todoesvan.data.migrate up [--to N]
+    python -m todoesvan.data.migrate check    # EXPLAIN the hot queries, fail on seq scans
+    python -m todoesvan.data.migrate prune [--days N]   # drop old delete tombstones
+"""
+import argparse
+import hashlib
+import json
+import re
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from todoesvan.data.database import db_connection
+from todoesvan.data.repositories import sql as pgsql
+from todoesvan.utils.logging import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "migrations"
+
+# pg_advisory_lock key ("todoesvan" as an int); any constant shared by all clients works.
+_LOCK_KEY = 0x746F646F
+
+_FILE_NAME = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+
+class MigrationError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def sql(self) -> str:
+        return self.path.read_text(encoding="utf-8")
+
+    @property
+    def checksum(self) -> str:
+        return hashlib.sha256(self.path.read_bytes()).hexdigest()
+
+
+def discover(directory: Path = MIGRATIONS_DIR) -> List[Migration]:
+    migrations: Dict[int, Migration] = {}
+    for path in sorted(directory.glob("*.sql")):
+        match = _FILE_NAME.match(path.name)
+        if not match:
+            raise MigrationError(f"Unexpected migration file name {path.name!r} (want NNNN_name.sql).")
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"Duplicate migration version {version}.")
+        migrations[version] = Migration(version=version, name=match.group(2), path=path)
+    return [migrations[v] for v in sorted(migrations)]
+
+
+# -------------------------
+# Applying
+# -------------------------
+def _ensure_table(cur: Any) -> None:
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version    INTEGER PRIMARY KEY,
+            name       TEXT NOT NULL,
+            checksum   TEXT NOT NULL,
+            applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        """
+    )
+
+
+def _applied(cur: Any) -> Dict[int, Tuple[str, datetime]]:
+    cur.execute("SELECT version, checksum, applied_at FROM schema_migrations;")
+    return {int(row[0]): (row[1], row[2]) for row in cur.fetchall()}
+
+
+def status() -> List[Tuple[Migration, Optional[datetime]]]:
+    """Every known migration with the time it was applied (None = pending)."""
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            _ensure_table(cur)
+            applied = _applied(cur)
+    return [(m, applied[m.version][1] if m.version in applied else None) for m in discover()]
+
+
+def upgrade(target: Optional[int] = None) -> List[Migration]:
+    """Applies pending migrations up to `target` (all by default); returns what ran."""
+    migrations = [m for m in discover() if target is None or m.version <= target]
+    done: List[Migration] = []
+
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            _ensure_table(cur)
+            conn.commit()
+            # Index builds and waiting for another migrator may take longer than
+            # DB_STATEMENT_TIMEOUT allows app queries (SET LOCAL: this transaction only).
+            cur.execute("SET LOCAL statement_timeout = 0;")
+            cur.execute("SELECT pg_advisory_lock(%s);", (_LOCK_KEY,))
+            try:
+                # Read under the lock: another process may have just migrated.
+                applied = _applied(cur)
+                for migration in migrations:
+                    if migration.version in applied:
+                        if applied[migration.version][0] != migration.checksum:
+                            logger.warning(
+                                "Migration %04d_%s changed after it was applied",
+                                migration.version,
+                                migration.name,
+                            )
+                        continue
+                    logger.info("Applying migration %04d_%s", migration.version, migration.name)
+                    try:
+                        cur.execute("SET LOCAL statement_timeout = 0;")
+                        cur.execute(migration.sql)
+                        cur.execute(
+                            "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s);",
+                            (migration.version, migration.name, migration.checksum),
+                        )
+                        conn.commit()
+                    except Exception as ex:
+                        conn.rollback()
+                        raise MigrationError(
+                            f"Migration {migration.version:04d}_{migration.name} failed: {ex}"
+                        ) from ex
+                    done.append(migration)
+            finally:
+                cur.execute("SELECT pg_advisory_unlock(%s);", (_LOCK_KEY,))
+                conn.commit()
+    return done
+
+
+def prune_tombstones(days: float) -> int:
+    """
+    Drops delete tombstones older than `days`; returns how many. Sessions that last
+    synced before the newest one dropped reload everything on their next sync.
+    """
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT task_prune_tombstones(make_interval(secs => %s));", (days * 86400,))
+            pruned = int(cur.fetchone()[0])
+        conn.commit()
+    return pruned
+
+
+# -------------------------
+# Query plan check
+# -------------------------
+def _hot_queries() -> List[Tuple[str, str, Any, bool]]:
+    """(name, sql, sample params, must avoid a sort) for the repository's hot reads."""
+    cursor_time = datetime.now(timezone.utc)
+    search = {"query": "task:*", "completed": False, "limit": 51, "offset": 0}
+    queries: List[Tuple[str, str, Any, bool]] = []
+    for completed in (False, True):
+        tab = "completed" if completed else "pending"
+        queries += [
+            (f"get_tasks[{tab}]", pgsql.TAB_SQL, (completed,), True),
+            (f"get_tasks_page[{tab}]", pgsql.TAB_PAGE_SQL, (completed, 51), True),
+            (f"get_tasks_page_after[{tab}]", pgsql.TAB_PAGE_AFTER_SQL, (completed, cursor_time, 1, 51), True),
+        ]
+    queries += [
+        ("get_changes_since[rows]", pgsql.CHANGED_ROWS_SQL, (0,), True),
+        ("get_changes_since[tombstones]", pgsql.TOMBSTONES_SQL, (0,), True),
+        ("search[tab]", pgsql.SEARCH_SQL.format(tab_filter="AND completed = %(completed)s"), search, False),
+        ("search[all]", pgsql.SEARCH_SQL.format(tab_filter=""), search, False),
+    ]
+    return queries
+
+
+def _plan_nodes(plan: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+def check_query_plans() -> List[str]:
+    """
+    EXPLAINs each hot query and returns the problems found (empty = all good).
+    Seq scans are disabled for the check, so a seq scan in the plan means no index
+    can serve the query at all (a tiny table alone won't make the check fail).
+    """
+    problems: List[str] = []
+    with db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL enable_seqscan = off;")
+            for name, sql, params, no_sort in _hot_queries():
+                cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+                raw = cur.fetchone()[0]
+                plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+                nodes = list(_plan_nodes(plan))
+                seq: List[str] = [
+                    n["Relation Name"]
+                    for n in nodes
+                    if n["Node Type"] == "Seq Scan" and n.get("Relation Name")
+                ]
+                if seq:
+                    problems.append(f"{name}: sequential scan on {', '.join(seq)}")
+                if no_sort and any(n["Node Type"] in ("Sort", "Incremental Sort") for n in nodes):
+                    problems.append(f"{name}: sorts rows instead of reading them in index order")
+                logger.debug("%s: %s", name, " > ".join(n["Node Type"] for n in nodes))
+            conn.rollback()  # SET LOCAL goes away with the transaction
+    return problems
+
+
+# -------------------------
+# CLI
+# -------------------------
+def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="list migrations and whether they're applied")
+    up = sub.add_parser("up", help="apply pending migrations")
+    up.add_argument("--to", type=int, help="stop after this version")
+    sub.add_parser("check", help="EXPLAIN the hot queries and fail if one can't use an index")
+    prune = sub.add_parser("prune", help="drop delete tombstones older than --days")
+    prune.add_argument("--days", type=float, default=30.0)
+    args = parser.parse_args(argv)
+    configure_logging()
+
+    if args.command == "status":
+        for migration, applied_at in status():
+            state = applied_at.isoformat(timespec="seconds") if applied_at else "pending"
+            print(f"{migration.version:04d}  {migration.name:<28} {state}")
+        return 0
+
+    if args.command == "up":
+        ran = upgrade(args.to)
+        for migration in ran:
+            print(f"applied {migration.version:04d}_{migration.name}")
+        if not ran:
+            print("Schema is up to date.")
+        return 0
+
+    if args.command == "prune":
+        print(f"pruned {prune_tombstones(args.days)} tombstone(s)")
+        return 0
+
+    problems = check_query_plans()
+    for problem in problems:
+        print(problem)
+    if not problems:
+        print("Every hot query is served by an index.")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,97 @@
+-- Baseline schema. Idempotent, so databases created from the old db/Tables.sql adopt it as is.
+
+-- Revision counter shared by task rows and tombstones (delta sync)
+CREATE SEQUENCE IF NOT EXISTS task_revision_seq;
+
+-- Table TASK
+CREATE TABLE IF NOT EXISTS task (
+    id BIGINT GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    subject TEXT NOT NULL,
+    description TEXT,
+    completed BOOLEAN NOT NULL DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    revision BIGINT NOT NULL DEFAULT nextval('task_revision_seq')
+);
+
+-- db/Tables.sql created the table without these columns and with a nullable created_at
+ALTER TABLE task
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    ADD COLUMN IF NOT EXISTS revision BIGINT NOT NULL DEFAULT nextval('task_revision_seq');
+
+UPDATE task SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL;
+ALTER TABLE task
+    ALTER COLUMN created_at SET DEFAULT CURRENT_TIMESTAMP,
+    ALTER COLUMN created_at SET NOT NULL;
+
+CREATE INDEX IF NOT EXISTS task_revision_idx ON task (revision);
+
+-- Table TASK_TOMBSTONE (deleted task ids, so clients can sync deletes)
+CREATE TABLE IF NOT EXISTS task_tombstone (
+    id BIGINT PRIMARY KEY,
+    revision BIGINT NOT NULL DEFAULT nextval('task_revision_seq'),
+    deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS task_tombstone_revision_idx ON task_tombstone (revision);
+
+-- Every update bumps the row revision
+CREATE OR REPLACE FUNCTION task_touch() RETURNS trigger AS $$
+BEGIN
+    NEW.revision := nextval('task_revision_seq');
+    NEW.updated_at := CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS task_touch ON task;
+CREATE TRIGGER task_touch
+    BEFORE UPDATE ON task
+    FOR EACH ROW EXECUTE FUNCTION task_touch();
+
+-- Every delete leaves a tombstone
+CREATE OR REPLACE FUNCTION task_tombstone_on_delete() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO task_tombstone (id) VALUES (OLD.id)
+    ON CONFLICT (id) DO UPDATE
+        SET revision = nextval('task_revision_seq'),
+            deleted_at = CURRENT_TIMESTAMP;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS task_tombstone_on_delete ON task;
+CREATE TRIGGER task_tombstone_on_delete
+    AFTER DELETE ON task
+    FOR EACH ROW EXECUTE FUNCTION task_tombstone_on_delete();
+
+-- Change feed: NOTIFY listeners with the changed row (LISTEN task_changes)
+CREATE OR REPLACE FUNCTION task_notify() RETURNS trigger AS $$
+DECLARE
+    payload TEXT;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        payload := json_build_object('op', TG_OP, 'id', OLD.id)::text;
+    ELSE
+        payload := json_build_object(
+            'op', TG_OP,
+            'id', NEW.id,
+            'revision', NEW.revision,
+            'subject', NEW.subject,
+            'completed', NEW.completed,
+            'created_at', NEW.created_at
+        )::text;
+        -- NOTIFY payloads are capped at 8000 bytes: send only the id, listeners delta-sync
+        IF octet_length(payload) > 7900 THEN
+            payload := json_build_object('op', TG_OP, 'id', NEW.id, 'revision', NEW.revision)::text;
+        END IF;
+    END IF;
+    PERFORM pg_notify('task_changes', payload);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS task_notify ON task;
+CREATE TRIGGER task_notify
+    AFTER INSERT OR UPDATE OR DELETE ON task
+    FOR EACH ROW EXECUTE FUNCTION task_notify();
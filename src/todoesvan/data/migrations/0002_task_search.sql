@@ -0,0 +1,6 @@
+-- Full-text search document ('simple' config: no stemming, works for any language). PostgreSQL 12+.
+ALTER TABLE task ADD COLUMN IF NOT EXISTS search TSVECTOR GENERATED ALWAYS AS (
+    to_tsvector('simple', subject || ' ' || coalesce(description, ''))
+) STORED;
+
+CREATE INDEX IF NOT EXISTS task_search_idx ON task USING GIN (search);
@@ -0,0 +1,9 @@
+-- Tab reads (WHERE completed = ? ORDER BY created_at DESC, id DESC, keyset on the same
+-- pair) walk one of these in order: no seq scan, no sort, and each index only holds its tab.
+CREATE INDEX IF NOT EXISTS task_pending_order_idx
+    ON task (created_at DESC, id DESC) WHERE NOT completed;
+
+CREATE INDEX IF NOT EXISTS task_completed_order_idx
+    ON task (created_at DESC, id DESC) WHERE completed;
+
+ANALYZE task;
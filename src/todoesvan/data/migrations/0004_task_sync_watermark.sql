@@ -0,0 +1,95 @@
+-- Delta sync watermark and tombstone pruning.
+
+-- Revisions come from a sequence, so a slow transaction can commit a lower revision
+-- after a higher one was read. Each writing transaction claims the next revision with a
+-- shared transaction-level advisory lock (claims never block each other) before taking
+-- any: task_sync_revision() hands out no revision at or above a claim still held.
+CREATE OR REPLACE FUNCTION task_claim_revision() RETURNS void AS $$
+BEGIN
+    IF coalesce(current_setting('todoesvan.revision_claimed', true), '') = '' THEN
+        PERFORM set_config('todoesvan.revision_claimed', 'on', true);
+        PERFORM pg_advisory_xact_lock_shared(
+            (SELECT CASE WHEN is_called THEN last_value + 1 ELSE last_value END
+             FROM task_revision_seq)
+        );
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Newest revision every committed change is visible at. Run it in its own statement,
+-- BEFORE the statements reading rows (the sequence first, then the claims, in order).
+CREATE OR REPLACE FUNCTION task_sync_revision() RETURNS BIGINT AS $$
+DECLARE
+    head BIGINT;
+    claim BIGINT;
+BEGIN
+    SELECT CASE WHEN is_called THEN last_value ELSE 0 END INTO head FROM task_revision_seq;
+    SELECT min((l.classid::bigint << 32) | l.objid::bigint) INTO claim
+    FROM pg_locks l
+    WHERE l.locktype = 'advisory'
+      AND l.mode = 'ShareLock'
+      AND l.objsubid = 1
+      AND l.database = (SELECT oid FROM pg_database WHERE datname = current_database());
+    IF claim IS NULL OR claim > head THEN
+        RETURN head;
+    END IF;
+    RETURN claim - 1;
+END;
+$$ LANGUAGE plpgsql VOLATILE;
+
+-- Inserts get their revision here too (after the claim), not from the column default.
+CREATE OR REPLACE FUNCTION task_touch() RETURNS trigger AS $$
+BEGIN
+    PERFORM task_claim_revision();
+    NEW.revision := nextval('task_revision_seq');
+    NEW.updated_at := CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+ALTER TABLE task ALTER COLUMN revision DROP DEFAULT;
+
+DROP TRIGGER IF EXISTS task_touch ON task;
+CREATE TRIGGER task_touch
+    BEFORE INSERT OR UPDATE ON task
+    FOR EACH ROW EXECUTE FUNCTION task_touch();
+
+CREATE OR REPLACE FUNCTION task_tombstone_on_delete() RETURNS trigger AS $$
+BEGIN
+    PERFORM task_claim_revision();
+    INSERT INTO task_tombstone (id) VALUES (OLD.id)
+    ON CONFLICT (id) DO UPDATE
+        SET revision = nextval('task_revision_seq'),
+            deleted_at = CURRENT_TIMESTAMP;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Tombstones older than the retention are pruned; a client whose last sync is older
+-- than the newest pruned one reloads everything instead (deletes since then are unknown).
+CREATE TABLE IF NOT EXISTS task_sync_horizon (
+    id BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (id),
+    revision BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO task_sync_horizon DEFAULT VALUES ON CONFLICT DO NOTHING;
+
+CREATE INDEX IF NOT EXISTS task_tombstone_deleted_at_idx ON task_tombstone (deleted_at);
+
+CREATE OR REPLACE FUNCTION task_prune_tombstones(keep INTERVAL) RETURNS INTEGER AS $$
+DECLARE
+    pruned INTEGER;
+    horizon BIGINT;
+BEGIN
+    WITH gone AS (
+        DELETE FROM task_tombstone
+        WHERE deleted_at < CURRENT_TIMESTAMP - keep
+        RETURNING revision
+    )
+    SELECT count(*), max(revision) INTO pruned, horizon FROM gone;
+    IF horizon IS NOT NULL THEN
+        UPDATE task_sync_horizon SET revision = greatest(revision, horizon);
+    END IF;
+    RETURN pruned;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,62 @@
+-- Per-tab totals kept by triggers: delta syncs read them instead of counting both tabs.
+-- Spread over slots (by backend) so concurrent writers don't queue on one row; readers
+-- sum at most 32 rows.
+CREATE TABLE IF NOT EXISTS task_count (
+    slot SMALLINT NOT NULL,
+    completed BOOLEAN NOT NULL,
+    n BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (slot, completed)
+);
+
+-- Backfill without racing writers (they wait for this transaction).
+LOCK TABLE task IN SHARE MODE;
+DELETE FROM task_count;
+INSERT INTO task_count (slot, completed, n)
+SELECT 0, completed, count(*) FROM task GROUP BY completed;
+
+-- Statement level: a bulk statement costs one counter update per tab, not one per row.
+CREATE OR REPLACE FUNCTION task_count_rows() RETURNS trigger AS $$
+DECLARE
+    my_slot SMALLINT := pg_backend_pid() % 16;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO task_count (slot, completed, n)
+        SELECT my_slot, r.completed, count(*) FROM new_rows r GROUP BY r.completed
+        ON CONFLICT (slot, completed) DO UPDATE SET n = task_count.n + EXCLUDED.n;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO task_count (slot, completed, n)
+        SELECT my_slot, r.completed, -count(*) FROM old_rows r GROUP BY r.completed
+        ON CONFLICT (slot, completed) DO UPDATE SET n = task_count.n + EXCLUDED.n;
+    ELSE
+        INSERT INTO task_count (slot, completed, n)
+        SELECT my_slot, d.completed, sum(d.n)
+        FROM (
+            SELECT r.completed, 1 AS n FROM new_rows r
+            UNION ALL
+            SELECT r.completed, -1 AS n FROM old_rows r
+        ) d
+        GROUP BY d.completed
+        HAVING sum(d.n) <> 0
+        ON CONFLICT (slot, completed) DO UPDATE SET n = task_count.n + EXCLUDED.n;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS task_count_insert ON task;
+CREATE TRIGGER task_count_insert
+    AFTER INSERT ON task
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_count_rows();
+
+DROP TRIGGER IF EXISTS task_count_delete ON task;
+CREATE TRIGGER task_count_delete
+    AFTER DELETE ON task
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_count_rows();
+
+DROP TRIGGER IF EXISTS task_count_update ON task;
+CREATE TRIGGER task_count_update
+    AFTER UPDATE ON task
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION task_count_rows();
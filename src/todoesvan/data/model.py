@@ -1,8 +1,96 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
 
 
-@dataclass
 class Task:
+    """
+    One task row. Hand-written with __slots__ (dataclass(slots=True) needs Python 3.10):
+    stores cache up to ~100k of these, and a __dict__ per task roughly doubles its size.
+    Mutable, compared by value and unhashable, like the dataclass it replaces.
+    """
+
+    __slots__ = ("id", "subject", "completed", "created_at")
+
+    def __init__(
+        self, id: int, subject: str, completed: bool, created_at: Optional[datetime] = None
+    ) -> None:
+        self.id = id
+        self.subject = subject
+        self.completed = completed
+        self.created_at = created_at
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Task):
+            return NotImplemented
+        return (self.id, self.subject, self.completed, self.created_at) == (
+            other.id,
+            other.subject,
+            other.completed,
+            other.created_at,
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return (
+            f"Task(id={self.id!r}, subject={self.subject!r}, "
+            f"completed={self.completed!r}, created_at={self.created_at!r})"
+        )
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """Keyset position: the (created_at, id) of the last row already loaded."""
+    created_at: datetime
     id: int
-    subject: str
-    completed: bool
+
+
+@dataclass
+class TaskPage:
+    tasks: List[Task]
+    next_cursor: Optional[PageCursor]  # None when there are no more rows
+    revision: int = 0  # table revision read just before the page
+
+
+@dataclass
+class TaskSearchPage:
+    """Search hits, best match first. Paged by offset: rank order has no stable keyset."""
+    tasks: List[Task]
+    next_offset: Optional[int]  # None when there are no more hits
+
+
+@dataclass
+class TaskChanges:
+    """Rows changed and ids deleted after a given revision."""
+    upserts: List[Task]
+    deleted_ids: List[int]
+    revision: int  # pass this back as `since` on the next sync
+    counts: Optional[Dict[bool, int]] = None  # per-tab totals, when anything changed
+    reset: bool = False  # `since` predates the pruned tombstones: reload everything
+
+
+@dataclass
+class TaskOverview:
+    """Per-tab totals plus the first page of each tab, read in one round trip."""
+    counts: Dict[bool, int]
+    pages: Dict[bool, TaskPage]
+    revision: int
+
+
+@dataclass
+class TaskBatch:
+    """Compacted writes sent in one transaction."""
+    creates: List[Tuple[int, str, bool]] = field(default_factory=list)  # (temp_id, subject, completed)
+    completed: List[Tuple[int, bool]] = field(default_factory=list)
+    subjects: List[Tuple[int, str]] = field(default_factory=list)
+    deletes: List[int] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.creates or self.completed or self.subjects or self.deletes)
+
+
+@dataclass
+class BatchResult:
+    created: Dict[int, Task]  # temp_id -> inserted row
+    missing_ids: Set[int]  # updates/deletes that matched no row (committed anyway)
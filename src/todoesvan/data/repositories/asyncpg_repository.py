@@ -0,0 +1,413 @@
+"""
+AsyncTaskRepository on PostgreSQL through asyncpg: queries are awaited on the
+event loop instead of holding a worker thread for each round trip.
+
+The statements are shared with the psycopg2 repository (repositories/sql.py,
+placeholders renumbered), so both engines hit the same indexes and `migrate check`
+covers this one too; this module doesn't import psycopg2. asyncpg prepares and
+caches every statement per connection, and multi-row writes send arrays (unnest)
+instead of one statement per row.
+"""
+import asyncio
+import itertools
+import os
+import re
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
+import asyncpg
+
+from todoesvan.data.errors import DatabaseUnavailable, PoolTimeout, QueryTimeout
+from todoesvan.data.model import (
+    BatchResult,
+    PageCursor,
+    Task,
+    TaskBatch,
+    TaskChanges,
+    TaskOverview,
+    TaskPage,
+    TaskSearchPage,
+)
+from todoesvan.data.repositories import sql as pgsql
+from todoesvan.data.repositories.base import (
+    page_from_rows,
+    search_page_from_rows,
+    search_terms,
+)
+from todoesvan.utils.env import load_env
+from todoesvan.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Errors that mean the server can't be reached (as opposed to a failed statement).
+_UNAVAILABLE = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.ConnectionDoesNotExistError,
+    asyncpg.CannotConnectNowError,
+)
+
+_PLACEHOLDER = re.compile(r"%(?:\((\w+)\))?s")
+
+
+def numbered(sql: str, names: Sequence[str] = ()) -> str:
+    """psycopg2 placeholders -> asyncpg's: %s in order, %(name)s by position in `names`."""
+    positions = {name: i for i, name in enumerate(names, 1)}
+    counter = itertools.count(1)
+    return _PLACEHOLDER.sub(
+        lambda m: f"${positions[m.group(1)] if m.group(1) else next(counter)}", sql
+    )
+
+
+TAB_SQL = numbered(pgsql.TAB_SQL)
+TAB_PAGE_SQL = numbered(pgsql.TAB_PAGE_SQL)
+TAB_PAGE_AFTER_SQL = numbered(pgsql.TAB_PAGE_AFTER_SQL)
+CHANGED_ROWS_SQL = numbered(pgsql.CHANGED_ROWS_SQL)
+TOMBSTONES_SQL = numbered(pgsql.TOMBSTONES_SQL)
+INSERT_ROWS_SQL = numbered(pgsql.INSERT_ROWS_SQL)
+OVERVIEW_SQL = numbered(pgsql.OVERVIEW_SQL)
+_SEARCH_PARAMS = ("query", "limit", "offset", "completed")
+SEARCH_SQL = numbered(pgsql.SEARCH_SQL.format(tab_filter=""), _SEARCH_PARAMS)
+SEARCH_TAB_SQL = numbered(
+    pgsql.SEARCH_SQL.format(tab_filter="AND completed = %(completed)s"), _SEARCH_PARAMS
+)
+
+_TASK_COLUMNS = "id, subject, completed, created_at"
+
+
+class AsyncpgTaskRepository:
+    """
+    One pool per event loop (asyncpg connections belong to the loop that opened
+    them), created on first use from the DB_* / DB_POOL_* variables.
+    """
+
+    def __init__(self) -> None:
+        self._pools: Dict[asyncio.AbstractEventLoop, "asyncio.Task[asyncpg.Pool]"] = {}
+
+    # -------------------------
+    # Connections
+    # -------------------------
+    async def _pool(self) -> asyncpg.Pool:
+        loop = asyncio.get_running_loop()
+        creating = self._pools.get(loop)
+        if creating is None:
+            creating = self._pools[loop] = loop.create_task(self._create_pool())
+        try:
+            return await asyncio.shield(creating)
+        except BaseException:
+            # Don't cache a failed attempt: the next call tries again.
+            if creating.done() and self._pools.get(loop) is creating:
+                del self._pools[loop]
+            raise
+
+    @staticmethod
+    async def _create_pool() -> asyncpg.Pool:
+        load_env()
+        port = os.getenv("DB_PORT")
+        return await asyncpg.create_pool(
+            host=os.getenv("DB_HOST"),
+            database=os.getenv("DB_NAME"),
+            user=os.getenv("DB_USER"),
+            password=os.getenv("DB_PASSWORD"),
+            port=int(port) if port else None,
+            min_size=int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+            max_size=int(os.getenv("DB_POOL_MAX_SIZE", "5")),
+            max_inactive_connection_lifetime=float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300")),
+            # Enforced by the server; a cancelled query is also cancelled there by asyncpg.
+            server_settings={
+                "statement_timeout": str(int(float(os.getenv("DB_STATEMENT_TIMEOUT", "15")) * 1000))
+            },
+        )
+
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Pooled connection; each statement commits on its own unless the caller
+        opens a transaction. Connection-level failures surface as DatabaseUnavailable,
+        a pool with every connection busy as PoolTimeout.
+        """
+        try:
+            pool = await self._pool()
+            timeout = float(os.getenv("DB_POOL_CHECKOUT_TIMEOUT", "10"))
+            try:
+                conn = await pool.acquire(timeout=timeout)
+            except asyncio.TimeoutError as ex:
+                # Full and nothing came back in time: busy, not unreachable.
+                if pool.get_idle_size() == 0 and pool.get_size() >= pool.get_max_size():
+                    raise PoolTimeout("Timed out waiting for a database connection.") from ex
+                raise
+            try:
+                yield conn
+            finally:
+                await pool.release(conn)
+        except asyncpg.QueryCanceledError as ex:
+            raise QueryTimeout(str(ex).strip()) from ex
+        except _UNAVAILABLE as ex:
+            raise DatabaseUnavailable(str(ex).strip() or type(ex).__name__) from ex
+
+    async def close(self) -> None:
+        pools, self._pools = self._pools, {}
+        for creating in pools.values():
+            if creating.done() and not creating.exception():
+                await creating.result().close()
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    async def create(self, subject: str) -> Task:
+        async with self._connection() as conn:
+            row = await conn.fetchrow(
+                f"INSERT INTO task (subject) VALUES ($1) RETURNING {_TASK_COLUMNS};", subject
+            )
+        if row is None:
+            raise RuntimeError("Task insert did not return a row.")
+        return self._to_task(row)
+
+    async def get_tasks(self, completed: bool) -> List[Task]:
+        async with self._connection() as conn:
+            rows = await conn.fetch(TAB_SQL, completed)
+        return [self._to_task(row) for row in rows]
+
+    async def get_tasks_page(
+        self,
+        completed: bool,
+        limit: int,
+        after: Optional[PageCursor] = None,
+    ) -> TaskPage:
+        """Keyset page ordered by (created_at, id) DESC, starting after `after`."""
+        if limit < 1:
+            raise ValueError("Page size must be positive.")
+
+        async with self._connection() as conn:
+            # Read before the page (capped like delta syncs): later changes, and
+            # writes still in flight, are picked up by the next delta sync.
+            revision, _ = await self._sync_state(conn)
+            if after is None:
+                rows = await conn.fetch(TAB_PAGE_SQL, completed, limit + 1)
+            else:
+                rows = await conn.fetch(
+                    TAB_PAGE_AFTER_SQL, completed, after.created_at, after.id, limit + 1
+                )
+
+        return page_from_rows([self._to_task(row) for row in rows], limit, revision)
+
+    async def get_overview(self, limit_pending: int, limit_completed: int) -> TaskOverview:
+        if limit_pending < 1 or limit_completed < 1:
+            raise ValueError("Page size must be positive.")
+
+        async with self._connection() as conn:
+            revision, _ = await self._sync_state(conn)
+            rows = await conn.fetch(OVERVIEW_SQL, limit_pending + 1, limit_completed + 1)
+        return pgsql.overview_from_rows(rows, limit_pending, limit_completed, revision)
+
+    async def current_revision(self) -> int:
+        async with self._connection() as conn:
+            return await self._current_revision(conn)
+
+    async def get_changes_since(self, revision: int) -> TaskChanges:
+        """Same caveats as PostgresTaskRepository.get_changes_since."""
+        async with self._connection() as conn:
+            head, horizon = await self._sync_state(conn)
+            if revision < horizon:
+                return TaskChanges(upserts=[], deleted_ids=[], revision=revision, reset=True)
+            if head <= revision:
+                return TaskChanges(upserts=[], deleted_ids=[], revision=revision)
+
+            rows = await conn.fetch(CHANGED_ROWS_SQL, revision)
+            tombstones = await conn.fetch(TOMBSTONES_SQL, revision)
+            counts = await conn.fetchrow(pgsql.COUNTS_SQL)
+
+        return TaskChanges(
+            upserts=[self._to_task(row) for row in rows],
+            deleted_ids=[row[0] for row in tombstones],
+            revision=head,
+            counts={False: int(counts[0]), True: int(counts[1])},
+        )
+
+    async def search(
+        self,
+        query: str,
+        completed: Optional[bool],
+        limit: int,
+        offset: int = 0,
+    ) -> TaskSearchPage:
+        if limit < 1:
+            raise ValueError("Page size must be positive.")
+        terms = search_terms(query)
+        if not terms:
+            return TaskSearchPage(tasks=[], next_offset=None)
+
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        async with self._connection() as conn:
+            if completed is None:
+                rows = await conn.fetch(SEARCH_SQL, tsquery, limit + 1, offset)
+            else:
+                rows = await conn.fetch(SEARCH_TAB_SQL, tsquery, limit + 1, offset, completed)
+
+        return search_page_from_rows([self._to_task(row) for row in rows], limit, offset)
+
+    async def get_descriptions(self, task_ids: Sequence[int]) -> Dict[int, str]:
+        if not task_ids:
+            return {}
+        async with self._connection() as conn:
+            rows = await conn.fetch(
+                "SELECT id, coalesce(description, '') FROM task WHERE id = ANY($1::bigint[]);",
+                list(task_ids),
+            )
+        return {row[0]: row[1] for row in rows}
+
+    # -------------------------
+    # Single writes
+    # -------------------------
+    async def set_completed(self, task_id: int, completed: bool) -> None:
+        await self._update_one(
+            "UPDATE task SET completed = $1 WHERE id = $2;", completed, task_id, "set_completed"
+        )
+
+    async def update_subject(self, task_id: int, subject: str) -> None:
+        await self._update_one(
+            "UPDATE task SET subject = $1 WHERE id = $2;", subject, task_id, "update_subject"
+        )
+
+    async def update_description(self, task_id: int, description: str) -> None:
+        await self._update_one(
+            "UPDATE task SET description = NULLIF($1, '') WHERE id = $2;",
+            description,
+            task_id,
+            "update_description",
+        )
+
+    async def delete(self, task_id: int) -> None:
+        async with self._connection() as conn:
+            status = await conn.execute("DELETE FROM task WHERE id = $1;", task_id)
+        if self._rowcount(status) == 0:
+            raise LookupError("Task not found (delete).")
+
+    # -------------------------
+    # Bulk (one statement each)
+    # -------------------------
+    async def bulk_create(self, subjects: Sequence[str]) -> List[Task]:
+        if not subjects:
+            return []
+        async with self._connection() as conn:
+            rows = await conn.fetch(INSERT_ROWS_SQL, list(subjects), [False] * len(subjects))
+        return [task for _, task in pgsql.inserted_from_rows(rows, len(subjects))]
+
+    async def bulk_set_completed(self, task_ids: Sequence[int], completed: bool) -> List[int]:
+        if not task_ids:
+            return []
+        return await self._ids(
+            "UPDATE task SET completed = $1 WHERE id = ANY($2::bigint[]) RETURNING id;",
+            completed,
+            list(task_ids),
+        )
+
+    async def bulk_delete(self, task_ids: Sequence[int]) -> List[int]:
+        if not task_ids:
+            return []
+        return await self._ids(
+            "DELETE FROM task WHERE id = ANY($1::bigint[]) RETURNING id;", list(task_ids)
+        )
+
+    async def clear_completed(
+        self, also_ids: Sequence[int] = (), keep_ids: Sequence[int] = ()
+    ) -> List[int]:
+        return await self._ids(
+            """
+            DELETE FROM task
+            WHERE (completed OR id = ANY($1::bigint[])) AND NOT id = ANY($2::bigint[])
+            RETURNING id;
+            """,
+            list(also_ids),
+            list(keep_ids),
+        )
+
+    async def apply_batch(self, batch: TaskBatch) -> BatchResult:
+        """Like PostgresTaskRepository.apply_batch: one transaction, one statement per kind."""
+        created: Dict[int, Task] = {}
+        missing: Set[int] = set()
+
+        async with self._connection() as conn:
+            async with conn.transaction():
+                if batch.deletes:
+                    rows = await conn.fetch(
+                        "DELETE FROM task WHERE id = ANY($1::bigint[]) RETURNING id;",
+                        list(batch.deletes),
+                    )
+                    found = {row[0] for row in rows}
+                    missing.update(tid for tid in batch.deletes if tid not in found)
+
+                if batch.completed:
+                    rows = await conn.fetch(
+                        """
+                        UPDATE task AS t
+                        SET completed = v.completed
+                        FROM unnest($1::bigint[], $2::boolean[]) AS v(id, completed)
+                        WHERE t.id = v.id
+                        RETURNING t.id;
+                        """,
+                        [tid for tid, _ in batch.completed],
+                        [done for _, done in batch.completed],
+                    )
+                    found = {row[0] for row in rows}
+                    missing.update(tid for tid, _ in batch.completed if tid not in found)
+
+                if batch.subjects:
+                    rows = await conn.fetch(
+                        """
+                        UPDATE task AS t
+                        SET subject = v.subject
+                        FROM unnest($1::bigint[], $2::text[]) AS v(id, subject)
+                        WHERE t.id = v.id
+                        RETURNING t.id;
+                        """,
+                        [tid for tid, _ in batch.subjects],
+                        [subject for _, subject in batch.subjects],
+                    )
+                    found = {row[0] for row in rows}
+                    missing.update(tid for tid, _ in batch.subjects if tid not in found)
+
+                if batch.creates:
+                    rows = await conn.fetch(
+                        INSERT_ROWS_SQL,
+                        [subject for _, subject, _ in batch.creates],
+                        [done for _, _, done in batch.creates],
+                    )
+                    for i, task in pgsql.inserted_from_rows(rows, len(batch.creates)):
+                        created[batch.creates[i][0]] = task
+
+        return BatchResult(created=created, missing_ids=missing)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    async def _update_one(self, sql: str, value: Any, task_id: int, op: str) -> None:
+        async with self._connection() as conn:
+            status = await conn.execute(sql, value, task_id)
+        if self._rowcount(status) == 0:
+            raise LookupError(f"Task not found ({op}).")
+
+    async def _ids(self, sql: str, *args: Any) -> List[int]:
+        async with self._connection() as conn:
+            rows = await conn.fetch(sql, *args)
+        return [row[0] for row in rows]
+
+    @staticmethod
+    async def _sync_state(conn: asyncpg.Connection) -> Tuple[int, int]:
+        row = await conn.fetchrow(pgsql.SYNC_STATE_SQL)
+        return int(row[0]), int(row[1])
+
+    @staticmethod
+    async def _current_revision(conn: asyncpg.Connection) -> int:
+        value = await conn.fetchval(pgsql.REVISION_SQL)
+        return int(value) if value is not None else 0
+
+    @staticmethod
+    def _rowcount(status: str) -> int:
+        # Command tag, e.g. "UPDATE 1" / "DELETE 0".
+        return int(status.rsplit(" ", 1)[-1])
+
+    @staticmethod
+    def _to_task(row: Sequence[Any]) -> Task:
+        return Task(row[0], row[1], row[2], row[3])
@@ -0,0 +1,150 @@
+import re
+from typing import Dict, List, Optional, Protocol, Sequence
+
+from todoesvan.data.model import (
+    BatchResult,
+    PageCursor,
+    Task,
+    TaskBatch,
+    TaskChanges,
+    TaskOverview,
+    TaskPage,
+    TaskSearchPage,
+)
+
+
+class TaskRepository(Protocol):
+    """
+    Storage contract shared by every engine (postgres, sqlite, memory).
+      - tabs are ordered by (created_at, id) DESC; pages use that pair as keyset cursor
+      - every write bumps a monotonically increasing revision; deletes leave a
+        tombstone so get_changes_since can report them
+      - missing rows raise LookupError (single ops) or are reported back (bulk/batch)
+      - list reads leave descriptions out; get_descriptions fetches them by id
+        ("" for none, missing ids left out)
+      - search matches every term of the query as a word prefix ("buy mil" finds
+        "Buy milk"); completed=None searches both tabs
+    """
+
+    def create(self, subject: str) -> Task: ...
+
+    def get_tasks(self, completed: bool) -> List[Task]: ...
+
+    def get_tasks_page(
+        self, completed: bool, limit: int, after: Optional[PageCursor] = None
+    ) -> TaskPage: ...
+
+    def get_overview(self, limit_pending: int, limit_completed: int) -> TaskOverview: ...
+
+    def current_revision(self) -> int: ...
+
+    def get_changes_since(self, revision: int) -> TaskChanges: ...
+
+    def search(
+        self, query: str, completed: Optional[bool], limit: int, offset: int = 0
+    ) -> TaskSearchPage: ...
+
+    def get_descriptions(self, task_ids: Sequence[int]) -> Dict[int, str]: ...
+
+    def set_completed(self, task_id: int, completed: bool) -> None: ...
+
+    def update_subject(self, task_id: int, subject: str) -> None: ...
+
+    def update_description(self, task_id: int, description: str) -> None: ...
+
+    def delete(self, task_id: int) -> None: ...
+
+    def bulk_create(self, subjects: Sequence[str]) -> List[Task]: ...
+
+    def bulk_set_completed(self, task_ids: Sequence[int], completed: bool) -> List[int]: ...
+
+    def bulk_delete(self, task_ids: Sequence[int]) -> List[int]: ...
+
+    def clear_completed(
+        self, also_ids: Sequence[int] = (), keep_ids: Sequence[int] = ()
+    ) -> List[int]: ...
+
+    def apply_batch(self, batch: TaskBatch) -> BatchResult: ...
+
+
+class AsyncTaskRepository(Protocol):
+    """TaskRepository's contract with coroutine methods, awaited on the event loop."""
+
+    async def create(self, subject: str) -> Task: ...
+
+    async def get_tasks(self, completed: bool) -> List[Task]: ...
+
+    async def get_tasks_page(
+        self, completed: bool, limit: int, after: Optional[PageCursor] = None
+    ) -> TaskPage: ...
+
+    async def get_overview(self, limit_pending: int, limit_completed: int) -> TaskOverview: ...
+
+    async def current_revision(self) -> int: ...
+
+    async def get_changes_since(self, revision: int) -> TaskChanges: ...
+
+    async def search(
+        self, query: str, completed: Optional[bool], limit: int, offset: int = 0
+    ) -> TaskSearchPage: ...
+
+    async def get_descriptions(self, task_ids: Sequence[int]) -> Dict[int, str]: ...
+
+    async def set_completed(self, task_id: int, completed: bool) -> None: ...
+
+    async def update_subject(self, task_id: int, subject: str) -> None: ...
+
+    async def update_description(self, task_id: int, description: str) -> None: ...
+
+    async def delete(self, task_id: int) -> None: ...
+
+    async def bulk_create(self, subjects: Sequence[str]) -> List[Task]: ...
+
+    async def bulk_set_completed(self, task_ids: Sequence[int], completed: bool) -> List[int]: ...
+
+    async def bulk_delete(self, task_ids: Sequence[int]) -> List[int]: ...
+
+    async def clear_completed(
+        self, also_ids: Sequence[int] = (), keep_ids: Sequence[int] = ()
+    ) -> List[int]: ...
+
+    async def apply_batch(self, batch: TaskBatch) -> BatchResult: ...
+
+
+def page_from_rows(tasks: List[Task], limit: int, revision: int) -> TaskPage:
+    """Builds a page from up to limit + 1 ordered rows (the extra row means 'more')."""
+    next_cursor = None
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        assert last.created_at is not None  # rows read back from the database have it
+        next_cursor = PageCursor(created_at=last.created_at, id=last.id)
+    return TaskPage(tasks=tasks, next_cursor=next_cursor, revision=revision)
+
+
+# Longer queries add little precision and make the index lookup slower.
+MAX_SEARCH_TERMS = 8
+
+_WORD = re.compile(r"\w+")
+
+
+def search_words(text: str) -> List[str]:
+    """Lower-cased words of a text (punctuation and operators are dropped)."""
+    return _WORD.findall((text or "").lower())
+
+
+def search_terms(query: str) -> List[str]:
+    return search_words(query)[:MAX_SEARCH_TERMS]
+
+
+def matches_terms(text: str, terms: Sequence[str]) -> bool:
+    """True when every term prefixes some word of text (search semantics, done locally)."""
+    words = search_words(text)
+    return all(any(w.startswith(term) for w in words) for term in terms)
+
+
+def search_page_from_rows(tasks: List[Task], limit: int, offset: int) -> TaskSearchPage:
+    """Like page_from_rows, for offset-paged search hits."""
+    if len(tasks) > limit:
+        return TaskSearchPage(tasks=tasks[:limit], next_offset=offset + limit)
+    return TaskSearchPage(tasks=tasks, next_offset=None)
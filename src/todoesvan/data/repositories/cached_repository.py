@@ -0,0 +1,351 @@
+"""
+Process-wide read cache in front of the async repository. In web mode every browser
+session has its own TaskStore, and they all read through this one instance, so N open
+sessions cost about one database read per distinct query instead of N.
+
+  - entries are versioned: a read only fills the cache if no write was seen while it
+    ran and it isn't older than the newest revision announced by the change feed
+  - writes made through the cache, and change feed events for everyone else's writes,
+    invalidate the list reads and patch or drop the cached descriptions
+  - identical reads in flight at the same time share one query
+  - callers get their own Task objects (stores edit tasks in place)
+  - entries older than `ttl` are re-read, which bounds staleness for writers the cache
+    can't see (another process while the change feed is down, or SQLite)
+"""
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+from todoesvan.data.change_feed import TaskEvent
+from todoesvan.data.model import (
+    BatchResult,
+    PageCursor,
+    Task,
+    TaskBatch,
+    TaskChanges,
+    TaskOverview,
+    TaskPage,
+    TaskSearchPage,
+)
+from todoesvan.data.repositories.base import AsyncTaskRepository
+from todoesvan.utils.lru import LRUCache
+
+
+@dataclass(frozen=True)
+class SharedCacheStats:
+    hits: int
+    misses: int
+    coalesced: int  # reads that joined an identical one in flight
+    invalidations: int
+    entries: int
+
+
+@dataclass
+class _Entry:
+    value: Any
+    stored_at: float
+
+
+@dataclass
+class _Flight:
+    task: "asyncio.Task[Any]"
+    waiters: int = 0
+
+
+def _copy_tasks(tasks: List[Task]) -> List[Task]:
+    return [Task(t.id, t.subject, t.completed, t.created_at) for t in tasks]
+
+
+def _copy_page(page: TaskPage) -> TaskPage:
+    return TaskPage(_copy_tasks(page.tasks), page.next_cursor, page.revision)
+
+
+def _private_copy(value: Any) -> Any:
+    """A copy the caller may mutate without touching the cached value."""
+    if isinstance(value, TaskPage):
+        return _copy_page(value)
+    if isinstance(value, TaskOverview):
+        return TaskOverview(
+            dict(value.counts), {tab: _copy_page(p) for tab, p in value.pages.items()}, value.revision
+        )
+    if isinstance(value, TaskChanges):
+        counts = dict(value.counts) if value.counts is not None else None
+        return TaskChanges(
+            _copy_tasks(value.upserts), list(value.deleted_ids), value.revision, counts, value.reset
+        )
+    if isinstance(value, TaskSearchPage):
+        return TaskSearchPage(_copy_tasks(value.tasks), value.next_offset)
+    if isinstance(value, list):
+        return _copy_tasks(value)
+    return value
+
+
+class SharedCacheRepository:
+    """AsyncTaskRepository that serves repeated reads from a cache shared by all sessions."""
+
+    def __init__(
+        self,
+        inner: AsyncTaskRepository,
+        ttl: float = 30.0,
+        max_entries: int = 256,
+        max_descriptions: int = 4096,
+    ):
+        self._inner = inner
+        self.ttl = ttl
+        # Called from the loop, worker threads and the change feed thread.
+        self._lock = threading.Lock()
+        self._entries: LRUCache[Hashable, _Entry] = LRUCache(max_entries)
+        self._descriptions: LRUCache[int, str] = LRUCache(max_descriptions)
+        self._flights: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], _Flight] = {}
+        self._generation = 0  # bumped by every invalidation
+        self._revision = 0  # newest revision announced by the change feed
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._invalidations = 0
+
+    # -------------------------
+    # Invalidation
+    # -------------------------
+    def invalidate(self, task_ids: Sequence[int] = (), all_descriptions: bool = False) -> None:
+        """Drops every cached list read, plus the descriptions of `task_ids` (or all of them)."""
+        with self._lock:
+            self._generation += 1
+            self._invalidations += 1
+            self._entries.clear()
+            if all_descriptions:
+                self._descriptions.clear()
+            for tid in task_ids:
+                self._descriptions.pop(tid)
+
+    def on_feed_event(self, event: TaskEvent) -> None:
+        """Change feed subscriber: another session or process wrote to the table."""
+        if event.op == TaskEvent.RESYNC:
+            # Notifications may have been missed while the listener was away.
+            self.invalidate(all_descriptions=True)
+            return
+        with self._lock:
+            self._revision = max(self._revision, event.revision)
+        self.invalidate((event.task_id,))
+
+    def stats(self) -> SharedCacheStats:
+        with self._lock:
+            return SharedCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                coalesced=self._coalesced,
+                invalidations=self._invalidations,
+                entries=len(self._entries),
+            )
+
+    # -------------------------
+    # Cached reads
+    # -------------------------
+    async def _read(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry.stored_at <= self.ttl:
+                    self._hits += 1
+                    return _private_copy(entry.value)
+                self._entries.pop(key)
+        value = await self._join(key, lambda generation: self._load(key, load, generation))
+        return _private_copy(value)
+
+    async def _join(self, key: Hashable, start: Callable[[int], Coroutine[Any, Any, Any]]) -> Any:
+        """Awaits the read in flight under `key`, starting it (start(generation)) if there's none."""
+        with self._lock:
+            loop = asyncio.get_running_loop()
+            flight = self._flights.get((loop, key))
+            if flight is None:
+                self._misses += 1
+                flight = _Flight(loop.create_task(start(self._generation)))
+                self._flights[(loop, key)] = flight
+                flight.task.add_done_callback(lambda _: self._end_flight(loop, key, flight))
+            else:
+                self._coalesced += 1
+            flight.waiters += 1
+
+        try:
+            # Shielded: one caller giving up (superseded refresh) doesn't fail the others.
+            value = await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            with self._lock:
+                flight.waiters -= 1
+                abandoned = flight.waiters == 0
+                if abandoned and self._flights.get((loop, key)) is flight:
+                    # Readers arriving from now on start a new query, not join this one.
+                    del self._flights[(loop, key)]
+            if abandoned:
+                flight.task.cancel()  # nobody wants it: cancel the query too
+            raise
+        with self._lock:
+            flight.waiters -= 1
+        return value
+
+    def _end_flight(self, loop: asyncio.AbstractEventLoop, key: Hashable, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get((loop, key)) is flight:
+                del self._flights[(loop, key)]
+
+    async def _load(self, key: Hashable, load: Callable[[], Awaitable[Any]], generation: int) -> Any:
+        value = await load()
+        with self._lock:
+            # A write seen meanwhile may not be in `value`: hand it out, don't keep it.
+            revision = getattr(value, "revision", None)  # search hits and full tabs have none
+            if generation == self._generation and (revision is None or revision >= self._revision):
+                self._entries.put(key, _Entry(value, time.monotonic()))
+        return value
+
+    async def get_tasks(self, completed: bool) -> List[Task]:
+        tasks = await self._read(("tasks", completed), lambda: self._inner.get_tasks(completed))
+        return cast(List[Task], tasks)
+
+    async def get_tasks_page(
+        self, completed: bool, limit: int, after: Optional[PageCursor] = None
+    ) -> TaskPage:
+        page = await self._read(
+            ("page", completed, limit, after),
+            lambda: self._inner.get_tasks_page(completed, limit, after),
+        )
+        return cast(TaskPage, page)
+
+    async def get_overview(self, limit_pending: int, limit_completed: int) -> TaskOverview:
+        overview = await self._read(
+            ("overview", limit_pending, limit_completed),
+            lambda: self._inner.get_overview(limit_pending, limit_completed),
+        )
+        return cast(TaskOverview, overview)
+
+    async def get_changes_since(self, revision: int) -> TaskChanges:
+        changes = await self._read(("changes", revision), lambda: self._inner.get_changes_since(revision))
+        return cast(TaskChanges, changes)
+
+    async def search(
+        self, query: str, completed: Optional[bool], limit: int, offset: int = 0
+    ) -> TaskSearchPage:
+        hits = await self._read(
+            ("search", query, completed, limit, offset),
+            lambda: self._inner.search(query, completed, limit, offset),
+        )
+        return cast(TaskSearchPage, hits)
+
+    async def get_descriptions(self, task_ids: Sequence[int]) -> Dict[int, str]:
+        found: Dict[int, str] = {}
+        missing: List[int] = []
+        with self._lock:
+            for tid in task_ids:
+                text = self._descriptions.get(tid)
+                if text is None:
+                    missing.append(tid)
+                else:
+                    found[tid] = text
+        if not missing:
+            return found
+
+        loaded = await self._join(
+            ("descriptions", tuple(missing)),
+            lambda generation: self._load_descriptions(missing, generation),
+        )
+        found.update(loaded)
+        return found
+
+    async def _load_descriptions(self, task_ids: List[int], generation: int) -> Dict[int, str]:
+        loaded = await self._inner.get_descriptions(task_ids)
+        with self._lock:
+            if generation == self._generation:
+                for tid, text in loaded.items():
+                    self._descriptions.put(tid, text)
+        return loaded
+
+    async def current_revision(self) -> int:
+        # Never cached: the store uses it to probe the connection.
+        return await self._inner.current_revision()
+
+    # -------------------------
+    # Writes (invalidate even on failure: a dropped COMMIT may still have landed)
+    # -------------------------
+    async def create(self, subject: str) -> Task:
+        try:
+            return await self._inner.create(subject)
+        finally:
+            self.invalidate()
+
+    async def set_completed(self, task_id: int, completed: bool) -> None:
+        try:
+            await self._inner.set_completed(task_id, completed)
+        finally:
+            self.invalidate()
+
+    async def update_subject(self, task_id: int, subject: str) -> None:
+        try:
+            await self._inner.update_subject(task_id, subject)
+        finally:
+            self.invalidate()
+
+    async def update_description(self, task_id: int, description: str) -> None:
+        try:
+            await self._inner.update_description(task_id, description)
+        except BaseException:
+            self.invalidate((task_id,))
+            raise
+        self.invalidate((task_id,))
+        with self._lock:
+            self._descriptions.put(task_id, description)
+
+    async def delete(self, task_id: int) -> None:
+        try:
+            await self._inner.delete(task_id)
+        finally:
+            self.invalidate((task_id,))
+
+    async def bulk_create(self, subjects: Sequence[str]) -> List[Task]:
+        try:
+            return await self._inner.bulk_create(subjects)
+        finally:
+            self.invalidate()
+
+    async def bulk_set_completed(self, task_ids: Sequence[int], completed: bool) -> List[int]:
+        try:
+            return await self._inner.bulk_set_completed(task_ids, completed)
+        finally:
+            self.invalidate()
+
+    async def bulk_delete(self, task_ids: Sequence[int]) -> List[int]:
+        try:
+            return await self._inner.bulk_delete(task_ids)
+        finally:
+            self.invalidate(task_ids)
+
+    async def clear_completed(
+        self, also_ids: Sequence[int] = (), keep_ids: Sequence[int] = ()
+    ) -> List[int]:
+        try:
+            deleted = await self._inner.clear_completed(also_ids, keep_ids)
+        except BaseException:
+            self.invalidate(all_descriptions=True)
+            raise
+        self.invalidate(deleted)
+        return deleted
+
+    async def apply_batch(self, batch: TaskBatch) -> BatchResult:
+        try:
+            return await self._inner.apply_batch(batch)
+        finally:
+            self.invalidate(batch.deletes)
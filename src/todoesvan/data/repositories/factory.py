@@ -0,0 +1,178 @@
+import os
+import sys
+import threading
+from typing import Any, Optional, cast
+
+from todoesvan.data.errors import DatabaseUnavailable, StorageSetupError
+from todoesvan.data.repositories.base import AsyncTaskRepository, TaskRepository
+from todoesvan.utils import metrics
+from todoesvan.utils.env import load_env
+from todoesvan.utils.logging import get_logger
+from todoesvan.utils.storage import data_dir
+
+ENGINES = ("postgres", "sqlite", "memory")
+
+logger = get_logger(__name__)
+
+
+def storage_engine() -> str:
+    """Engine picked by TASK_STORAGE (postgres | sqlite | memory); postgres by default."""
+    load_env()
+    engine = os.getenv("TASK_STORAGE", "postgres").strip().lower()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown TASK_STORAGE {engine!r} (expected one of {', '.join(ENGINES)}).")
+    return engine
+
+
+def create_repository(engine: Optional[str] = None) -> TaskRepository:
+    """New repository for `engine`; drivers are imported only for the engine in use."""
+    engine = engine or storage_engine()
+    if engine == "postgres":
+        from todoesvan.data.repositories.postgres_repository import (
+            PostgresTaskRepository,
+        )
+
+        return PostgresTaskRepository()
+    if engine == "sqlite":
+        from todoesvan.data.repositories.sqlite_repository import SqliteTaskRepository
+
+        path = os.getenv("TASK_SQLITE_PATH") or str(data_dir() / "tasks.sqlite3")
+        return SqliteTaskRepository(path)
+    if engine == "memory":
+        from todoesvan.data.repositories.memory_repository import InMemoryTaskRepository
+
+        return InMemoryTaskRepository()
+    raise ValueError(f"Unknown storage engine {engine!r}.")
+
+
+def prepare_storage() -> None:
+    """
+    One-time startup work for the selected engine: applies pending PostgreSQL
+    migrations and prunes delete tombstones older than DB_TOMBSTONE_DAYS, unless
+    DB_MIGRATE_ON_START=0 (SQLite creates its schema on open).
+    A failed migration raises StorageSetupError.
+    """
+    if storage_engine() != "postgres" or os.getenv("DB_MIGRATE_ON_START", "1") == "0":
+        return
+    from todoesvan.data.migrate import MigrationError, prune_tombstones, upgrade
+
+    try:
+        upgrade()
+        prune_tombstones(float(os.getenv("DB_TOMBSTONE_DAYS", "30")))
+    except DatabaseUnavailable as ex:
+        # Start anyway (snapshot + offline outbox); the next start migrates.
+        logger.warning("Skipping migrations, database unreachable: %s", ex)
+    except MigrationError as ex:
+        logger.error("%s", ex)
+        raise StorageSetupError(f"{ex} (see `python -m todoesvan.data.migrate status`)") from ex
+
+
+def async_driver_enabled() -> bool:
+    """PostgreSQL goes through asyncpg unless DB_ASYNC=0 (then psycopg2 in worker threads)."""
+    return storage_engine() == "postgres" and os.getenv("DB_ASYNC", "1") != "0"
+
+
+_repository: Optional[TaskRepository] = None
+_async_repository: Optional[AsyncTaskRepository] = None
+_initialized = False
+_setup_error: Optional[StorageSetupError] = None
+_repository_lock = threading.RLock()
+
+
+def _initialize() -> None:
+    """
+    Data layer setup, done on first use rather than at startup: .env and the metrics
+    settings are read and migrations run. Callers hold _repository_lock and run in a
+    worker thread, so the UI is already on screen meanwhile.
+    A failed setup is remembered: later calls raise the same error instead of retrying.
+    """
+    global _initialized, _setup_error
+    if _setup_error is not None:
+        raise _setup_error
+    if not _initialized:
+        metrics.configure_from_env()
+        try:
+            prepare_storage()
+        except StorageSetupError as ex:
+            _setup_error = ex
+            raise
+        _initialized = True
+
+
+def _instrumented(repository: Any) -> Any:
+    # Wrapped only when enabled: the disabled path keeps direct method calls.
+    return metrics.InstrumentedRepository(repository) if metrics.is_enabled() else repository
+
+
+def get_repository() -> TaskRepository:
+    """Process-wide repository (sessions share one SQLite connection / in-memory store)."""
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _initialize()
+            _repository = cast(TaskRepository, _instrumented(create_repository()))
+        return _repository
+
+
+def _create_async_repository() -> AsyncTaskRepository:
+    global _async_repository
+    with _repository_lock:
+        if _async_repository is None:
+            _initialize()
+            repository: Any = None
+            if async_driver_enabled():
+                try:
+                    from todoesvan.data.repositories.asyncpg_repository import (
+                        AsyncpgTaskRepository,
+                    )
+
+                    repository = AsyncpgTaskRepository()
+                except ImportError:
+                    logger.warning("asyncpg is not installed; using psycopg2 in worker threads")
+            if repository is None:
+                from todoesvan.data.repositories.threaded_repository import (
+                    ThreadedTaskRepository,
+                )
+
+                repository = ThreadedTaskRepository(get_repository())
+            else:
+                repository = _instrumented(repository)
+            _async_repository = cast(AsyncTaskRepository, _shared_cache(repository))
+        return _async_repository
+
+
+def _shared_cache(repository: Any) -> Any:
+    """
+    Puts the process-wide read cache in front of `repository` unless TASK_SHARED_CACHE=0.
+    On PostgreSQL the change feed tells it about writes made elsewhere.
+    """
+    if os.getenv("TASK_SHARED_CACHE", "1") == "0":
+        return repository
+    from todoesvan.data.repositories.cached_repository import SharedCacheRepository
+
+    cache = SharedCacheRepository(
+        repository, ttl=float(os.getenv("TASK_SHARED_CACHE_TTL", "30"))
+    )
+    if storage_engine() == "postgres":
+        from todoesvan.data.change_feed import get_change_feed
+
+        get_change_feed().subscribe(cache.on_feed_event, first=True)
+    return cache
+
+
+async def get_async_repository() -> AsyncTaskRepository:
+    """
+    Process-wide repository for coroutines: asyncpg for PostgreSQL, otherwise the
+    sync repository run in worker threads. Set up in a worker thread on first use.
+    """
+    if _async_repository is not None:
+        return _async_repository
+    return await metrics.to_thread(_create_async_repository)
+
+
+def close_storage() -> None:
+    """Closes the pooled database connections at shutdown (if any were opened)."""
+    # Looked up, not imported: psycopg2 isn't loaded just to close nothing.
+    database = sys.modules.get("todoesvan.data.database")
+    if database is not None:
+        database.close_pool()
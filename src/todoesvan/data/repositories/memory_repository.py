@@ -0,0 +1,305 @@
+import heapq
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from todoesvan.data.model import (
+    BatchResult,
+    PageCursor,
+    Task,
+    TaskBatch,
+    TaskChanges,
+    TaskOverview,
+    TaskPage,
+    TaskSearchPage,
+)
+from todoesvan.data.repositories.base import (
+    matches_terms,
+    page_from_rows,
+    search_page_from_rows,
+    search_terms,
+)
+
+# (-created_at in microseconds, -id): ascending order == (created_at, id) DESC
+_OrderKey = Tuple[int, int]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _micros(ts: datetime) -> int:
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
+
+class InMemoryTaskRepository:
+    """
+    TaskRepository kept in process memory (nothing persists), for tests, benchmarks
+    and throwaway sessions. Same contract as the SQL engines:
+      - per-tab keys kept sorted, so pages are bisect + slice
+      - rows kept in revision order, so delta syncs only walk what changed
+    Returned tasks are copies: callers may mutate them freely.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._rows: Dict[int, Task] = {}
+        self._descriptions: Dict[int, str] = {}  # only non-empty ones
+        self._order: Dict[bool, List[_OrderKey]] = {False: [], True: []}
+        self._revisions: "OrderedDict[int, int]" = OrderedDict()  # id -> revision, oldest first
+        self._tombstones: List[Tuple[int, int]] = []  # (revision, id), ascending
+        self._revision = 0
+        self._next_id = 1
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def get_tasks(self, completed: bool) -> List[Task]:
+        with self._lock:
+            return [self._copy(-neg_id) for _, neg_id in self._order[completed]]
+
+    def get_tasks_page(
+        self,
+        completed: bool,
+        limit: int,
+        after: Optional[PageCursor] = None,
+    ) -> TaskPage:
+        if limit < 1:
+            raise ValueError("Page size must be positive.")
+        with self._lock:
+            return self._page(completed, limit, after)
+
+    def get_overview(self, limit_pending: int, limit_completed: int) -> TaskOverview:
+        if limit_pending < 1 or limit_completed < 1:
+            raise ValueError("Page size must be positive.")
+        with self._lock:
+            return TaskOverview(
+                counts=self._counts(),
+                pages={
+                    False: self._page(False, limit_pending, None),
+                    True: self._page(True, limit_completed, None),
+                },
+                revision=self._revision,
+            )
+
+    def current_revision(self) -> int:
+        with self._lock:
+            return self._revision
+
+    def get_changes_since(self, revision: int) -> TaskChanges:
+        with self._lock:
+            if self._revision <= revision:
+                return TaskChanges(upserts=[], deleted_ids=[], revision=revision)
+
+            changed: List[Task] = []
+            for task_id, rev in reversed(self._revisions.items()):
+                if rev <= revision:
+                    break
+                changed.append(self._copy(task_id))
+            changed.reverse()
+
+            start = bisect_right(self._tombstones, (revision, float("inf")))
+            deleted = [task_id for _, task_id in self._tombstones[start:]]
+
+            return TaskChanges(
+                upserts=changed,
+                deleted_ids=deleted,
+                revision=self._revision,
+                counts=self._counts(),
+            )
+
+    def search(
+        self,
+        query: str,
+        completed: Optional[bool],
+        limit: int,
+        offset: int = 0,
+    ) -> TaskSearchPage:
+        """Linear scan (no ranking statistics here): hits come newest first."""
+        if limit < 1:
+            raise ValueError("Page size must be positive.")
+        terms = search_terms(query)
+        if not terms:
+            return TaskSearchPage(tasks=[], next_offset=None)
+
+        tabs = (False, True) if completed is None else (completed,)
+        with self._lock:
+            hits: List[Task] = []
+            skipped = 0
+            for _, neg_id in heapq.merge(*(self._order[tab] for tab in tabs)):
+                if not matches_terms(self._rows[-neg_id].subject, terms):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                hits.append(self._copy(-neg_id))
+                if len(hits) > limit:
+                    break
+        return search_page_from_rows(hits, limit, offset)
+
+    def get_descriptions(self, task_ids: Sequence[int]) -> Dict[int, str]:
+        with self._lock:
+            return {tid: self._descriptions.get(tid, "") for tid in task_ids if tid in self._rows}
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def create(self, subject: str) -> Task:
+        with self._lock:
+            return self._insert(subject, False, self._bump())
+
+    def set_completed(self, task_id: int, completed: bool) -> None:
+        with self._lock:
+            if task_id not in self._rows:
+                raise LookupError("Task not found (set_completed).")
+            self._set_completed(task_id, completed, self._bump())
+
+    def update_subject(self, task_id: int, subject: str) -> None:
+        with self._lock:
+            if task_id not in self._rows:
+                raise LookupError("Task not found (update_subject).")
+            self._rows[task_id].subject = subject
+            self._touch(task_id, self._bump())
+
+    def update_description(self, task_id: int, description: str) -> None:
+        with self._lock:
+            if task_id not in self._rows:
+                raise LookupError("Task not found (update_description).")
+            if description:
+                self._descriptions[task_id] = description
+            else:
+                self._descriptions.pop(task_id, None)
+            self._touch(task_id, self._bump())
+
+    def delete(self, task_id: int) -> None:
+        with self._lock:
+            if task_id not in self._rows:
+                raise LookupError("Task not found (delete).")
+            self._remove(task_id, self._bump())
+
+    def bulk_create(self, subjects: Sequence[str]) -> List[Task]:
+        if not subjects:
+            return []
+        with self._lock:
+            revision = self._bump()
+            return [self._insert(subject, False, revision) for subject in subjects]
+
+    def bulk_set_completed(self, task_ids: Sequence[int], completed: bool) -> List[int]:
+        with self._lock:
+            found = [tid for tid in dict.fromkeys(task_ids) if tid in self._rows]
+            if found:
+                revision = self._bump()
+                for tid in found:
+                    self._set_completed(tid, completed, revision)
+            return found
+
+    def bulk_delete(self, task_ids: Sequence[int]) -> List[int]:
+        with self._lock:
+            found = [tid for tid in dict.fromkeys(task_ids) if tid in self._rows]
+            if found:
+                revision = self._bump()
+                for tid in found:
+                    self._remove(tid, revision)
+            return found
+
+    def clear_completed(
+        self, also_ids: Sequence[int] = (), keep_ids: Sequence[int] = ()
+    ) -> List[int]:
+        with self._lock:
+            keep = set(keep_ids)
+            ids = [-neg_id for _, neg_id in self._order[True] if -neg_id not in keep]
+            ids += [
+                tid
+                for tid in also_ids
+                if tid in self._rows and not self._rows[tid].completed and tid not in keep
+            ]
+            return self.bulk_delete(ids)
+
+    def apply_batch(self, batch: TaskBatch) -> BatchResult:
+        """Whole batch under one lock and one revision (same shape as the SQL engines)."""
+        created: Dict[int, Task] = {}
+        missing: Set[int] = set()
+
+        with self._lock:
+            revision = self._bump()
+            for tid in batch.deletes:
+                if tid in self._rows:
+                    self._remove(tid, revision)
+                else:
+                    missing.add(tid)
+            for tid, completed in batch.completed:
+                if tid in self._rows:
+                    self._set_completed(tid, completed, revision)
+                else:
+                    missing.add(tid)
+            for tid, subject in batch.subjects:
+                if tid in self._rows:
+                    self._rows[tid].subject = subject
+                    self._touch(tid, revision)
+                else:
+                    missing.add(tid)
+            for temp_id, subject, completed in batch.creates:
+                created[temp_id] = self._insert(subject, completed, revision)
+
+        return BatchResult(created=created, missing_ids=missing)
+
+    # -------------------------
+    # Internals (lock held)
+    # -------------------------
+    def _bump(self) -> int:
+        self._revision += 1
+        return self._revision
+
+    def _counts(self) -> Dict[bool, int]:
+        return {False: len(self._order[False]), True: len(self._order[True])}
+
+    def _page(self, completed: bool, limit: int, after: Optional[PageCursor]) -> TaskPage:
+        order = self._order[completed]
+        start = 0
+        if after is not None:
+            start = bisect_right(order, (-_micros(after.created_at), -after.id))
+        rows = [self._copy(-neg_id) for _, neg_id in order[start : start + limit + 1]]
+        return page_from_rows(rows, limit, self._revision)
+
+    def _key(self, task: Task) -> _OrderKey:
+        assert task.created_at is not None
+        return (-_micros(task.created_at), -task.id)
+
+    def _insert(self, subject: str, completed: bool, revision: int) -> Task:
+        task = Task(
+            id=self._next_id,
+            subject=subject,
+            completed=completed,
+            created_at=datetime.now(timezone.utc),
+        )
+        self._next_id += 1
+        self._rows[task.id] = task
+        insort(self._order[completed], self._key(task))
+        self._touch(task.id, revision)
+        return self._copy(task.id)
+
+    def _set_completed(self, task_id: int, completed: bool, revision: int) -> None:
+        task = self._rows[task_id]
+        if task.completed != completed:
+            key = self._key(task)
+            order = self._order[task.completed]
+            del order[bisect_left(order, key)]
+            task.completed = completed
+            insort(self._order[completed], key)
+        self._touch(task_id, revision)
+
+    def _remove(self, task_id: int, revision: int) -> None:
+        task = self._rows.pop(task_id)
+        self._descriptions.pop(task_id, None)
+        order = self._order[task.completed]
+        del order[bisect_left(order, self._key(task))]
+        self._revisions.pop(task_id, None)
+        self._tombstones.append((revision, task_id))
+
+    def _touch(self, task_id: int, revision: int) -> None:
+        self._revisions[task_id] = revision
+        self._revisions.move_to_end(task_id)
+
+    def _copy(self, task_id: int) -> Task:
+        t = self._rows[task_id]
+        return Task(t.id, t.subject, t.completed, t.created_at)
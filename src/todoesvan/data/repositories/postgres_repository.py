@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from psycopg2.extras import execute_values
+
+from todoesvan.data.database import db_connection
+from todoesvan.data.model import (
+    BatchResult,
+    PageCursor,
+    Task,
+    TaskBatch,
+    TaskChanges,
+    TaskOverview,
+    TaskPage,
+    TaskSearchPage,
+)
+from todoesvan.data.repositories.base import (
+    page_from_rows,
+    search_page_from_rows,
+    search_terms,
+)
+from todoesvan.data.repositories.sql import (
+    CHANGED_ROWS_SQL,
+    COUNTS_SQL,
+    INSERT_ROWS_SQL,
+    OVERVIEW_SQL,
+    REVISION_SQL,
+    SEARCH_SQL,
+    SYNC_STATE_SQL,
+    TAB_PAGE_AFTER_SQL,
+    TAB_PAGE_SQL,
+    TAB_SQL,
+    TOMBSTONES_SQL,
+    inserted_from_rows,
+    overview_from_rows,
+)
+
+if TYPE_CHECKING:
+    import psycopg2.extensions
+
+
+class PostgresTaskRepository:
+    """TaskRepository on PostgreSQL (schema in data/migrations, pooled connections)."""
+
+    def create(self, subject: str) -> Task:
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO task (subject)
+                    VALUES (%s)
+                    RETURNING id, subject, completed, created_at;
+                    """,
+                    (subject,),
+                )
+                row = cur.fetchone()
+                if not row:
+                    raise RuntimeError("Task insert did not return a row.")
+                return self._to_task(row)
+
+    def get_tasks(self, completed: bool) -> List[Task]:
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(TAB_SQL, (completed,))
+                rows = cur.fetchall()
+        return [self._to_task(row) for row in rows]
+
+    def get_tasks_page(
+        self,
+        completed: bool,
+        limit: int,
+        after: Optional[PageCursor] = None,
+    ) -> TaskPage:
+        """Keyset page ordered by (created_at, id) DESC, starting after `after`."""
+        if limit < 1:
+            raise ValueError("Page size must be positive.")
+
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                # Read before the page (capped like delta syncs): later changes, and
+                # writes still in flight, are picked up by the next delta sync.
+                revision, _ = self._sync_state(cur)
+                if after is None:
+                    cur.execute(TAB_PAGE_SQL, (completed, limit + 1))
+                else:
+                    cur.execute(
+                        TAB_PAGE_AFTER_SQL,
+                        (completed, after.created_at, after.id, limit + 1),
+                    )
+                rows = cur.fetchall()
+
+        # One extra row tells us whether another page exists.
+        return page_from_rows([self._to_task(row) for row in rows], limit, revision)
+
+    def get_overview(self, limit_pending: int, limit_completed: int) -> TaskOverview:
+        """Counts and the first page of both tabs in ONE statement, after the sync revision."""
+        if limit_pending < 1 or limit_completed < 1:
+            raise ValueError("Page size must be positive.")
+
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                revision, _ = self._sync_state(cur)
+                cur.execute(OVERVIEW_SQL, (limit_pending + 1, limit_completed + 1))
+                rows = cur.fetchall()
+
+        return overview_from_rows(rows, limit_pending, limit_completed, revision)
+
+    def current_revision(self) -> int:
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                return self._current_revision(cur)
+
+    def get_changes_since(self, revision: int) -> TaskChanges:
+        """
+        Rows updated/inserted and ids deleted after `revision`.
+        An unchanged table costs one statement. The revision handed back stays below
+        writers still in flight (their rows come with a later sync); `reset` means
+        tombstones after `revision` were pruned and the caller must reload everything.
+        """
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                head, horizon = self._sync_state(cur)
+                if revision < horizon:
+                    return TaskChanges(upserts=[], deleted_ids=[], revision=revision, reset=True)
+                if head <= revision:
+                    return TaskChanges(upserts=[], deleted_ids=[], revision=revision)
+
+                cur.execute(CHANGED_ROWS_SQL, (revision,))
+                rows = cur.fetchall()
+
+                cur.execute(TOMBSTONES_SQL, (revision,))
+                tombstones = cur.fetchall()
+
+                counts = self._counts(cur)
+
+        return TaskChanges(
+            upserts=[self._to_task(row) for row in rows],
+            deleted_ids=[row[0] for row in tombstones],
+            revision=head,
+            counts=counts,
+        )
+
+    def search(
+        self,
+        query: str,
+        completed: Optional[bool],
+        limit: int,
+        offset: int = 0,
+    ) -> TaskSearchPage:
+        """
+        Ranked prefix search over subject + description through the GIN index on
+        task.search ('simple' config: no stemming, so it works for any language).
+        """
+        if limit < 1:
+            raise ValueError("Page size must be positive.")
+        terms = search_terms(query)
+        if not terms:
+            return TaskSearchPage(tasks=[], next_offset=None)
+
+        # Terms are \w+ only, so they can't carry tsquery operators.
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        tab_filter = "" if completed is None else "AND completed = %(completed)s"
+
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    SEARCH_SQL.format(tab_filter=tab_filter),
+                    {"query": tsquery, "completed": completed, "limit": limit + 1, "offset": offset},
+                )
+                rows = cur.fetchall()
+
+        return search_page_from_rows([self._to_task(row) for row in rows], limit, offset)
+
+    def get_descriptions(self, task_ids: Sequence[int]) -> Dict[int, str]:
+        """Details on demand: list queries never carry the (possibly long) descriptions."""
+        if not task_ids:
+            return {}
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "SELECT id, coalesce(description, '') FROM task WHERE id = ANY(%s);",
+                    (list(task_ids),),
+                )
+                return {row[0]: row[1] for row in cur.fetchall()}
+
+    def set_completed(self, task_id: int, completed: bool) -> None:
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE task SET completed = %s WHERE id = %s;",
+                    (completed, task_id),
+                )
+                if cur.rowcount == 0:
+                    raise LookupError("Task not found (set_completed).")
+
+    def update_subject(self, task_id: int, subject: str) -> None:
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE task SET subject = %s WHERE id = %s;",
+                    (subject, task_id),
+                )
+                if cur.rowcount == 0:
+                    raise LookupError("Task not found (update_subject).")
+
+    def update_description(self, task_id: int, description: str) -> None:
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE task SET description = NULLIF(%s, '') WHERE id = %s;",
+                    (description, task_id),
+                )
+                if cur.rowcount == 0:
+                    raise LookupError("Task not found (update_description).")
+
+    def delete(self, task_id: int) -> None:
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("DELETE FROM task WHERE id = %s;", (task_id,))
+                if cur.rowcount == 0:
+                    raise LookupError("Task not found (delete).")
+
+    # -------------------------
+    # Bulk (one statement each)
+    # -------------------------
+    def bulk_create(self, subjects: Sequence[str]) -> List[Task]:
+        if not subjects:
+            return []
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(INSERT_ROWS_SQL, (list(subjects), [False] * len(subjects)))
+                rows = cur.fetchall()
+        return [task for _, task in inserted_from_rows(rows, len(subjects))]
+
+    def bulk_set_completed(self, task_ids: Sequence[int], completed: bool) -> List[int]:
+        """Returns the ids that were actually updated."""
+        if not task_ids:
+            return []
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "UPDATE task SET completed = %s WHERE id = ANY(%s) RETURNING id;",
+                    (completed, list(task_ids)),
+                )
+                return [row[0] for row in cur.fetchall()]
+
+    def bulk_delete(self, task_ids: Sequence[int]) -> List[int]:
+        """Returns the ids that were actually deleted."""
+        if not task_ids:
+            return []
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "DELETE FROM task WHERE id = ANY(%s) RETURNING id;",
+                    (list(task_ids),),
+                )
+                return [row[0] for row in cur.fetchall()]
+
+    def clear_completed(
+        self, also_ids: Sequence[int] = (), keep_ids: Sequence[int] = ()
+    ) -> List[int]:
+        """
+        Deletes every completed task, plus `also_ids` (rows completed locally whose
+        toggle hasn't reached the server yet), except `keep_ids` (rows restored
+        locally, same reason). Returns the deleted ids.
+        """
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    DELETE FROM task
+                    WHERE (completed OR id = ANY(%s)) AND NOT id = ANY(%s)
+                    RETURNING id;
+                    """,
+                    (list(also_ids), list(keep_ids)),
+                )
+                return [row[0] for row in cur.fetchall()]
+
+    def apply_batch(self, batch: TaskBatch) -> BatchResult:
+        """
+        Applies a compacted batch in ONE transaction, one multi-row statement per kind.
+        Rows that no longer exist are reported in missing_ids instead of failing the
+        whole batch; any other error rolls everything back.
+        """
+        created: Dict[int, Task] = {}
+        missing: Set[int] = set()
+
+        with db_connection() as conn:
+            with conn.cursor() as cur:
+                if batch.deletes:
+                    cur.execute(
+                        "DELETE FROM task WHERE id = ANY(%s) RETURNING id;",
+                        (list(batch.deletes),),
+                    )
+                    found = {row[0] for row in cur.fetchall()}
+                    missing.update(tid for tid in batch.deletes if tid not in found)
+
+                if batch.completed:
+                    rows = execute_values(
+                        cur,
+                        """
+                        UPDATE task AS t
+                        SET completed = v.completed
+                        FROM (VALUES %s) AS v(id, completed)
+                        WHERE t.id = v.id
+                        RETURNING t.id;
+                        """,
+                        batch.completed,
+                        template="(%s::bigint, %s::boolean)",
+                        fetch=True,
+                    )
+                    found = {row[0] for row in rows}
+                    missing.update(tid for tid, _ in batch.completed if tid not in found)
+
+                if batch.subjects:
+                    rows = execute_values(
+                        cur,
+                        """
+                        UPDATE task AS t
+                        SET subject = v.subject
+                        FROM (VALUES %s) AS v(id, subject)
+                        WHERE t.id = v.id
+                        RETURNING t.id;
+                        """,
+                        batch.subjects,
+                        template="(%s::bigint, %s::text)",
+                        fetch=True,
+                    )
+                    found = {row[0] for row in rows}
+                    missing.update(tid for tid, _ in batch.subjects if tid not in found)
+
+                if batch.creates:
+                    cur.execute(
+                        INSERT_ROWS_SQL,
+                        (
+                            [subject for _, subject, _ in batch.creates],
+                            [done for _, _, done in batch.creates],
+                        ),
+                    )
+                    for i, task in inserted_from_rows(cur.fetchall(), len(batch.creates)):
+                        created[batch.creates[i][0]] = task
+
+        return BatchResult(created=created, missing_ids=missing)
+
+    @staticmethod
+    def _counts(cur: psycopg2.extensions.cursor) -> Dict[bool, int]:
+        cur.execute(COUNTS_SQL)
+        row = cur.fetchone()
+        return {False: int(row[0]), True: int(row[1])}
+
+    @staticmethod
+    def _sync_state(cur: psycopg2.extensions.cursor) -> Tuple[int, int]:
+        cur.execute(SYNC_STATE_SQL)
+        row = cur.fetchone()
+        return int(row[0]), int(row[1])
+
+    @staticmethod
+    def _current_revision(cur: psycopg2.extensions.cursor) -> int:
+        cur.execute(REVISION_SQL)
+        row = cur.fetchone()
+        return int(row[0]) if row else 0
+
+    @staticmethod
+    def _to_task(row: Sequence[Any]) -> Task:
+        # Positional: this runs once per fetched row.
+        return Task(row[0], row[1], row[2], row[3])
@@ -0,0 +1,147 @@
+"""
+PostgreSQL statements and row unpacking shared by the psycopg2 and asyncpg
+repositories. Placeholders are psycopg2's (%s, %(name)s); asyncpg_repository
+numbers them. No driver is imported here.
+"""
+from typing import Any, Dict, List, Sequence, Tuple
+
+from todoesvan.data.model import Task, TaskOverview, TaskPage
+from todoesvan.data.repositories.base import page_from_rows
+
+# Hot reads, at module level so `python -m todoesvan.data.migrate check` EXPLAINs
+# exactly what runs. Tab reads are served by the per-tab partial indexes.
+TAB_SQL = """
+    SELECT id, subject, completed, created_at
+    FROM task
+    WHERE completed = %s
+    ORDER BY created_at DESC, id DESC;
+"""
+
+TAB_PAGE_SQL = """
+    SELECT id, subject, completed, created_at
+    FROM task
+    WHERE completed = %s
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s;
+"""
+
+TAB_PAGE_AFTER_SQL = """
+    SELECT id, subject, completed, created_at
+    FROM task
+    WHERE completed = %s
+      AND (created_at, id) < (%s, %s)
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s;
+"""
+
+CHANGED_ROWS_SQL = """
+    SELECT id, subject, completed, created_at, revision
+    FROM task
+    WHERE revision > %s
+    ORDER BY revision;
+"""
+
+TOMBSTONES_SQL = """
+    SELECT id, revision
+    FROM task_tombstone
+    WHERE revision > %s
+    ORDER BY revision;
+"""
+
+# Counts and the first page of both tabs in one statement (after SYNC_STATE_SQL).
+OVERVIEW_SQL = """
+    WITH counts AS (
+        SELECT coalesce(sum(n) FILTER (WHERE NOT completed), 0) AS pending,
+               coalesce(sum(n) FILTER (WHERE completed), 0) AS completed
+        FROM task_count
+    ),
+    first_pages AS (
+        (SELECT id, subject, completed, created_at
+         FROM task
+         WHERE completed = false
+         ORDER BY created_at DESC, id DESC
+         LIMIT %s)
+        UNION ALL
+        (SELECT id, subject, completed, created_at
+         FROM task
+         WHERE completed = true
+         ORDER BY created_at DESC, id DESC
+         LIMIT %s)
+    )
+    SELECT c.pending, c.completed,
+           p.id, p.subject, p.completed, p.created_at
+    FROM counts c
+    LEFT JOIN first_pages p ON true;
+"""
+
+# {tab_filter} is "" (both tabs) or "AND completed = %(completed)s".
+SEARCH_SQL = """
+    SELECT id, subject, completed, created_at
+    FROM task, to_tsquery('simple', %(query)s) AS q
+    WHERE search @@ q {tab_filter}
+    ORDER BY ts_rank(search, q) DESC, created_at DESC, id DESC
+    LIMIT %(limit)s OFFSET %(offset)s;
+"""
+
+
+REVISION_SQL = "SELECT CASE WHEN is_called THEN last_value ELSE 0 END FROM task_revision_seq;"
+
+# Sync baseline (capped below writers still in flight, see migration 0004) and the
+# newest pruned tombstone. Its own statement, run before the rows are read.
+SYNC_STATE_SQL = "SELECT task_sync_revision(), (SELECT revision FROM task_sync_horizon);"
+
+# Multi-row insert (subjects, completed flags as arrays). RETURNING order isn't
+# guaranteed, so ids are drawn per input position first and rows come back with it (n).
+INSERT_ROWS_SQL = """
+    WITH v AS (
+        SELECT nextval(pg_get_serial_sequence('task', 'id')) AS id, s, c, n
+        FROM (
+            SELECT s, c, n
+            FROM unnest(%s::text[], %s::boolean[]) WITH ORDINALITY AS u(s, c, n)
+            ORDER BY n
+        ) AS ordered
+    ),
+    ins AS (
+        INSERT INTO task (id, subject, completed)
+        SELECT id, s, c FROM v
+        RETURNING id, subject, completed, created_at
+    )
+    SELECT ins.id, ins.subject, ins.completed, ins.created_at, v.n
+    FROM ins
+    JOIN v ON v.id = ins.id
+    ORDER BY v.n;
+"""
+
+# Per-tab totals from the trigger-kept counters (migration 0005), not a count(*).
+COUNTS_SQL = """
+    SELECT coalesce(sum(n) FILTER (WHERE NOT completed), 0),
+           coalesce(sum(n) FILTER (WHERE completed), 0)
+    FROM task_count;
+"""
+
+
+def inserted_from_rows(rows: Sequence[Sequence[Any]], expected: int) -> List[Tuple[int, Task]]:
+    """INSERT_ROWS_SQL's rows as (input index, task)."""
+    if len(rows) != expected:
+        raise RuntimeError("Task insert did not return every row.")
+    return [(int(row[4]) - 1, Task(row[0], row[1], row[2], row[3])) for row in rows]
+
+
+def overview_from_rows(
+    rows: Sequence[Any], limit_pending: int, limit_completed: int, revision: int
+) -> TaskOverview:
+    """Unpacks OVERVIEW_SQL's rows."""
+    first = rows[0]
+    counts = {False: int(first[0]), True: int(first[1])}
+    by_tab: Dict[bool, List[Task]] = {False: [], True: []}
+    for row in rows:
+        if row[2] is not None:
+            task = Task(row[2], row[3], row[4], row[5])
+            by_tab[task.completed].append(task)
+
+    pages: Dict[bool, TaskPage] = {}
+    for key, limit in ((False, limit_pending), (True, limit_completed)):
+        tasks = sorted(by_tab[key], key=lambda t: (t.created_at, t.id), reverse=True)
+        pages[key] = page_from_rows(tasks, limit, revision)
+
+    return TaskOverview(counts=counts, pages=pages, revision=revision)
@@ -0,0 +1,515 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from todoesvan.data.model import (
+    BatchResult,
+    PageCursor,
+    Task,
+    TaskBatch,
+    TaskChanges,
+    TaskOverview,
+    TaskPage,
+    TaskSearchPage,
+)
+from todoesvan.data.repositories.base import (
+    page_from_rows,
+    search_page_from_rows,
+    search_terms,
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Keeps IN (...) lists under SQLite's bound-parameter limit on old builds (999).
+_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,  -- ids are never reused (tombstones)
+    subject    TEXT    NOT NULL,
+    description TEXT,
+    completed  INTEGER NOT NULL DEFAULT 0,
+    created_at INTEGER NOT NULL,                   -- microseconds since epoch, UTC
+    updated_at INTEGER,
+    revision   INTEGER NOT NULL
+);
+-- Tab pages: WHERE completed = ? ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS task_tab_order_idx ON task (completed, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS task_revision_idx ON task (revision);
+
+CREATE TABLE IF NOT EXISTS task_tombstone (
+    id       INTEGER PRIMARY KEY,
+    revision INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS task_tombstone_revision_idx ON task_tombstone (revision);
+
+CREATE TABLE IF NOT EXISTS task_meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO task_meta (key, value) VALUES ('revision', 0);
+
+-- Per-tab totals kept by triggers: counting would scan the whole tab index.
+INSERT OR IGNORE INTO task_meta (key, value)
+    SELECT 'pending', COUNT(*) FROM task WHERE completed = 0;
+INSERT OR IGNORE INTO task_meta (key, value)
+    SELECT 'completed', COUNT(*) FROM task WHERE completed = 1;
+
+CREATE TRIGGER IF NOT EXISTS task_count_insert AFTER INSERT ON task BEGIN
+    UPDATE task_meta SET value = value + 1
+    WHERE key = CASE NEW.completed WHEN 0 THEN 'pending' ELSE 'completed' END;
+END;
+CREATE TRIGGER IF NOT EXISTS task_count_delete AFTER DELETE ON task BEGIN
+    UPDATE task_meta SET value = value - 1
+    WHERE key = CASE OLD.completed WHEN 0 THEN 'pending' ELSE 'completed' END;
+END;
+CREATE TRIGGER IF NOT EXISTS task_count_move AFTER UPDATE OF completed ON task
+WHEN OLD.completed <> NEW.completed BEGIN
+    UPDATE task_meta SET value = value + CASE key WHEN 'completed' THEN 1 ELSE -1 END * (NEW.completed - OLD.completed)
+    WHERE key IN ('pending', 'completed');
+END;
+"""
+
+# Full-text index over subject, kept in sync by triggers (external content table).
+_SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS task_fts USING fts5(
+    subject, content='task', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS task_fts_insert AFTER INSERT ON task BEGIN
+    INSERT INTO task_fts (rowid, subject) VALUES (NEW.id, NEW.subject);
+END;
+CREATE TRIGGER IF NOT EXISTS task_fts_delete AFTER DELETE ON task BEGIN
+    INSERT INTO task_fts (task_fts, rowid, subject) VALUES ('delete', OLD.id, OLD.subject);
+END;
+CREATE TRIGGER IF NOT EXISTS task_fts_update AFTER UPDATE OF subject ON task BEGIN
+    INSERT INTO task_fts (task_fts, rowid, subject) VALUES ('delete', OLD.id, OLD.subject);
+    INSERT INTO task_fts (rowid, subject) VALUES (NEW.id, NEW.subject);
+END;
+"""
+
+
+def _micros(ts: datetime) -> int:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _now() -> int:
+    return _micros(datetime.now(timezone.utc))
+
+
+class SqliteTaskRepository:
+    """
+    Embedded TaskRepository: one SQLite file, no server round trips.
+      - WAL journal, one connection shared by worker threads behind a lock
+      - every method is one transaction; each write bumps task_meta.revision once
+      - deletes leave tombstones, like the Postgres triggers do
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # isolation_level=None: transactions are opened explicitly in _transaction().
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.executescript(_SCHEMA)
+        self._add_missing_columns()
+        self._fts = self._create_search_index()
+
+    def _add_missing_columns(self) -> None:
+        """Files created by older versions lack columns added since (CREATE IF NOT EXISTS keeps them)."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(task);")}
+        if "description" not in columns:
+            self._conn.execute("ALTER TABLE task ADD COLUMN description TEXT;")
+
+    def _create_search_index(self) -> bool:
+        """False when this SQLite build lacks FTS5 (search falls back to LIKE)."""
+        existed = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'task_fts';"
+        ).fetchone()
+        try:
+            self._conn.executescript(_SEARCH_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        if not existed:
+            # Files created before the index existed: index their rows once.
+            self._conn.execute("INSERT INTO task_fts (task_fts) VALUES ('rebuild');")
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def get_tasks(self, completed: bool) -> List[Task]:
+        with self._transaction() as cur:
+            cur.execute(
+                """
+                SELECT id, subject, completed, created_at
+                FROM task
+                WHERE completed = ?
+                ORDER BY created_at DESC, id DESC;
+                """,
+                (int(completed),),
+            )
+            return [self._to_task(row) for row in cur.fetchall()]
+
+    def get_tasks_page(
+        self,
+        completed: bool,
+        limit: int,
+        after: Optional[PageCursor] = None,
+    ) -> TaskPage:
+        if limit < 1:
+            raise ValueError("Page size must be positive.")
+        with self._transaction() as cur:
+            return self._page(cur, completed, limit, after)
+
+    def get_overview(self, limit_pending: int, limit_completed: int) -> TaskOverview:
+        if limit_pending < 1 or limit_completed < 1:
+            raise ValueError("Page size must be positive.")
+        # Embedded: several statements in one transaction cost no round trips.
+        with self._transaction() as cur:
+            revision = self._current_revision(cur)
+            return TaskOverview(
+                counts=self._counts(cur),
+                pages={
+                    False: self._page(cur, False, limit_pending, None),
+                    True: self._page(cur, True, limit_completed, None),
+                },
+                revision=revision,
+            )
+
+    def current_revision(self) -> int:
+        with self._transaction() as cur:
+            return self._current_revision(cur)
+
+    def get_changes_since(self, revision: int) -> TaskChanges:
+        with self._transaction() as cur:
+            head = self._current_revision(cur)
+            if head <= revision:
+                return TaskChanges(upserts=[], deleted_ids=[], revision=revision)
+
+            cur.execute(
+                """
+                SELECT id, subject, completed, created_at
+                FROM task
+                WHERE revision > ?
+                ORDER BY revision;
+                """,
+                (revision,),
+            )
+            upserts = [self._to_task(row) for row in cur.fetchall()]
+
+            cur.execute(
+                "SELECT id FROM task_tombstone WHERE revision > ? ORDER BY revision;",
+                (revision,),
+            )
+            deleted = [row[0] for row in cur.fetchall()]
+
+            return TaskChanges(
+                upserts=upserts,
+                deleted_ids=deleted,
+                revision=head,
+                counts=self._counts(cur),
+            )
+
+    def search(
+        self,
+        query: str,
+        completed: Optional[bool],
+        limit: int,
+        offset: int = 0,
+    ) -> TaskSearchPage:
+        if limit < 1:
+            raise ValueError("Page size must be positive.")
+        terms = search_terms(query)
+        if not terms:
+            return TaskSearchPage(tasks=[], next_offset=None)
+
+        params: List[object] = []
+        if self._fts:
+            # Quoted prefix terms, implicitly ANDed; best bm25 rank first.
+            sql = """
+                SELECT t.id, t.subject, t.completed, t.created_at
+                FROM task_fts f JOIN task t ON t.id = f.rowid
+                WHERE task_fts MATCH ? {tab}
+                ORDER BY f.rank, t.created_at DESC, t.id DESC
+                LIMIT ? OFFSET ?;
+            """
+            params.append(" ".join(f'"{term}"*' for term in terms))
+        else:
+            sql = """
+                SELECT t.id, t.subject, t.completed, t.created_at
+                FROM task t
+                WHERE {like} {tab}
+                ORDER BY t.created_at DESC, t.id DESC
+                LIMIT ? OFFSET ?;
+            """
+            sql = sql.replace("{like}", " AND ".join("t.subject LIKE ?" for _ in terms))
+            params.extend(f"%{term}%" for term in terms)
+
+        if completed is not None:
+            params.append(int(completed))
+        params.extend((limit + 1, offset))
+        sql = sql.replace("{tab}", "" if completed is None else "AND t.completed = ?")
+
+        with self._transaction() as cur:
+            cur.execute(sql, params)
+            rows = [self._to_task(row) for row in cur.fetchall()]
+        return search_page_from_rows(rows, limit, offset)
+
+    def get_descriptions(self, task_ids: Sequence[int]) -> Dict[int, str]:
+        ids = list(dict.fromkeys(task_ids))
+        found: Dict[int, str] = {}
+        with self._transaction() as cur:
+            for i in range(0, len(ids), _CHUNK):
+                chunk = ids[i : i + _CHUNK]
+                marks = ",".join("?" * len(chunk))
+                cur.execute(
+                    f"SELECT id, coalesce(description, '') FROM task WHERE id IN ({marks});",
+                    chunk,
+                )
+                found.update((row[0], row[1]) for row in cur.fetchall())
+        return found
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def create(self, subject: str) -> Task:
+        with self._transaction(write=True) as cur:
+            return self._insert(cur, subject, False, self._bump(cur), _now())
+
+    def set_completed(self, task_id: int, completed: bool) -> None:
+        with self._transaction(write=True) as cur:
+            if not self._update(cur, "completed", [(int(completed), task_id)], self._bump(cur)):
+                raise LookupError("Task not found (set_completed).")
+
+    def update_subject(self, task_id: int, subject: str) -> None:
+        with self._transaction(write=True) as cur:
+            if not self._update(cur, "subject", [(subject, task_id)], self._bump(cur)):
+                raise LookupError("Task not found (update_subject).")
+
+    def update_description(self, task_id: int, description: str) -> None:
+        with self._transaction(write=True) as cur:
+            if not self._update(cur, "description", [(description or None, task_id)], self._bump(cur)):
+                raise LookupError("Task not found (update_description).")
+
+    def delete(self, task_id: int) -> None:
+        with self._transaction(write=True) as cur:
+            if not self._delete(cur, [task_id], self._bump(cur)):
+                raise LookupError("Task not found (delete).")
+
+    def bulk_create(self, subjects: Sequence[str]) -> List[Task]:
+        if not subjects:
+            return []
+        with self._transaction(write=True) as cur:
+            revision = self._bump(cur)
+            created_at = _now()
+            return [self._insert(cur, s, False, revision, created_at) for s in subjects]
+
+    def bulk_set_completed(self, task_ids: Sequence[int], completed: bool) -> List[int]:
+        """Returns the ids that were actually updated."""
+        if not task_ids:
+            return []
+        with self._transaction(write=True) as cur:
+            found = self._existing(cur, task_ids)
+            if found:
+                rows = [(int(completed), tid) for tid in found]
+                self._update(cur, "completed", rows, self._bump(cur))
+            return found
+
+    def bulk_delete(self, task_ids: Sequence[int]) -> List[int]:
+        """Returns the ids that were actually deleted."""
+        if not task_ids:
+            return []
+        with self._transaction(write=True) as cur:
+            found = self._existing(cur, task_ids)
+            if found:
+                self._delete(cur, found, self._bump(cur))
+            return found
+
+    def clear_completed(
+        self, also_ids: Sequence[int] = (), keep_ids: Sequence[int] = ()
+    ) -> List[int]:
+        with self._transaction(write=True) as cur:
+            keep = set(keep_ids)
+            cur.execute("SELECT id FROM task WHERE completed = 1;")
+            ids = [row[0] for row in cur.fetchall() if row[0] not in keep]
+            done = set(ids)
+            ids += [
+                tid for tid in self._existing(cur, also_ids) if tid not in done and tid not in keep
+            ]
+            if ids:
+                self._delete(cur, ids, self._bump(cur))
+            return ids
+
+    def apply_batch(self, batch: TaskBatch) -> BatchResult:
+        """Applies a compacted batch in ONE transaction; missing rows are reported back."""
+        created: Dict[int, Task] = {}
+        missing: Set[int] = set()
+
+        with self._transaction(write=True) as cur:
+            revision = self._bump(cur)
+
+            if batch.deletes:
+                found = set(self._existing(cur, batch.deletes))
+                missing.update(tid for tid in batch.deletes if tid not in found)
+                self._delete(cur, list(found), revision)
+
+            if batch.completed:
+                found = set(self._existing(cur, [tid for tid, _ in batch.completed]))
+                missing.update(tid for tid, _ in batch.completed if tid not in found)
+                toggles = [(int(c), tid) for tid, c in batch.completed if tid in found]
+                self._update(cur, "completed", toggles, revision)
+
+            if batch.subjects:
+                found = set(self._existing(cur, [tid for tid, _ in batch.subjects]))
+                missing.update(tid for tid, _ in batch.subjects if tid not in found)
+                edits = [(subject, tid) for tid, subject in batch.subjects if tid in found]
+                self._update(cur, "subject", edits, revision)
+
+            created_at = _now()
+            for temp_id, subject, completed in batch.creates:
+                created[temp_id] = self._insert(cur, subject, completed, revision, created_at)
+
+        return BatchResult(created=created, missing_ids=missing)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    @contextmanager
+    def _transaction(self, write: bool = False) -> Iterator[sqlite3.Cursor]:
+        with self._lock:
+            cur = self._conn.cursor()
+            # IMMEDIATE takes the write lock up front (no upgrade deadlocks across processes).
+            cur.execute("BEGIN IMMEDIATE;" if write else "BEGIN;")
+            try:
+                yield cur
+            except BaseException:
+                cur.execute("ROLLBACK;")
+                raise
+            else:
+                cur.execute("COMMIT;")
+            finally:
+                cur.close()
+
+    def _page(
+        self, cur: sqlite3.Cursor, completed: bool, limit: int, after: Optional[PageCursor]
+    ) -> TaskPage:
+        revision = self._current_revision(cur)
+        if after is None:
+            cur.execute(
+                """
+                SELECT id, subject, completed, created_at
+                FROM task
+                WHERE completed = ?
+                ORDER BY created_at DESC, id DESC
+                LIMIT ?;
+                """,
+                (int(completed), limit + 1),
+            )
+            rows = cur.fetchall()
+        else:
+            # Two index seeks: SQLite only seeks `(created_at, id) < (?, ?)` on
+            # created_at, so rows sharing a timestamp (bulk inserts) would be scanned.
+            ts = _micros(after.created_at)
+            cur.execute(
+                """
+                SELECT id, subject, completed, created_at
+                FROM task
+                WHERE completed = ? AND created_at = ? AND id < ?
+                ORDER BY id DESC
+                LIMIT ?;
+                """,
+                (int(completed), ts, after.id, limit + 1),
+            )
+            rows = cur.fetchall()
+            if len(rows) <= limit:
+                cur.execute(
+                    """
+                    SELECT id, subject, completed, created_at
+                    FROM task
+                    WHERE completed = ? AND created_at < ?
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT ?;
+                    """,
+                    (int(completed), ts, limit + 1 - len(rows)),
+                )
+                rows += cur.fetchall()
+        return page_from_rows([self._to_task(row) for row in rows], limit, revision)
+
+    def _existing(self, cur: sqlite3.Cursor, task_ids: Sequence[int]) -> List[int]:
+        ids = list(dict.fromkeys(task_ids))
+        found: Set[int] = set()
+        for i in range(0, len(ids), _CHUNK):
+            chunk = ids[i : i + _CHUNK]
+            marks = ",".join("?" * len(chunk))
+            cur.execute(f"SELECT id FROM task WHERE id IN ({marks});", chunk)
+            found.update(row[0] for row in cur.fetchall())
+        return [tid for tid in ids if tid in found]
+
+    def _insert(
+        self, cur: sqlite3.Cursor, subject: str, completed: bool, revision: int, created_at: int
+    ) -> Task:
+        cur.execute(
+            "INSERT INTO task (subject, completed, created_at, revision) VALUES (?, ?, ?, ?);",
+            (subject, int(completed), created_at, revision),
+        )
+        assert cur.lastrowid is not None  # set by every successful INSERT
+        return Task(
+            id=cur.lastrowid,
+            subject=subject,
+            completed=completed,
+            created_at=_from_micros(created_at),
+        )
+
+    @staticmethod
+    def _update(cur: sqlite3.Cursor, column: str, rows: Sequence[Tuple[object, int]], revision: int) -> int:
+        # column is one of a fixed set chosen by this class, never user input.
+        now = _now()
+        cur.executemany(
+            f"UPDATE task SET {column} = ?, updated_at = ?, revision = ? WHERE id = ?;",
+            [(value, now, revision, tid) for value, tid in rows],
+        )
+        return cur.rowcount
+
+    @staticmethod
+    def _delete(cur: sqlite3.Cursor, task_ids: List[int], revision: int) -> int:
+        cur.executemany("DELETE FROM task WHERE id = ?;", [(tid,) for tid in task_ids])
+        deleted = cur.rowcount
+        cur.executemany(
+            "INSERT OR REPLACE INTO task_tombstone (id, revision) VALUES (?, ?);",
+            [(tid, revision) for tid in task_ids],
+        )
+        return deleted
+
+    @staticmethod
+    def _bump(cur: sqlite3.Cursor) -> int:
+        cur.execute("UPDATE task_meta SET value = value + 1 WHERE key = 'revision';")
+        return SqliteTaskRepository._current_revision(cur)
+
+    @staticmethod
+    def _current_revision(cur: sqlite3.Cursor) -> int:
+        cur.execute("SELECT value FROM task_meta WHERE key = 'revision';")
+        row = cur.fetchone()
+        return int(row[0]) if row else 0
+
+    @staticmethod
+    def _counts(cur: sqlite3.Cursor) -> Dict[bool, int]:
+        cur.execute("SELECT key, value FROM task_meta WHERE key IN ('pending', 'completed');")
+        values = dict(cur.fetchall())
+        return {False: int(values.get("pending", 0)), True: int(values.get("completed", 0))}
+
+    @staticmethod
+    def _to_task(row: Sequence[Any]) -> Task:
+        return Task(row[0], row[1], bool(row[2]), _from_micros(row[3]))
@@ -0,0 +1,25 @@
+from typing import Any
+
+from todoesvan.data.repositories.base import TaskRepository
+from todoesvan.utils import metrics
+
+
+class ThreadedTaskRepository:
+    """
+    AsyncTaskRepository over a blocking TaskRepository: each call runs in a worker
+    thread. For engines without an asyncio driver (sqlite, memory).
+    """
+
+    def __init__(self, inner: TaskRepository):
+        self._inner = inner
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._inner, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        async def call(*args: Any) -> Any:
+            return await metrics.to_thread(attr, *args)
+
+        setattr(self, name, call)  # cache: later lookups skip __getattr__
+        return call
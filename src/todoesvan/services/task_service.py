@@ -1,30 +1,185 @@
-from typing import List
+from typing import Dict, List, Optional, Sequence
 
-from todoesvan.data.model import Task
-from todoesvan.data.repositories.task_repository import TaskRepository
+from todoesvan.data.model import (
+    BatchResult,
+    PageCursor,
+    Task,
+    TaskBatch,
+    TaskChanges,
+    TaskOverview,
+    TaskPage,
+    TaskSearchPage,
+)
+from todoesvan.data.repositories.base import AsyncTaskRepository, TaskRepository
+from todoesvan.data.repositories.factory import get_async_repository, get_repository
+
+
+def _title(subject: str) -> str:
+    title = (subject or "").strip()
+    if not title:
+        raise ValueError("Task cannot be empty.")
+    return title
+
+
+def _titles(subjects: Sequence[str]) -> List[str]:
+    titles = [t for t in ((s or "").strip() for s in subjects) if t]
+    if not titles:
+        raise ValueError("Task cannot be empty.")
+    return titles
+
+
+def _check_batch(batch: TaskBatch) -> None:
+    for _, subject, _ in batch.creates:
+        _title(subject)
+    for _, subject in batch.subjects:
+        _title(subject)
 
 
 class TaskService:
-    def __init__(self, repo: TaskRepository):
-        self.repo = repo
+    """Blocking API (scripts, benchmarks); the app uses AsyncTaskService."""
+
+    def __init__(self, repo: Optional[TaskRepository] = None):
+        # None: the shared repository, resolved on the first call (in a worker
+        # thread), so building the service doesn't touch the database.
+        self._repo = repo
+
+    @property
+    def repo(self) -> TaskRepository:
+        if self._repo is None:
+            self._repo = get_repository()
+        return self._repo
 
     def add_task(self, subject: str) -> Task:
-        title = (subject or "").strip()
-        if not title:
-            raise ValueError("Task cannot be empty.")
-        return self.repo.create(title)
+        return self.repo.create(_title(subject))
 
     def get_tasks(self, completed: bool) -> List[Task]:
         return self.repo.get_tasks(completed)
 
+    def get_tasks_page(
+        self, completed: bool, limit: int, after: Optional[PageCursor] = None
+    ) -> TaskPage:
+        return self.repo.get_tasks_page(completed, limit, after)
+
+    def get_overview(self, limit_pending: int, limit_completed: int) -> TaskOverview:
+        return self.repo.get_overview(limit_pending, limit_completed)
+
+    def get_changes_since(self, revision: int) -> TaskChanges:
+        return self.repo.get_changes_since(revision)
+
+    def search(
+        self, query: str, completed: Optional[bool], limit: int, offset: int = 0
+    ) -> TaskSearchPage:
+        return self.repo.search(query, completed, limit, offset)
+
+    def get_descriptions(self, task_ids: Sequence[int]) -> Dict[int, str]:
+        return self.repo.get_descriptions(task_ids)
+
+    def current_revision(self) -> int:
+        return self.repo.current_revision()
+
     def toggle_completed(self, task_id: int, completed: bool) -> None:
         self.repo.set_completed(task_id, completed)
 
     def update_subject(self, task_id: int, subject: str) -> None:
-        title = (subject or "").strip()
-        if not title:
-            raise ValueError("Task cannot be empty.")
-        self.repo.update_subject(task_id, title)
+        self.repo.update_subject(task_id, _title(subject))
+
+    def update_description(self, task_id: int, description: str) -> None:
+        self.repo.update_description(task_id, (description or "").strip())
 
     def delete_task(self, task_id: int) -> None:
         self.repo.delete(task_id)
+
+    def bulk_create(self, subjects: Sequence[str]) -> List[Task]:
+        return self.repo.bulk_create(_titles(subjects))
+
+    def bulk_set_completed(self, task_ids: Sequence[int], completed: bool) -> List[int]:
+        return self.repo.bulk_set_completed(task_ids, completed)
+
+    def bulk_delete(self, task_ids: Sequence[int]) -> List[int]:
+        return self.repo.bulk_delete(task_ids)
+
+    def clear_completed(
+        self, also_ids: Sequence[int] = (), keep_ids: Sequence[int] = ()
+    ) -> List[int]:
+        return self.repo.clear_completed(also_ids, keep_ids)
+
+    def apply_batch(self, batch: TaskBatch) -> BatchResult:
+        _check_batch(batch)
+        return self.repo.apply_batch(batch)
+
+
+class AsyncTaskService:
+    """
+    TaskService with coroutine methods, awaited by TaskStore on the event loop
+    (no worker thread held per round trip when the engine has an asyncio driver).
+    """
+
+    def __init__(self, repo: Optional[AsyncTaskRepository] = None):
+        # None: the shared async repository, set up on the first call.
+        self._repo = repo
+
+    async def _repository(self) -> AsyncTaskRepository:
+        if self._repo is None:
+            self._repo = await get_async_repository()
+        return self._repo
+
+    async def add_task(self, subject: str) -> Task:
+        title = _title(subject)
+        return await (await self._repository()).create(title)
+
+    async def get_tasks(self, completed: bool) -> List[Task]:
+        return await (await self._repository()).get_tasks(completed)
+
+    async def get_tasks_page(
+        self, completed: bool, limit: int, after: Optional[PageCursor] = None
+    ) -> TaskPage:
+        return await (await self._repository()).get_tasks_page(completed, limit, after)
+
+    async def get_overview(self, limit_pending: int, limit_completed: int) -> TaskOverview:
+        return await (await self._repository()).get_overview(limit_pending, limit_completed)
+
+    async def get_changes_since(self, revision: int) -> TaskChanges:
+        return await (await self._repository()).get_changes_since(revision)
+
+    async def search(
+        self, query: str, completed: Optional[bool], limit: int, offset: int = 0
+    ) -> TaskSearchPage:
+        return await (await self._repository()).search(query, completed, limit, offset)
+
+    async def get_descriptions(self, task_ids: Sequence[int]) -> Dict[int, str]:
+        return await (await self._repository()).get_descriptions(task_ids)
+
+    async def current_revision(self) -> int:
+        return await (await self._repository()).current_revision()
+
+    async def toggle_completed(self, task_id: int, completed: bool) -> None:
+        await (await self._repository()).set_completed(task_id, completed)
+
+    async def update_subject(self, task_id: int, subject: str) -> None:
+        title = _title(subject)
+        await (await self._repository()).update_subject(task_id, title)
+
+    async def update_description(self, task_id: int, description: str) -> None:
+        await (await self._repository()).update_description(task_id, (description or "").strip())
+
+    async def delete_task(self, task_id: int) -> None:
+        await (await self._repository()).delete(task_id)
+
+    async def bulk_create(self, subjects: Sequence[str]) -> List[Task]:
+        titles = _titles(subjects)
+        return await (await self._repository()).bulk_create(titles)
+
+    async def bulk_set_completed(self, task_ids: Sequence[int], completed: bool) -> List[int]:
+        return await (await self._repository()).bulk_set_completed(task_ids, completed)
+
+    async def bulk_delete(self, task_ids: Sequence[int]) -> List[int]:
+        return await (await self._repository()).bulk_delete(task_ids)
+
+    async def clear_completed(
+        self, also_ids: Sequence[int] = (), keep_ids: Sequence[int] = ()
+    ) -> List[int]:
+        return await (await self._repository()).clear_completed(also_ids, keep_ids)
+
+    async def apply_batch(self, batch: TaskBatch) -> BatchResult:
+        _check_batch(batch)
+        return await (await self._repository()).apply_batch(batch)
@@ -0,0 +1,190 @@
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from todoesvan.utils import metrics
+
+Scheduler = Callable[..., None]
+
+
+class Priority(IntEnum):
+    WRITE = 0  # user writes: outbox flushes, bulk ops, description saves
+    READ = 1  # reads the user is waiting for: refreshes, search, paging
+    BACKGROUND = 2  # catch-up work: prefetch, feed-triggered syncs, reconnect probes
+
+
+@dataclass(eq=False)
+class _Job:
+    priority: Priority
+    fn: Callable[..., Awaitable[Any]]
+    args: Tuple[Any, ...]
+    key: Optional[Hashable] = None
+    supersede: bool = False
+    task: Optional["asyncio.Task[Any]"] = None
+    cancelled: bool = False  # cancelled by the queue (superseded), not by the loop
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    future: "asyncio.Future[None]" = field(compare=False)
+
+
+class JobQueue:
+    """
+    Runs the store's database coroutines with bounded concurrency.
+      - at most `limit` jobs run at once; reads leave one slot free for writes
+      - waiting jobs start by priority, then in submission order
+      - a job with a key is dropped while an identical one is in flight, or, when
+        submitted with supersede=True, cancels the one in flight and takes its place
+    Cancelling a job cancels the coroutine awaiting the query; with asyncpg that also
+    cancels the statement on the server (a query in a worker thread runs until
+    DB_STATEMENT_TIMEOUT, but its result is dropped).
+    All bookkeeping happens on the event loop: submit() hops there through `schedule`.
+    """
+
+    def __init__(self, schedule: Scheduler, limit: int = 4):
+        if limit < 1:
+            raise ValueError("limit must be at least 1.")
+        self._schedule = schedule
+        self.limit = limit
+        self.read_limit = limit - 1 if limit > 1 else limit
+        self._running = 0
+        self._running_writes = 0
+        self._waiting: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._by_key: Dict[Hashable, _Job] = {}
+        self._jobs: List[_Job] = []
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._waiting if not w.future.done())
+
+    def submit(
+        self,
+        priority: Priority,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        key: Optional[Hashable] = None,
+        supersede: bool = False,
+    ) -> None:
+        """Thread-safe: queues `fn(*args)` as a new task on the loop."""
+        self._schedule(self._run_job, _Job(priority, fn, args, key, supersede))
+
+    async def run(
+        self,
+        priority: Priority,
+        fn: Callable[..., Awaitable[Any]],
+        *args: Any,
+        key: Optional[Hashable] = None,
+        supersede: bool = False,
+    ) -> None:
+        """Like submit(), but runs in the calling task (e.g. after a debounce sleep)."""
+        await self._run_job(_Job(priority, fn, args, key, supersede))
+
+    def cancel(self, key: Hashable) -> bool:
+        """Cancels the job in flight under `key` (loop thread only)."""
+        job = self._by_key.get(key)
+        if job is None:
+            return False
+        self._cancel(job)
+        return True
+
+    def cancel_reads(self) -> None:
+        """Cancels every read in flight or waiting; writes always run to completion."""
+        for job in list(self._jobs):
+            if job.priority != Priority.WRITE:
+                self._cancel(job)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    async def _run_job(self, job: _Job) -> None:
+        if job.key is not None:
+            current = self._by_key.get(job.key)
+            if current is not None:
+                if not job.supersede:
+                    return  # an identical job is already in flight
+                self._cancel(current)
+            self._by_key[job.key] = job
+
+        job.task = asyncio.current_task()
+        self._jobs.append(job)
+        try:
+            await self._acquire(job.priority)
+            try:
+                await job.fn(*job.args)
+            finally:
+                self._release(job.priority)
+        except asyncio.CancelledError:
+            if not job.cancelled:
+                raise
+        finally:
+            self._jobs.remove(job)
+            if job.key is not None and self._by_key.get(job.key) is job:
+                del self._by_key[job.key]
+
+    def _cancel(self, job: _Job) -> None:
+        if job.cancelled or job.task is None:
+            return
+        job.cancelled = True
+        if job.key is not None and self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+        job.task.cancel()
+
+    def _can_start(self, priority: int) -> bool:
+        if self._running >= self.limit:
+            return False
+        return priority == Priority.WRITE or self._running - self._running_writes < self.read_limit
+
+    async def _acquire(self, priority: Priority) -> None:
+        if not self._waiting and self._can_start(priority):
+            self._start(priority)
+            return
+
+        waiter = _Waiter(priority, next(self._seq), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._waiting, waiter)
+        self._wake()
+        queued = time.perf_counter()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            # Cancelled right after being handed a slot: give it to the next one.
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(priority)
+            raise
+        if metrics.is_enabled():
+            metrics.observe("store.queue_wait", time.perf_counter() - queued)
+
+    def _start(self, priority: int) -> None:
+        self._running += 1
+        if priority == Priority.WRITE:
+            self._running_writes += 1
+
+    def _release(self, priority: int) -> None:
+        self._running -= 1
+        if priority == Priority.WRITE:
+            self._running_writes -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        # The heap top is the most urgent waiter: if it can't start, nothing behind it can.
+        while self._waiting:
+            waiter = self._waiting[0]
+            if waiter.future.done():  # cancelled while waiting
+                heapq.heappop(self._waiting)
+                continue
+            if not self._can_start(waiter.priority):
+                return
+            heapq.heappop(self._waiting)
+            self._start(waiter.priority)
+            waiter.future.set_result(None)
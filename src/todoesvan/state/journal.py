@@ -0,0 +1,110 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from todoesvan.state.outbox import OutboxEntry
+from todoesvan.utils.logging import get_logger
+from todoesvan.utils.storage import atomic_write
+
+logger = get_logger(__name__)
+
+
+class OutboxJournal:
+    """
+    Write-ahead copy of the outbox (queued + in-flight entries) on disk, so writes
+    made while the database is unreachable survive a restart.
+      - rewritten atomically (temp file + rename) after outbox changes while offline,
+        until the replayed writes are confirmed (online, nothing is written)
+      - rollbacks aren't persisted: restored entries get new ones from the store
+      - a journal from another format version is kept aside, never replayed blindly
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def load(self) -> List[OutboxEntry]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data: Dict[str, Any] = json.load(f)
+        except FileNotFoundError:
+            return []
+        except (OSError, ValueError):
+            logger.warning("Unreadable outbox journal %s; keeping it aside", self.path)
+            self._set_aside()
+            return []
+
+        if data.get("version") != self.VERSION:
+            logger.warning("Outbox journal %s has another version; keeping it aside", self.path)
+            self._set_aside()
+            return []
+
+        try:
+            return [self._decode(row) for row in data["entries"]]
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Malformed outbox journal %s; keeping it aside", self.path)
+            self._set_aside()
+            return []
+
+    def save(self, entries: List[OutboxEntry]) -> None:
+        self.write(self.encode(entries))
+
+    def encode(self, entries: List[OutboxEntry]) -> Optional[Dict[str, Any]]:
+        """What write() stores for `entries` (None: nothing to keep). Cheap, no I/O."""
+        if not entries:
+            return None
+        return {"version": self.VERSION, "entries": [self._encode(e) for e in entries]}
+
+    def write(self, data: Optional[Dict[str, Any]]) -> None:
+        """Blocking (fsync): run it off the event loop."""
+        if data is None:
+            self.clear()
+            return
+        with atomic_write(self.path, fsync=True) as f:
+            f.write(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _set_aside(self) -> None:
+        try:
+            os.replace(self.path, self.path.with_name(self.path.name + ".bad"))
+        except OSError:
+            pass
+
+    @staticmethod
+    def _encode(entry: OutboxEntry) -> Dict[str, Any]:
+        return {
+            "task_id": entry.task_id,
+            "create_subject": entry.create_subject,
+            "create_completed": entry.create_completed,
+            "completed": entry.completed,
+            "base_completed": entry.base_completed,
+            "subject": entry.subject,
+            "base_subject": entry.base_subject,
+            "delete": entry.delete,
+            "count_delta": [entry.count_delta[False], entry.count_delta[True]],
+        }
+
+    @staticmethod
+    def _decode(row: Dict[str, Any]) -> OutboxEntry:
+        pending, completed = row["count_delta"]
+        return OutboxEntry(
+            task_id=int(row["task_id"]),
+            create_subject=row["create_subject"],
+            create_completed=bool(row["create_completed"]),
+            completed=row["completed"],
+            base_completed=row["base_completed"],
+            subject=row["subject"],
+            base_subject=row["base_subject"],
+            delete=bool(row["delete"]),
+            count_delta={False: int(pending), True: int(completed)},
+        )
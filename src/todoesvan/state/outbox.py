@@ -0,0 +1,209 @@
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from todoesvan.data.model import TaskBatch
+
+Rollback = Callable[[], None]
+CountDelta = Dict[bool, int]  # per-tab change in totals (False=pending, True=completed)
+
+
+@dataclass
+class OutboxEntry:
+    """Net pending write for one task (temp ids mean 'not created yet')."""
+    task_id: int
+    create_subject: Optional[str] = None
+    create_completed: bool = False
+    completed: Optional[bool] = None
+    base_completed: Optional[bool] = None
+    subject: Optional[str] = None
+    base_subject: Optional[str] = None
+    delete: bool = False
+    # Undo steps in the order the ops happened; run reversed on failure.
+    rollbacks: List[Rollback] = field(default_factory=list)
+    # Net effect on tab counts (ops that cancel out also cancel here).
+    count_delta: CountDelta = field(default_factory=lambda: {False: 0, True: 0})
+    # Recorded or kept while the database was unreachable (replayed later).
+    offline: bool = False
+
+    def add_delta(self, delta: CountDelta) -> None:
+        for tab, n in delta.items():
+            self.count_delta[tab] += n
+
+    @property
+    def is_create(self) -> bool:
+        return self.create_subject is not None
+
+    def is_noop(self) -> bool:
+        return not (self.is_create or self.delete or self.completed is not None or self.subject is not None)
+
+    def rollback(self) -> None:
+        for undo in reversed(self.rollbacks):
+            undo()
+
+
+class Outbox:
+    """
+    Ordered log of optimistic writes, compacted per task:
+      - toggle + toggle back  -> nothing
+      - edit + edit           -> last edit
+      - create + edit/toggle  -> create with the final values
+      - create + delete       -> nothing
+      - edit/toggle + delete  -> delete
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, OutboxEntry] = {}  # insertion ordered
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._entries
+
+    def entries(self) -> List[OutboxEntry]:
+        return list(self._entries.values())
+
+    # -------------------------
+    # Recording (toggle/edit/delete return False when the op cancelled out)
+    # -------------------------
+    def record_create(
+        self, temp_id: int, subject: str, rollback: Rollback, delta: CountDelta
+    ) -> None:
+        entry = OutboxEntry(task_id=temp_id, create_subject=subject, rollbacks=[rollback])
+        entry.add_delta(delta)
+        self._entries[temp_id] = entry
+
+    def record_toggle(
+        self,
+        task_id: int,
+        completed: bool,
+        base_completed: bool,
+        rollback: Rollback,
+        delta: CountDelta,
+    ) -> bool:
+        entry = self._entry(task_id)
+        entry.add_delta(delta)
+        if entry.is_create:
+            entry.create_completed = completed
+        else:
+            if entry.completed is None:
+                entry.base_completed = base_completed
+            entry.completed = None if completed == entry.base_completed else completed
+        entry.rollbacks.append(rollback)
+        return self._settle(entry)
+
+    def record_subject(
+        self, task_id: int, subject: str, base_subject: str, rollback: Rollback
+    ) -> bool:
+        entry = self._entry(task_id)
+        if entry.is_create:
+            entry.create_subject = subject
+        else:
+            if entry.subject is None:
+                entry.base_subject = base_subject
+            entry.subject = None if subject == entry.base_subject else subject
+        entry.rollbacks.append(rollback)
+        return self._settle(entry)
+
+    def record_delete(self, task_id: int, rollback: Rollback, delta: CountDelta) -> bool:
+        entry = self._entry(task_id)
+        entry.add_delta(delta)
+        if entry.is_create:
+            # Never reached the server: nothing to write, nothing to undo.
+            del self._entries[task_id]
+            return False
+        entry.delete = True
+        entry.completed = None
+        entry.subject = None
+        entry.rollbacks.append(rollback)
+        return True
+
+    # -------------------------
+    # Flushing
+    # -------------------------
+    def drain(self) -> Tuple[TaskBatch, List[OutboxEntry]]:
+        """Takes every queued entry as one batch (multi-row statements)."""
+        entries = list(self._entries.values())
+        self._entries.clear()
+
+        batch = TaskBatch()
+        for e in entries:
+            if e.delete:
+                batch.deletes.append(e.task_id)
+                continue
+            if e.is_create:
+                batch.creates.append((e.task_id, e.create_subject or "", e.create_completed))
+                continue
+            if e.completed is not None:
+                batch.completed.append((e.task_id, e.completed))
+            if e.subject is not None:
+                batch.subjects.append((e.task_id, e.subject))
+        return batch, entries
+
+    def requeue(self, entries: List[OutboxEntry]) -> None:
+        """
+        Puts drained entries back in front (their write never happened). Ops recorded
+        for the same task meanwhile are folded into them, as if never drained.
+        """
+        later = self._entries
+        self._entries = {}
+        for entry in entries:
+            self._entries[entry.task_id] = entry
+        for newer in later.values():
+            older = self._entries.get(newer.task_id)
+            if older is None:
+                self._entries[newer.task_id] = newer
+            else:
+                self._fold(older, newer)
+
+    def remap(self, temp_id: int, real_id: int) -> None:
+        """A create landed: queued ops recorded against its temp id now target the real row."""
+        entry = self._entries.pop(temp_id, None)
+        if entry is None:
+            return
+        entry.task_id = real_id
+        self._entries[real_id] = entry
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _entry(self, task_id: int) -> OutboxEntry:
+        entry = self._entries.get(task_id)
+        if entry is None:
+            entry = OutboxEntry(task_id=task_id)
+            self._entries[task_id] = entry
+        return entry
+
+    def _fold(self, older: OutboxEntry, newer: OutboxEntry) -> None:
+        older.offline = older.offline or newer.offline
+        older.rollbacks.extend(newer.rollbacks)
+        older.add_delta(newer.count_delta)
+        if newer.delete:
+            if older.is_create:
+                del self._entries[older.task_id]
+                return
+            older.delete = True
+            older.completed = None
+            older.subject = None
+            return
+        if newer.completed is not None:
+            if older.is_create:
+                older.create_completed = newer.completed
+            else:
+                if older.completed is None:
+                    older.base_completed = newer.base_completed
+                older.completed = None if newer.completed == older.base_completed else newer.completed
+        if newer.subject is not None:
+            if older.is_create:
+                older.create_subject = newer.subject
+            else:
+                if older.subject is None:
+                    older.base_subject = newer.base_subject
+                older.subject = None if newer.subject == older.base_subject else newer.subject
+        self._settle(older)
+
+    def _settle(self, entry: OutboxEntry) -> bool:
+        if entry.is_noop():
+            del self._entries[entry.task_id]
+            return False
+        return True
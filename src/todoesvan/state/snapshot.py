@@ -0,0 +1,103 @@
+import gzip
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from todoesvan.data.model import Task
+from todoesvan.utils.logging import get_logger
+from todoesvan.utils.storage import atomic_write
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Snapshot:
+    """Last known first rows of each tab (False=pending, True=completed) plus totals."""
+    tasks: Dict[bool, List[Task]] = field(default_factory=lambda: {False: [], True: []})
+    has_more: Dict[bool, bool] = field(default_factory=lambda: {False: False, True: False})
+    counts: Dict[bool, int] = field(default_factory=lambda: {False: 0, True: 0})
+
+
+class SnapshotFile:
+    """
+    Gzipped JSON snapshot of the task cache, for an instant first frame on cold start.
+      - versioned: a file from another format version is ignored (and overwritten later)
+      - bounded: at most max_tasks rows per tab; bigger files are never read
+      - atomic: written to a temp file and renamed, so a crash never leaves half a file
+    It's only a hint: the store revalidates against the database right after hydrating.
+    """
+
+    VERSION = 1
+    MAX_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, path: Path, max_tasks: int = 200):
+        self.path = Path(path)
+        self.max_tasks = max_tasks
+
+    def load(self) -> Optional[Snapshot]:
+        try:
+            if self.path.stat().st_size > self.MAX_BYTES:
+                logger.warning("Ignoring oversized snapshot %s", self.path)
+                return None
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                data: Dict[str, Any] = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable snapshot %s", self.path)
+            return None
+
+        if data.get("version") != self.VERSION:
+            return None
+
+        try:
+            snapshot = Snapshot()
+            for key, name in ((False, "pending"), (True, "completed")):
+                tab = data[name]
+                rows = tab["tasks"][: self.max_tasks]
+                snapshot.tasks[key] = [self._decode(row, key) for row in rows]
+                snapshot.has_more[key] = bool(tab["has_more"]) or len(tab["tasks"]) > len(rows)
+                snapshot.counts[key] = int(tab["count"])
+        except (KeyError, IndexError, TypeError, ValueError):
+            logger.warning("Ignoring malformed snapshot %s", self.path)
+            return None
+        return snapshot
+
+    def save(self, snapshot: Snapshot) -> None:
+        data: Dict[str, Any] = {"version": self.VERSION}
+        for key, name in ((False, "pending"), (True, "completed")):
+            rows = snapshot.tasks[key][: self.max_tasks]
+            data[name] = {
+                "tasks": [self._encode(t) for t in rows],
+                "has_more": snapshot.has_more[key] or len(snapshot.tasks[key]) > len(rows),
+                "count": snapshot.counts[key],
+            }
+
+        with atomic_write(self.path) as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    # -------------------------
+    # Rows: [id, subject, created_at]; the tab gives `completed`
+    # -------------------------
+    @staticmethod
+    def _encode(task: Task) -> List[Any]:
+        created_at = task.created_at.isoformat() if task.created_at else None
+        return [task.id, task.subject, created_at]
+
+    @staticmethod
+    def _decode(row: List[Any], completed: bool) -> Task:
+        task_id, subject, created_at = row
+        return Task(
+            id=int(task_id),
+            subject=str(subject),
+            completed=completed,
+            created_at=datetime.fromisoformat(created_at) if created_at else None,
+        )
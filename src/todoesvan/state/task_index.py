@@ -0,0 +1,182 @@
+from bisect import bisect_left, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from todoesvan.data.model import Task
+from todoesvan.state.text_index import TextIndex
+
+# Pinned rows (optimistic inserts/moves) sort before server rows; server rows
+# sort like the repository query: created_at DESC, id DESC.
+SortKey = Tuple[float, ...]
+
+
+class TaskIndex:
+    """
+    id -> task index plus one ordered sequence per tab (False=pending, True=completed).
+      - lookups by id are O(1)
+      - insert/remove/move are O(log n) searches over a sorted key list
+      - a task keeps its sort key when replaced or restored, so rollbacks land in place
+      - subjects are text-indexed for filtering; in-place subject edits call reindex()
+    """
+
+    def __init__(self) -> None:
+        self._by_id: Dict[int, Task] = {}
+        self._tab: Dict[int, bool] = {}
+        self._key: Dict[int, SortKey] = {}
+        self._order: Dict[bool, List[Tuple[SortKey, int]]] = {False: [], True: []}
+        self._views: Dict[bool, Optional[List[Task]]] = {False: None, True: None}
+        self._dirty: Set[bool] = set()
+        self._pin_seq = 0
+        self._text = TextIndex()
+
+    # -------------------------
+    # Keys
+    # -------------------------
+    @staticmethod
+    def key_for(created_at: Optional[datetime], task_id: int) -> SortKey:
+        ts = created_at.timestamp() if created_at is not None else 0.0
+        return (1.0, -ts, float(-task_id))
+
+    @classmethod
+    def server_key(cls, task: Task) -> SortKey:
+        return cls.key_for(task.created_at, task.id)
+
+    def refreshed_key(self, task: Task) -> SortKey:
+        """server_key(task), reusing the indexed key (no allocation) while it's still valid."""
+        key = self._key.get(task.id)
+        if key is not None and key[0] == 1.0:  # pinned keys get replaced
+            if self._by_id[task.id].created_at == task.created_at:
+                return key
+        return self.server_key(task)
+
+    def pin_key(self) -> SortKey:
+        """Key that sorts before every existing row (newest pin first)."""
+        self._pin_seq += 1
+        return (0.0, float(-self._pin_seq))
+
+    # -------------------------
+    # Reads
+    # -------------------------
+    def __contains__(self, task_id: int) -> bool:
+        return task_id in self._by_id
+
+    def get(self, task_id: int) -> Optional[Task]:
+        return self._by_id.get(task_id)
+
+    def tab_of(self, task_id: int) -> Optional[bool]:
+        return self._tab.get(task_id)
+
+    def key_of(self, task_id: int) -> Optional[SortKey]:
+        return self._key.get(task_id)
+
+    def count(self, tab: bool) -> int:
+        return len(self._order[tab])
+
+    def tasks(self, tab: bool) -> List[Task]:
+        """Ordered snapshot of a tab; rebuilt only after that tab changed."""
+        view = self._views[tab]
+        if view is None:
+            by_id = self._by_id
+            view = [by_id[tid] for _, tid in self._order[tab]]
+            self._views[tab] = view
+        return view
+
+    def filter(self, tab: bool, terms: List[str]) -> List[Task]:
+        """Tasks of a tab matching every term, in tab order, without scanning the tab."""
+        ids = [tid for tid in self._text.search(terms) if self._tab.get(tid) == tab]
+        ids.sort(key=self._key.__getitem__)
+        return [self._by_id[tid] for tid in ids]
+
+    def take_dirty(self) -> Set[bool]:
+        """Tabs whose order/membership changed since the last call."""
+        dirty, self._dirty = self._dirty, set()
+        return dirty
+
+    # -------------------------
+    # Writes
+    # -------------------------
+    def insert(self, tab: bool, task: Task, key: Optional[SortKey] = None) -> None:
+        if task.id in self._by_id:
+            self._detach(task.id)
+        if key is None:
+            key = self.server_key(task)
+        self._by_id[task.id] = task
+        self._tab[task.id] = tab
+        self._key[task.id] = key
+        insort(self._order[tab], (key, task.id))
+        self._text.add(task.id, task.subject)
+        self._invalidate(tab)
+
+    def remove(self, task_id: int) -> Optional[Tuple[Task, bool, SortKey]]:
+        removed = self._detach(task_id)
+        if removed is not None:
+            self._text.remove(task_id)
+        return removed
+
+    def reindex(self, task_id: int) -> None:
+        """Re-reads a task's subject after it was edited in place."""
+        task = self._by_id.get(task_id)
+        if task is not None:
+            self._text.add(task_id, task.subject)
+
+    def _detach(self, task_id: int) -> Optional[Tuple[Task, bool, SortKey]]:
+        """Removes a task from its tab but keeps it text-indexed (it's re-inserted next)."""
+        task = self._by_id.pop(task_id, None)
+        if task is None:
+            return None
+        tab = self._tab.pop(task_id)
+        key = self._key.pop(task_id)
+        order = self._order[tab]
+        del order[bisect_left(order, (key, task_id))]
+        self._invalidate(tab)
+        return task, tab, key
+
+    def move(
+        self, task_id: int, to_tab: bool, key: Optional[SortKey] = None
+    ) -> Optional[Tuple[bool, SortKey]]:
+        """Moves a task to `to_tab` (pinned first by default); returns its old (tab, key)."""
+        removed = self._detach(task_id)
+        if removed is None:
+            return None
+        task, old_tab, old_key = removed
+        self.insert(to_tab, task, key if key is not None else self.pin_key())
+        return old_tab, old_key
+
+    def replace(self, old_id: int, new_task: Task) -> bool:
+        """Swaps a task (e.g. a temp placeholder) for another in the same slot."""
+        removed = self.remove(old_id)
+        if removed is None:
+            return False
+        _, tab, key = removed
+        self.insert(tab, new_task, key)
+        return True
+
+    def replace_tab(self, tab: bool, entries: Iterable[Tuple[Task, SortKey]]) -> None:
+        """Replaces a tab's whole content (used by full refreshes)."""
+        old_ids = [tid for _, tid in self._order[tab]]
+        for tid in old_ids:
+            if self._tab.get(tid) == tab:
+                del self._by_id[tid]
+                del self._tab[tid]
+                del self._key[tid]
+
+        order: List[Tuple[SortKey, int]] = []
+        for task, key in entries:
+            if task.id in self._by_id:
+                self._detach(task.id)
+            self._by_id[task.id] = task
+            self._tab[task.id] = tab
+            self._key[task.id] = key
+            order.append((key, task.id))
+            self._text.add(task.id, task.subject)  # no-op for unchanged subjects
+        order.sort()
+        self._order[tab] = order
+        self._invalidate(tab)
+
+        for tid in old_ids:
+            if tid not in self._by_id:
+                self._text.remove(tid)
+
+    def _invalidate(self, tab: bool) -> None:
+        self._views[tab] = None
+        self._dirty.add(tab)
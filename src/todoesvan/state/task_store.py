@@ -1,128 +1,503 @@
 import asyncio
-from typing import Callable, Dict, List, Optional, Set, Tuple
-
-from todoesvan.data.model import Task
-from todoesvan.services.task_service import TaskService
-
-# Flet's page.run_task signature (roughly): run_task(coro_fn, *args)
+import inspect
+import time
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from todoesvan.data.change_feed import ChangeFeed, TaskEvent
+from todoesvan.data.errors import (
+    DatabaseUnavailable,
+    PoolTimeout,
+    QueryTimeout,
+    StorageSetupError,
+)
+from todoesvan.data.model import PageCursor, Task, TaskChanges, TaskPage, TaskSearchPage
+from todoesvan.data.repositories.base import search_terms
+from todoesvan.services.task_service import AsyncTaskService, TaskService
+from todoesvan.state.jobs import JobQueue, Priority
+from todoesvan.state.journal import OutboxJournal
+from todoesvan.state.outbox import CountDelta, Outbox, OutboxEntry, Rollback
+from todoesvan.state.snapshot import Snapshot, SnapshotFile
+from todoesvan.state.task_index import SortKey, TaskIndex
+from todoesvan.utils import metrics
+from todoesvan.utils.logging import get_logger
+from todoesvan.utils.lru import LRUCache
+
+logger = get_logger(__name__)
+
+# Flet's page.run_task signature (roughly): run_task(coro_fn, *args).
+# It must be thread-safe: change feed events are scheduled from the listener thread.
 Scheduler = Callable[..., None]
-OnChange = Callable[[], None]
 OnError = Callable[[str], None]
 
 
+async def _call(fn: Callable[..., Any], *args: Any) -> Any:
+    """Awaits an AsyncTaskService method directly; blocking services run in a worker thread."""
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args)
+    return await metrics.to_thread(fn, *args)
+
+
+@dataclass
+class ChangeSet:
+    """
+    What changed since the last render: tabs (False=pending, True=completed), task ids,
+    counts, status (connectivity / queued writes) and search results.
+    """
+    tabs: Set[bool] = field(default_factory=set)
+    ids: Set[int] = field(default_factory=set)
+    counts: bool = False
+    status: bool = False
+    search: bool = False
+
+    def touches(self, completed: bool) -> bool:
+        return completed in self.tabs
+
+    def is_empty(self) -> bool:
+        return not (self.tabs or self.ids or self.counts or self.status or self.search)
+
+
+@dataclass
+class _BulkOp:
+    """One set-based statement: per-id undo/count deltas so partial failures undo just those ids."""
+    label: str
+    undo: Dict[int, Rollback] = field(default_factory=dict)
+    deltas: Dict[int, CountDelta] = field(default_factory=dict)
+    # Maps the statement result to ids that didn't apply.
+    on_done: Optional[Callable[[Any], Set[int]]] = None
+    # Extra undo step for a whole-statement failure.
+    restore: Optional[Rollback] = None
+    # Same change as single ops, queued in the outbox when the database is unreachable.
+    fallback: Optional[Callable[[], None]] = None
+
+
+OnChange = Callable[[ChangeSet], None]
+
+
 class TaskStore:
     """
     Owns:
-      - two-list cache (pending/completed)
+      - id-indexed two-tab cache (pending/completed)
       - stale-while-revalidate refresh
+      - incremental delta sync (revision based) after the first full load
+      - push updates from the change feed (other sessions' edits)
+      - keyset pagination (first page on load, more on demand)
       - optimistic create/delete/toggle + rollback
-    Not UI-specific: it exposes state and triggers on_change when state updates.
+      - outbox of pending writes, compacted per task and flushed in batches
+      - bulk actions (one statement, one rollback unit)
+      - per-tab totals (server counts + unconfirmed local deltas)
+      - on-disk snapshot: read off the loop at startup, saved debounced
+      - offline writes: the outbox is journaled to disk and replayed on reconnect
+      - server-side search: debounced queries, small LRU of recent results
+      - type-ahead filter over cached tasks (word-prefix index, no database)
+      - descriptions loaded on demand (never in list reads), kept in a bounded LRU
+    Not UI-specific: it exposes state and triggers on_change when state updates,
+    coalesced to at most one call per frame (flush() delivers immediately).
     """
 
-    def __init__(self, service: TaskService, schedule: Scheduler, on_change: OnChange, on_error: OnError):
+    def __init__(
+        self,
+        service: Union[AsyncTaskService, TaskService],
+        schedule: Scheduler,
+        on_change: OnChange,
+        on_error: OnError,
+        page_size: int = 50,
+        flush_window: float = 0.15,
+        frame_interval: float = 1 / 60,
+        snapshot: Optional[SnapshotFile] = None,
+        snapshot_delay: float = 2.0,
+        journal: Optional[OutboxJournal] = None,
+        retry_delay: float = 2.0,
+        max_retry_delay: float = 60.0,
+        search_delay: float = 0.25,
+        search_cache_size: int = 32,
+        description_cache_size: int = 256,
+        max_concurrency: int = 4,
+    ):
         self.service = service
+        self.page_size = page_size
+        self.flush_window = flush_window
+        self.frame_interval = frame_interval
         self._schedule = schedule
         self._on_change = on_change
         self._on_error = on_error
 
+        # Database work: bounded, writes first, superseded reads cancelled
+        self._jobs = JobQueue(schedule, limit=max_concurrency)
+
+        # Coalesced notifications
+        self._changes = ChangeSet()
+        self._render_scheduled: bool = False
+        self._dirty_since: float = 0.0  # perf_counter of the first unrendered change
+
         # ---- Cache ----
-        self._cache: Dict[bool, List[Task]] = {False: [], True: []}  # False=pending, True=completed
+        self._index = TaskIndex()  # tabs: False=pending, True=completed
 
         # Refresh state
         self._refreshing_tabs: Set[bool] = set()
         self._refresh_seq: int = 0
         self._refresh_token: Dict[bool, int] = {False: 0, True: 0}
 
+        # Delta sync state (0 = no baseline yet, a full load is needed first)
+        self._revision: int = 0
+        self._syncing: bool = False
+        self._sync_again: bool = False
+        self._unsubscribe_feed: Optional[Callable[[], None]] = None
+
+        # Tab totals: last server counts + local ops not confirmed yet
+        self._server_counts: Dict[bool, int] = {False: 0, True: 0}
+        self._local_count_delta: Dict[bool, int] = {False: 0, True: 0}
+        self._counts_seq: int = 0  # bumped by every server count received
+        self._recount: bool = False  # a settled op may already be in the server totals
+
+        # Pagination state
+        self._cursor: Dict[bool, Optional[PageCursor]] = {False: None, True: None}
+        self._has_more: Dict[bool, bool] = {False: False, True: False}
+        self._loading_more: Set[bool] = set()
+
         # Optimistic state
-        self._pending_ids: Set[int] = set()
+        self._pending_ids: Set[int] = set()  # any local override (queued or in flight)
         self._pending_delete_ids: Set[int] = set()
         self._temp_id: int = -1
 
+        # Write outbox
+        self._outbox = Outbox()
+        self._in_flight_ids: Set[int] = set()
+        self._in_flight_entries: List[OutboxEntry] = []
+        self._flush_scheduled: bool = False
+        self._flushing: bool = False
+        self._pool_busy: bool = False  # last flush found every connection busy
+
+        # Offline mode: writes stay queued (and journaled) until a probe succeeds
+        self._journal = journal
+        self._journaled: bool = False  # the file may hold entries not confirmed yet
+        self._journal_dirty: bool = False
+        self._journal_writing: bool = False
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._offline: bool = False
+        self._next_retry_delay: float = retry_delay
+        self._retry_scheduled: bool = False
+        self._reload_needed: bool = False
+
+        # Local snapshot (only written once the cache holds real server data)
+        self._snapshot = snapshot
+        self.snapshot_delay = snapshot_delay
+        self._snapshot_scheduled: bool = False
+        self._has_baseline: bool = False
+
+        # Search: latest query wins (sequence token), results cached per
+        # (revision, query, tab) so retyping a query or switching back is instant
+        self.search_delay = search_delay
+        self._search_query: str = ""
+        self._search_tab: bool = False
+        self._search_seq: int = 0
+        self._search_page: Optional[TaskSearchPage] = None
+        self._search_loading: bool = False
+        self._search_cache: LRUCache[Tuple[int, str, bool], TaskSearchPage] = LRUCache(search_cache_size)
+
+        # Descriptions: id -> text ("" = none); dropped when the row changes anywhere
+        self._descriptions: LRUCache[int, str] = LRUCache(description_cache_size)
+        self._descriptions_loading: Set[int] = set()
+        self._descriptions_failed: Set[int] = set()  # last load failed: retried on request
+        self._description_writes: Dict[int, int] = {}  # id -> saves in flight
+
     # -------------------------
     # Public state getters
     # -------------------------
     @property
     def pending_ids(self) -> Set[int]:
-        return self._pending_ids
+        """Ids whose writes are in flight (queued ones can still be edited and compacted)."""
+        return self._in_flight_ids
 
     def tasks(self, completed: bool) -> List[Task]:
-        return self._cache[completed]
+        return self._index.tasks(completed)
+
+    def task(self, task_id: int) -> Optional[Task]:
+        """A cached task, or a search hit past the loaded pages."""
+        task = self._index.get(task_id)
+        if task is None and self._search_page is not None:
+            task = next((hit for hit in self._search_page.tasks if hit.id == task_id), None)
+        return task
 
     def is_refreshing(self, completed: bool) -> bool:
         return completed in self._refreshing_tabs
 
+    def has_more(self, completed: bool) -> bool:
+        return self._has_more[completed]
+
+    def is_loading_more(self, completed: bool) -> bool:
+        return completed in self._loading_more
+
+    def count(self, completed: bool) -> int:
+        return max(0, self._server_counts[completed] + self._local_count_delta[completed])
+
+    @property
+    def loaded(self) -> bool:
+        """True once the database answered a full load (the snapshot doesn't count)."""
+        return self._has_baseline
+
+    @property
+    def is_offline(self) -> bool:
+        return self._offline
+
+    @property
+    def queued_writes(self) -> int:
+        """Tasks with writes not confirmed by the database yet."""
+        return len(self._outbox) + len(self._in_flight_entries)
+
+    @property
+    def search_query(self) -> str:
+        """Normalized active query ("" when not searching)."""
+        return self._search_query
+
+    def filter_tasks(self, query: str, completed: bool) -> List[Task]:
+        """Cached tasks of a tab matching the query (text index, no database)."""
+        return self._index.filter(completed, search_terms(query))
+
+    def search_results(self) -> List[Task]:
+        """
+        Hits for the active query, with local (optimistic) state applied on top.
+        Until the server answers, the cached rows matching it are shown (type-ahead).
+        """
+        if self._search_page is None:
+            return self.filter_tasks(self._search_query, self._search_tab)
+        results: List[Task] = []
+        for hit in self._search_page.tasks:
+            if hit.id in self._pending_delete_ids:
+                continue
+            local = self._index.get(hit.id)
+            if local is None:
+                results.append(hit)
+            elif self._index.tab_of(hit.id) == self._search_tab:
+                results.append(local)
+        return results
+
+    def is_search_loading(self) -> bool:
+        return self._search_loading
+
+    def search_has_more(self) -> bool:
+        return self._search_page is not None and self._search_page.next_offset is not None
+
+    def description(self, task_id: int) -> Optional[str]:
+        """Cached description ("" = none), or None while it isn't loaded."""
+        if task_id < 0:
+            return ""  # placeholders are created without one
+        return self._descriptions.get(task_id)
+
+    def is_description_loading(self, task_id: int) -> bool:
+        return task_id in self._descriptions_loading
+
+    def description_failed(self, task_id: int) -> bool:
+        """The description couldn't be loaded (load_description retries)."""
+        return task_id in self._descriptions_failed
+
     # -------------------------
     # Public actions (UI calls these)
     # -------------------------
     def warm_cache_both(self) -> None:
-        self._schedule(self._warm_cache_both)
+        self._jobs.submit(Priority.READ, self._warm_cache_both, key="overview", supersede=True)
 
     def refresh_tab(self, completed: bool) -> None:
+        if self._revision:
+            # Cheap path: only ask for what changed since the last sync.
+            self.sync_changes()
+            return
+
         self._refresh_seq += 1
         token = self._refresh_seq
         self._refresh_token[completed] = token
 
         self._refreshing_tabs.add(completed)
-        self._notify()
+        self._notify(tabs=(completed,))
+
+        # A newer refresh of the tab makes the running one pointless: cancel its query.
+        self._jobs.submit(
+            Priority.READ, self._refresh_tab_from_db, completed, token,
+            key=("refresh", completed), supersede=True,
+        )
+
+    def sync_changes(self) -> None:
+        self._jobs.submit(Priority.READ, self._sync_changes)
+
+    def attach_change_feed(self, feed: ChangeFeed) -> None:
+        if self._unsubscribe_feed is None:
+            self._unsubscribe_feed = feed.subscribe(self._on_feed_event)
+
+    def detach_change_feed(self) -> None:
+        if self._unsubscribe_feed is not None:
+            self._unsubscribe_feed()
+            self._unsubscribe_feed = None
+
+    def cancel_reads(self) -> None:
+        """Cancels queued and running reads (e.g. the view is going away); writes still land."""
+        self._schedule(self._cancel_reads)
+
+    def load_more(self, completed: bool) -> None:
+        if not self._has_more[completed] or completed in self._loading_more:
+            return
+        if completed in self._refreshing_tabs:
+            return  # the running refresh will reset the cursor anyway
+
+        self._loading_more.add(completed)
+        self._notify(tabs=(completed,))
+        cursor = self._cursor[completed]
+        self._jobs.submit(
+            Priority.READ,
+            self._load_more_from_db,
+            completed,
+            cursor,
+            self._refresh_token[completed],
+            key=("load_more", completed, cursor),
+        )
+
+    def search(self, query: str, completed: bool) -> None:
+        """Debounced: only the last query typed within search_delay hits the database."""
+        normalized = " ".join(search_terms(query))
+        if normalized == self._search_query and completed == self._search_tab:
+            return
 
-        self._schedule(self._refresh_tab_from_db, completed, token)
+        self._search_seq += 1
+        self._search_query = normalized
+        self._search_tab = completed
+        self._search_page = None
+        self._search_loading = False
+
+        if normalized:
+            cached = self._search_cache.get((self._revision, normalized, completed))
+            if cached is not None:
+                self._search_page = cached
+            else:
+                self._search_loading = True
+                self._schedule(self._search_later, self._search_seq)
+        self._notify(search=True)
+
+    def load_description(self, task_id: int) -> None:
+        self._request_descriptions((task_id,), Priority.READ)
+
+    def prefetch_descriptions(self, task_ids: Iterable[int]) -> None:
+        """One batched read for the ids not cached or loading yet (e.g. the visible rows)."""
+        self._request_descriptions(task_ids, Priority.BACKGROUND)
+
+    def _request_descriptions(self, task_ids: Iterable[int], priority: Priority) -> None:
+        missing = [
+            tid
+            for tid in task_ids
+            if tid > 0 and tid not in self._descriptions and tid not in self._descriptions_loading
+        ][: self.page_size]
+        if not missing:
+            return
+        self._descriptions_loading.update(missing)
+        self._descriptions_failed.difference_update(missing)
+        self._jobs.submit(priority, self._load_descriptions, missing)
+
+    def update_description(self, task_id: int, description: str) -> None:
+        """Optimistic; saved directly (not through the outbox), reverted if that fails."""
+        cleaned = (description or "").strip()
+        old = self._descriptions.get(task_id)
+        if task_id < 0 or cleaned == old:
+            return
+        self._descriptions.put(task_id, cleaned)
+        self._description_writes[task_id] = self._description_writes.get(task_id, 0) + 1
+        self._notify(ids=(task_id,))
+        self._jobs.submit(Priority.WRITE, self._persist_description, task_id, cleaned, old)
+
+    def load_more_search(self) -> None:
+        page = self._search_page
+        if page is None or page.next_offset is None or self._search_loading:
+            return
+        self._search_loading = True
+        self._notify(search=True)
+        self._jobs.submit(
+            Priority.READ, self._run_search, self._search_seq, page.next_offset,
+            key="search", supersede=True,
+        )
 
+    @metrics.timed("store.create_task")
     def create_task(self, title: str) -> None:
-        # Always add placeholder to Pending cache so it's instant.
+        # Always add placeholder to Pending cache (pinned on top) so it's instant.
         temp_id = self._temp_id
         self._temp_id -= 1
 
         placeholder = Task(id=temp_id, subject=title, completed=False)
-        self._cache[False].insert(0, placeholder)
+        self._index.insert(False, placeholder, self._index.pin_key())
         self._pending_ids.add(temp_id)
 
-        self._notify()
-        self._schedule(self._persist_create_task, title, temp_id)
+        def rollback() -> None:
+            self._index.remove(temp_id)
+
+        delta = {False: 1}
+        self._outbox.record_create(temp_id, title, rollback, delta)
+        self._shift_counts(delta)
+        self._notify(ids=(temp_id,))
+        self._request_flush()
 
+    @metrics.timed("store.delete_task")
     def delete_task(self, task_id: int) -> None:
-        found = self._find_anywhere(task_id)
-        if not found:
+        self._adopt_search_hit(task_id)
+        removed = self._index.remove(task_id)
+        if not removed:
             return
+        self._descriptions.pop(task_id)
 
-        key, idx = found
-        removed = self._cache[key].pop(idx)
+        rollback = self._undo_delete(*removed)
+        delta = {removed[1]: -1}
 
         self._pending_delete_ids.add(task_id)
         self._pending_ids.add(task_id)  # prevents refresh from resurrecting it
+        self._shift_counts(delta)
+
+        if not self._outbox.record_delete(task_id, rollback, delta):
+            # Deleting a task that was never created: nothing to send.
+            self._pending_delete_ids.discard(task_id)
+            self._pending_ids.discard(task_id)
 
         self._notify()
-        self._schedule(self._persist_delete_task, removed, key, idx)
+        self._request_flush()
 
+    @metrics.timed("store.toggle_completed")
     def toggle_completed(self, task_id: int, completed: bool) -> None:
-        found = self._find_anywhere(task_id)
-        if not found:
+        self._adopt_search_hit(task_id)
+        task = self._index.get(task_id)
+        if task is None:
             return
 
-        from_key, from_idx = found
-        task = self._cache[from_key].pop(from_idx)
         old_completed = task.completed
 
         # Move to other list optimistically
-        task.completed = completed
         to_key = completed
-        self._cache[to_key].insert(0, task)
+        moved = self._index.move(task_id, to_key)
+        if moved is None:
+            return
+        task.completed = completed
+        rollback = self._undo_toggle(task_id, old_completed, *moved)
+        delta = self._move_delta(moved[0], to_key)
 
         self._pending_ids.add(task_id)
-        self._notify()
+        self._shift_counts(delta)
+        if not self._outbox.record_toggle(task_id, completed, old_completed, rollback, delta):
+            self._settle(task_id)  # toggled back before flushing: no write
 
-        self._schedule(
-            self._persist_toggle_completed,
-            task_id,
-            completed,
-            old_completed,
-            from_key,
-            from_idx,
-            to_key,
-        )
+        self._notify()
+        self._request_flush()
 
+    @metrics.timed("store.update_subject")
     def update_subject(self, task_id: int, new_subject: str) -> None:
-        found = self._find_anywhere(task_id)
-        if not found:
+        self._adopt_search_hit(task_id)
+        task = self._index.get(task_id)
+        if task is None:
             return
 
         cleaned = (new_subject or "").strip()
@@ -130,8 +505,6 @@ class TaskStore:
             self._error("Task cannot be empty.")
             return
 
-        key, idx = found
-        task = self._cache[key][idx]
         old_subject = task.subject
 
         if cleaned == old_subject:
@@ -139,62 +512,608 @@ class TaskStore:
 
         # Optimistic update
         task.subject = cleaned
+        self._index.reindex(task_id)
+
+        def rollback() -> None:
+            t = self._index.get(task_id)
+            if t:
+                t.subject = old_subject
+                self._index.reindex(task_id)
+
         self._pending_ids.add(task_id)
-        self._notify()
+        if not self._outbox.record_subject(task_id, cleaned, old_subject, rollback):
+            self._settle(task_id)
+
+        self._notify(ids=(task_id,))
+        self._request_flush()
+
+
+    # -------------------------
+    # Bulk actions (UI calls these)
+    # -------------------------
+    @metrics.timed("store.bulk_create")
+    def bulk_create(self, titles: Sequence[str]) -> None:
+        cleaned = [t for t in ((title or "").strip() for title in titles) if t]
+        if not cleaned:
+            self._error("Task cannot be empty.")
+            return
+
+        op = _BulkOp(label="Import")
+        temp_ids: List[int] = []
+        # Reversed so the first title ends up on top.
+        for title in reversed(cleaned):
+            temp_id = self._temp_id
+            self._temp_id -= 1
+            self._index.insert(False, Task(id=temp_id, subject=title, completed=False), self._index.pin_key())
+            temp_ids.append(temp_id)
+            op.undo[temp_id] = self._undo_insert(temp_id)
+            op.deltas[temp_id] = {False: 1}
+        temp_ids.reverse()
+
+        def on_done(created: List[Task]) -> Set[int]:
+            for temp_id, task in zip(temp_ids, created):
+                self._index.replace(temp_id, task)
+            return set()
+
+        def fallback() -> None:
+            for title in reversed(cleaned):
+                self.create_task(title)
+
+        op.on_done = on_done
+        op.fallback = fallback
+        self._start_bulk(op, self.service.bulk_create, cleaned)
+
+    @metrics.timed("store.bulk_set_completed")
+    def bulk_set_completed(self, task_ids: Sequence[int], completed: bool) -> None:
+        op = _BulkOp(label="Complete" if completed else "Restore")
+        for task_id in self._bulk_candidates(task_ids):
+            task = self._index.get(task_id)
+            if task is None or task.completed == completed:
+                continue
+            if task_id < 0 or task_id in self._outbox:
+                # Local-only or already queued: let the outbox compact it.
+                self.toggle_completed(task_id, completed)
+                continue
+
+            old_completed = task.completed
+            moved = self._index.move(task_id, completed)
+            if moved is None:
+                continue
+            task.completed = completed
+            op.undo[task_id] = self._undo_toggle(task_id, old_completed, *moved)
+            op.deltas[task_id] = self._move_delta(moved[0], completed)
+
+        if not op.undo:
+            return
+
+        ids = list(op.undo)
+        # Rows that vanished meanwhile get rolled back.
+        def fallback() -> None:
+            for task_id in ids:
+                self.toggle_completed(task_id, completed)
+
+        op.on_done = lambda updated: set(ids) - set(updated)
+        op.fallback = fallback
+        self._start_bulk(op, self.service.bulk_set_completed, ids, completed)
+
+    @metrics.timed("store.bulk_delete")
+    def bulk_delete(self, task_ids: Sequence[int]) -> None:
+        op = _BulkOp(label="Delete")
+        for task_id in self._bulk_candidates(task_ids):
+            if task_id < 0 or task_id in self._outbox:
+                self.delete_task(task_id)
+                continue
+            removed = self._index.remove(task_id)
+            if removed is None:
+                continue
+            self._pending_delete_ids.add(task_id)
+            op.undo[task_id] = self._undo_delete(*removed)
+            op.deltas[task_id] = {removed[1]: -1}
+
+        if not op.undo:
+            return
+
+        ids = list(op.undo)
+        op.fallback = lambda: self._delete_each(ids)
+        self._start_bulk(op, self.service.bulk_delete, ids)
+
+    @metrics.timed("store.clear_completed")
+    def clear_completed(self) -> None:
+        op = _BulkOp(label="Clear completed")
+        for task in list(self._index.tasks(True)):
+            task_id = task.id
+            if task_id in self._in_flight_ids:
+                continue
+            if task_id < 0 or task_id in self._outbox:
+                self.delete_task(task_id)
+                continue
+            removed = self._index.remove(task_id)
+            if removed is not None:
+                self._pending_delete_ids.add(task_id)
+                op.undo[task_id] = self._undo_delete(*removed)
+                op.deltas[task_id] = {True: -1}
+
+        had_more = self._has_more[True]
+        cursor = self._cursor[True]
+        # Restored locally but still completed on the server until the toggle lands.
+        keep = [tid for tid in self._pending_ids if tid > 0 and self._index.tab_of(tid) is False]
+
+        def restore_paging() -> None:
+            self._has_more[True] = had_more
+            self._cursor[True] = cursor
+
+        def on_done(deleted: List[int]) -> Set[int]:
+            # Unloaded rows went too: only the kept rows are left (their own restore
+            # deltas take them out when they settle). Counts as a fresh server total.
+            self._server_counts[True] = len(keep)
+            self._counts_seq += 1
+            return set()
+
+        # Unloaded pages are deleted server-side too.
+        self._has_more[True] = False
+        self._cursor[True] = None
+
+        ids = list(op.undo)
+        op.on_done = on_done
+        op.restore = restore_paging
+        # Offline only the loaded rows can be queued; the rest stay until the next clear.
+        op.fallback = lambda: self._delete_each(ids)
+        self._start_bulk(op, self.service.clear_completed, ids, keep)
+
+    # -------------------------
+    # Local snapshot
+    # -------------------------
+    def load_local_state(self) -> None:
+        """
+        Startup: reads the last snapshot and the outbox journal off the loop, applies them
+        (snapshot first, journaled writes on top), then revalidates with warm_cache_both().
+        """
+        self._schedule(self._load_local_state)
+
+    async def _load_local_state(self) -> None:
+        snapshot = await metrics.to_thread(self._snapshot.load) if self._snapshot else None
+        entries = await metrics.to_thread(self._journal.load) if self._journal else []
+        self._hydrate(snapshot)
+        self._restore_outbox(entries)
+        self.warm_cache_both()
+
+    def _hydrate(self, snapshot: Optional[Snapshot]) -> None:
+        """Fills the cache from `snapshot`, unless something got there first (it's only a guess)."""
+        if snapshot is None or self._index.count(False) or self._index.count(True):
+            return
+
+        for key in (False, True):
+            tasks = snapshot.tasks[key]
+            self._index.replace_tab(key, [(t, self._index.server_key(t)) for t in tasks])
+            last = tasks[-1] if tasks else None
+            if snapshot.has_more[key] and last is not None and last.created_at is not None:
+                self._cursor[key] = PageCursor(last.created_at, last.id)
+                self._has_more[key] = True
+        self._server_counts = dict(snapshot.counts)
+        self._notify(tabs=(False, True), counts=True)
+
+    def save_snapshot(self) -> None:
+        """Writes the snapshot now (blocking), e.g. when the view goes away."""
+        if self._snapshot is None or not self._has_baseline:
+            return
+        try:
+            self._snapshot.save(self._build_snapshot())
+        except OSError as ex:
+            logger.warning("Could not save task snapshot: %s", ex)
 
-        self._schedule(self._persist_update_subject, task_id, cleaned, old_subject)
+    # -------------------------
+    # Offline outbox
+    # -------------------------
+    def _restore_outbox(self, entries: List[OutboxEntry]) -> None:
+        """
+        Re-applies writes journaled by a previous session on top of the cache and queues
+        them for replay, ahead of anything recorded since startup.
+        """
+        if not entries:
+            return
 
+        recorded_meanwhile = bool(len(self._outbox) or self._in_flight_entries)
+        self._journaled = True
+        for entry in entries:
+            entry.offline = True
+            if entry.is_create:
+                # Fresh temp id: the journaled one may already name a new placeholder.
+                tid = entry.task_id = self._temp_id
+                self._temp_id -= 1
+                task = Task(id=tid, subject=entry.create_subject or "", completed=entry.create_completed)
+                self._index.insert(task.completed, task, self._index.pin_key())
+                entry.rollbacks.append(self._undo_insert(tid))
+                self._pending_ids.add(tid)
+            else:
+                # The pre-edit row isn't known anymore: a failed replay reloads instead.
+                entry.rollbacks.append(self._request_reload)
+                self._reapply(entry)
+            self._shift_counts(entry.count_delta)
+
+        self._outbox.requeue(entries)
+        if recorded_meanwhile:
+            # The journal may have been rewritten without these entries.
+            self._journal_outbox()
+        self._notify(tabs=(False, True), counts=True, status=True)
+        self._request_flush()
 
     # -------------------------
     # Internals
     # -------------------------
-    def _notify(self) -> None:
-        self._on_change()
+    def flush(self) -> None:
+        """Delivers pending changes now (tests, or when a render must not wait a frame)."""
+        self._render_scheduled = False
+        changes, self._changes = self._changes, ChangeSet()
+        changes.tabs |= self._index.take_dirty()
+        for tid in changes.ids:
+            tab = self._index.tab_of(tid)
+            if tab is not None:
+                changes.tabs.add(tab)
+        if not changes.is_empty():
+            with metrics.timer("store.render"):
+                self._on_change(changes)
+            if self._dirty_since:
+                metrics.observe("store.action_to_render", time.perf_counter() - self._dirty_since)
+            self._request_snapshot()
+        self._dirty_since = 0.0
+
+    def _notify(
+        self,
+        tabs: Iterable[bool] = (),
+        ids: Iterable[int] = (),
+        counts: bool = False,
+        status: bool = False,
+        search: bool = False,
+    ) -> None:
+        """Marks the store dirty; index writes mark their own tabs. Renders once per frame."""
+        self._changes.tabs.update(tabs)
+        self._changes.ids.update(ids)
+        self._changes.counts = self._changes.counts or counts
+        self._changes.status = self._changes.status or status
+        self._changes.search = self._changes.search or search
+        if not self._render_scheduled:
+            self._render_scheduled = True
+            if metrics.is_enabled():
+                self._dirty_since = time.perf_counter()
+            self._schedule(self._render_next_frame)
+
+    async def _render_next_frame(self) -> None:
+        await asyncio.sleep(self.frame_interval)
+        if self._render_scheduled:
+            self.flush()
 
     def _error(self, msg: str) -> None:
         self._on_error(msg)
 
-    def _tasks_signature(self, tasks: List[Task]) -> List[Tuple[int, str, bool]]:
-        return [(t.id, t.subject, t.completed) for t in tasks]
+    def _settle(self, task_id: int) -> None:
+        """Drops local-override protection once nothing is queued or in flight for the id."""
+        if task_id in self._outbox or task_id in self._in_flight_ids:
+            return
+        self._pending_ids.discard(task_id)
+        self._pending_delete_ids.discard(task_id)
+
+    def _adopt_search_hit(self, task_id: int) -> None:
+        """Search can surface rows past the loaded pages: index one before acting on it."""
+        if task_id in self._index or self._search_page is None:
+            return
+        for hit in self._search_page.tasks:
+            if hit.id == task_id:
+                self._index.insert(hit.completed, hit)
+                return
+
+    def _bulk_candidates(self, task_ids: Sequence[int]) -> List[int]:
+        # In-flight rows are locked, exactly like in the UI.
+        return [tid for tid in dict.fromkeys(task_ids) if tid not in self._in_flight_ids]
+
+    def _undo_toggle(
+        self, task_id: int, old_completed: bool, from_key: bool, from_sort_key: SortKey
+    ) -> Rollback:
+        def rollback() -> None:
+            t = self._index.get(task_id)
+            if t:
+                t.completed = old_completed
+                self._index.move(task_id, from_key, from_sort_key)
+
+        return rollback
+
+    def _undo_insert(self, task_id: int) -> Rollback:
+        def rollback() -> None:
+            self._index.remove(task_id)
+
+        return rollback
+
+    def _undo_delete(self, task: Task, key: bool, sort_key: SortKey) -> Rollback:
+        def rollback() -> None:
+            self._index.insert(key, task, sort_key)
+
+        return rollback
+
+    def _start_bulk(self, op: _BulkOp, fn: Callable[..., Any], *args: Any) -> None:
+        if self._offline and op.fallback is not None:
+            self._undo_bulk(op)
+            op.fallback()
+            return
+
+        ids = list(op.undo)
+        self._pending_ids.update(ids)
+        self._in_flight_ids.update(ids)
+        for delta in op.deltas.values():
+            self._shift_counts(delta)
+        self._notify(ids=ids)
+        self._jobs.submit(Priority.WRITE, self._persist_bulk, op, fn, args)
+
+    def _delete_each(self, task_ids: List[int]) -> None:
+        for task_id in task_ids:
+            self.delete_task(task_id)
+
+    @staticmethod
+    def _undo_bulk(op: _BulkOp) -> None:
+        for rollback in reversed(list(op.undo.values())):
+            rollback()
+        if op.restore:
+            op.restore()
+
+    @staticmethod
+    def _move_delta(from_key: bool, to_key: bool) -> CountDelta:
+        if from_key == to_key:
+            return {}
+        return {from_key: -1, to_key: 1}
+
+    def _shift_counts(self, delta: CountDelta, sign: int = 1) -> None:
+        for tab, n in delta.items():
+            self._local_count_delta[tab] += sign * n
+        if delta:
+            self._changes.counts = True
+
+    def _settle_counts(self, delta: CountDelta, applied: bool, counts_seq: int) -> None:
+        """
+        A local op finished: its delta moves into the server totals, or is dropped.
+        `counts_seq` is the one seen when the op was sent: a total received since then
+        may already include it, so it isn't added twice and a sync confirms the totals.
+        """
+        self._shift_counts(delta, sign=-1)
+        if not applied or not delta:
+            return
+        if counts_seq != self._counts_seq:
+            self._recount = True
+            return
+        for tab, n in delta.items():
+            self._server_counts[tab] += n
+
+    def _set_server_counts(self, counts: Optional[Dict[bool, int]]) -> None:
+        if counts is None:
+            return
+        self._counts_seq += 1
+        if counts != self._server_counts:
+            self._server_counts = dict(counts)
+            self._notify(counts=True)
+
+    def _confirm_counts(self) -> None:
+        # The delta sync after our own writes always carries fresh totals.
+        if self._recount and self._has_baseline:
+            self._recount = False
+            self._jobs.submit(Priority.BACKGROUND, self._sync_changes)
+
+    def _request_snapshot(self) -> None:
+        if self._snapshot is None or not self._has_baseline or self._snapshot_scheduled:
+            return
+        self._snapshot_scheduled = True
+        self._schedule(self._save_snapshot_later)
 
-    def _find_anywhere(self, task_id: int) -> Optional[Tuple[bool, int]]:
+    def _build_snapshot(self) -> Snapshot:
+        # Temp placeholders only exist in this session.
+        snapshot = Snapshot()
         for key in (False, True):
-            for i, t in enumerate(self._cache[key]):
-                if t.id == task_id:
-                    return key, i
-        return None
-
-    def _merge_with_local_overrides(self, completed_key: bool, server_tasks: List[Task]) -> List[Task]:
-        # 1) never resurrect pending-deleted tasks
-        tasks = [t for t in server_tasks if t.id not in self._pending_delete_ids]
-
-        # 2) for pending toggles, prefer local state
-        local_by_id: Dict[int, Task] = {}
-        for t in self._cache[False] + self._cache[True]:
-            if t.id > 0:
-                local_by_id[t.id] = t
-
-        pending_real_ids = [tid for tid in self._pending_ids if tid > 0 and tid not in self._pending_delete_ids]
-        if pending_real_ids:
-            pending_set = set(pending_real_ids)
-            tasks = [t for t in tasks if t.id not in pending_set]
-
-            for tid in pending_real_ids:
-                lt = local_by_id.get(tid)
-                if lt and lt.completed == completed_key:
-                    tasks.insert(0, lt)
-
-        # 3) keep optimistic create placeholders (negative IDs) at top of Pending list
-        if completed_key is False:
-            temp_tasks = [t for t in self._cache[False] if t.id < 0]
-            if temp_tasks:
-                tasks = temp_tasks + tasks
-
-        return tasks
+            snapshot.tasks[key] = [
+                Task(t.id, t.subject, t.completed, t.created_at)
+                for t in self._index.tasks(key)
+                if t.id > 0
+            ]
+            snapshot.has_more[key] = self._has_more[key]
+            # Unconfirmed deltas come back with the outbox journal, not the snapshot.
+            snapshot.counts[key] = self._server_counts[key]
+        return snapshot
+
+    def _reapply(self, entry: OutboxEntry) -> None:
+        tid = entry.task_id
+        if entry.delete:
+            self._index.remove(tid)
+            self._pending_delete_ids.add(tid)
+            self._pending_ids.add(tid)
+            return
+
+        task = self._index.get(tid)
+        if task is None:
+            return  # not cached: the replay lands before anyone sees it
+        if entry.completed is not None and task.completed != entry.completed:
+            task.completed = entry.completed
+            self._index.move(tid, entry.completed)
+        if entry.subject is not None:
+            task.subject = entry.subject
+            self._index.reindex(tid)
+        self._pending_ids.add(tid)
+
+    def _request_reload(self) -> None:
+        self._reload_needed = True
+
+    def _journal_outbox(self) -> None:
+        """
+        Offline, the journal follows the outbox; once online it's kept in step until the
+        replayed writes are confirmed (then removed). Online sessions don't touch disk.
+        """
+        if self._journal is None:
+            return
+        if not (self._offline or self._journaled or self._journal_writing):
+            return
+        self._journal_dirty = True
+        if not self._journal_writing:
+            self._journal_writing = True
+            self._schedule(self._write_journal)
+
+    async def _write_journal(self) -> None:
+        # One writer at a time, so an older copy never lands after a newer one.
+        try:
+            while self._journal_dirty and self._journal is not None:
+                self._journal_dirty = False
+                # Encoded here (loop thread): entries are mutated in place.
+                entries = self._in_flight_entries + self._outbox.entries()
+                data = self._journal.encode(entries)
+                try:
+                    await metrics.to_thread(self._journal.write, data)
+                    self._journaled = bool(entries)
+                except OSError as ex:
+                    logger.warning("Could not write outbox journal: %s", ex)
+        finally:
+            self._journal_writing = False
+
+    def _remap(self, temp_id: int, real_id: int) -> None:
+        """Ops queued against a placeholder while its create was in flight follow the real row."""
+        if temp_id not in self._outbox:
+            return
+        self._outbox.remap(temp_id, real_id)
+        self._pending_ids.add(real_id)
+        if temp_id in self._pending_delete_ids:
+            self._pending_delete_ids.add(real_id)
+
+    def _forget_description(self, task_id: int) -> None:
+        if task_id not in self._description_writes:
+            self._descriptions.pop(task_id)
+
+    def _go_offline(self) -> None:
+        if not self._offline:
+            self._offline = True
+            self._notify(status=True)
+        if not self._retry_scheduled:
+            self._retry_scheduled = True
+            self._schedule(self._retry_later)
+
+    def _go_online(self) -> None:
+        if not self._offline:
+            return
+        self._offline = False
+        self._next_retry_delay = self.retry_delay
+        self._notify(status=True)
+        self._request_flush()
+        # Catch up with what other sessions did meanwhile.
+        if self._has_baseline:
+            self.sync_changes()
+        else:
+            self.warm_cache_both()
+
+    def _request_flush(self) -> None:
+        # Offline (or replaying), the journal follows the outbox.
+        self._journal_outbox()
+        # Offline, the retry loop owns flushing (no storm of doomed attempts).
+        if self._offline:
+            self._notify(status=True)
+            return
+        if self._flush_scheduled or self._flushing or not len(self._outbox):
+            return
+        self._flush_scheduled = True
+        self._schedule(self._flush_outbox)
+
+    def _same_rows(self, completed_key: bool, entries: List[Tuple[Task, SortKey]]) -> bool:
+        """True if `entries` would render exactly like the tab does now (no lists built)."""
+        current = self._index.tasks(completed_key)
+        if len(entries) != len(current):
+            return False
+        for (t, _), c in zip(entries, current):
+            if t.id != c.id or t.subject != c.subject or t.completed != c.completed:
+                return False
+        return True
+
+    def _page_limit(self, key: bool) -> int:
+        # Refreshes re-read everything the user already scrolled through (at least one page).
+        return max(self.page_size, self._index.count(key))
+
+    def _set_page_state(self, key: bool, page: TaskPage) -> None:
+        self._cursor[key] = page.next_cursor
+        self._has_more[key] = page.next_cursor is not None
+
+    def _in_loaded_window(self, completed_key: bool, task: Task) -> bool:
+        # Rows past the last loaded one belong to pages the user hasn't scrolled to.
+        cursor = self._cursor[completed_key]
+        if cursor is None:
+            return True
+        return self._index.server_key(task) <= self._index.key_for(cursor.created_at, cursor.id)
+
+    def _apply_changes(self, changes: TaskChanges) -> bool:
+        """Applies server deltas; local pending overrides win. Returns True if anything moved."""
+        changed = False
+
+        for t in changes.upserts:
+            # The row changed, maybe its description too (rows don't carry it).
+            self._forget_description(t.id)
+            if t.id in self._pending_ids:
+                continue
+
+            tab = t.completed
+            current = self._index.get(t.id)
+            if (
+                current is not None
+                and self._index.tab_of(t.id) == tab
+                and current.subject == t.subject
+            ):
+                continue  # e.g. the echo of our own write: keep the row where it is
+
+            if self._in_loaded_window(tab, t):
+                self._index.insert(tab, t)
+                changed = True
+            elif current is not None:
+                self._index.remove(t.id)
+                changed = True
+
+        for tid in changes.deleted_ids:
+            self._forget_description(tid)
+            if tid in self._pending_ids:
+                continue
+            if self._index.remove(tid):
+                changed = True
+
+        return changed
+
+    @metrics.timed("store.merge")
+    def _merge_with_local_overrides(
+        self, completed_key: bool, server_tasks: List[Task]
+    ) -> List[Tuple[Task, SortKey]]:
+        """
+        Server rows keep server order; local overrides keep their current slot.
+        Cost is O(len(server_tasks) + len(pending_ids)), independent of cache size.
+        """
+        pending = self._pending_ids
+        # Refreshes mostly re-read known rows: keep their keys instead of rebuilding them.
+        server_key = self._index.refreshed_key
+
+        # 1) never resurrect pending-deleted tasks, and
+        # 2) for pending toggles/edits/creates, prefer local state
+        entries = [(t, server_key(t)) for t in server_tasks if t.id not in pending]
+        server_rows = len(entries)
+
+        for tid in pending:
+            if tid in self._pending_delete_ids:
+                continue
+            local = self._index.get(tid)
+            key = self._index.key_of(tid)
+            if local is not None and key is not None and self._index.tab_of(tid) == completed_key:
+                entries.append((local, key))
+
+        # 3) optimistic create placeholders (negative IDs) are pending too, so they
+        #    stay pinned at the top of the Pending list. Server rows already come in
+        #    key order, so without overrides there's nothing to sort.
+        if len(entries) != server_rows:
+            entries.sort(key=itemgetter(1))
+        return entries
+
+    def _apply_merged(self, completed_key: bool, entries: List[Tuple[Task, SortKey]]) -> bool:
+        if self._same_rows(completed_key, entries):
+            return False
+        self._index.replace_tab(completed_key, entries)
+        return True
 
     # -------------------------
     # Refresh coroutines
     # -------------------------
+    @metrics.timed("store.warm_cache_both")
     async def _warm_cache_both(self) -> None:
         self._refresh_seq += 1
         token_pending = self._refresh_seq
@@ -203,27 +1122,46 @@ class TaskStore:
 
         self._refresh_token[False] = token_pending
         self._refresh_token[True] = token_completed
+        # This load covers both tabs: single-tab refreshes in flight are obsolete.
+        self._jobs.cancel(("refresh", False))
+        self._jobs.cancel(("refresh", True))
 
         self._refreshing_tabs.add(False)
         self._refreshing_tabs.add(True)
-        self._notify()
+        self._notify(tabs=(False, True))
 
         try:
-            pending_task = asyncio.to_thread(self.service.get_tasks, False)
-            completed_task = asyncio.to_thread(self.service.get_tasks, True)
-            server_pending, server_completed = await asyncio.gather(pending_task, completed_task)
+            # First page of each tab, both counts and the revision in one round trip.
+            overview = await _call(
+                self.service.get_overview, self._page_limit(False), self._page_limit(True)
+            )
 
             if self._refresh_token[False] != token_pending or self._refresh_token[True] != token_completed:
                 return
 
-            new_pending = self._merge_with_local_overrides(False, server_pending)
-            new_completed = self._merge_with_local_overrides(True, server_completed)
+            pending_page = overview.pages[False]
+            completed_page = overview.pages[True]
+            self._set_page_state(False, pending_page)
+            self._set_page_state(True, completed_page)
+            self._revision = overview.revision
+            self._set_server_counts(overview.counts)
+            self._has_baseline = True
+            # Full loads don't say which rows changed: re-read descriptions on demand.
+            for tid in self._descriptions.keys():
+                self._forget_description(tid)
+
+            self._apply_merged(False, self._merge_with_local_overrides(False, pending_page.tasks))
+            self._apply_merged(True, self._merge_with_local_overrides(True, completed_page.tasks))
+
+        except DatabaseUnavailable:
+            # Keep showing the snapshot; the reconnect probe loads again.
+            self._go_offline()
 
-            if self._tasks_signature(new_pending) != self._tasks_signature(self._cache[False]):
-                self._cache[False] = new_pending
+        except (QueryTimeout, PoolTimeout) as ex:
+            self._error(f"Loading tasks took too long. ({ex})")
 
-            if self._tasks_signature(new_completed) != self._tasks_signature(self._cache[True]):
-                self._cache[True] = new_completed
+        except StorageSetupError as ex:
+            self._error(f"The database can't be used. ({ex})")
 
         finally:
             if self._refresh_token[False] == token_pending:
@@ -231,100 +1169,400 @@ class TaskStore:
             if self._refresh_token[True] == token_completed:
                 self._refreshing_tabs.discard(True)
 
-            self._notify()
+            self._notify(tabs=(False, True))
+
+    async def _save_snapshot_later(self) -> None:
+        # Debounced: a burst of edits costs one write.
+        await asyncio.sleep(self.snapshot_delay)
+        self._snapshot_scheduled = False
+        if self._snapshot is None:
+            return
+        # Built here (loop thread) since tasks are mutated in place; encoded off-thread.
+        snapshot = self._build_snapshot()
+        try:
+            await metrics.to_thread(self._snapshot.save, snapshot)
+        except OSError as ex:
+            logger.warning("Could not save task snapshot: %s", ex)
 
+    @metrics.timed("store.refresh_tab")
     async def _refresh_tab_from_db(self, completed_key: bool, token: int) -> None:
         try:
-            server_tasks = await asyncio.to_thread(self.service.get_tasks, completed_key)
+            page = await _call(
+                self.service.get_tasks_page, completed_key, self._page_limit(completed_key)
+            )
 
             if self._refresh_token[completed_key] != token:
                 return
 
-            merged = self._merge_with_local_overrides(completed_key, server_tasks)
+            self._set_page_state(completed_key, page)
+            merged = self._merge_with_local_overrides(completed_key, page.tasks)
 
-            if self._tasks_signature(merged) != self._tasks_signature(self._cache[completed_key]):
-                self._cache[completed_key] = merged
+            if self._apply_merged(completed_key, merged):
                 self._notify()
 
+        except DatabaseUnavailable:
+            self._go_offline()
+
+        except (QueryTimeout, PoolTimeout) as ex:
+            self._error(f"Loading tasks took too long. ({ex})")
+
+        except StorageSetupError as ex:
+            self._error(f"The database can't be used. ({ex})")
+
         finally:
             if self._refresh_token[completed_key] == token:
                 self._refreshing_tabs.discard(completed_key)
-                self._notify()
+                self._notify(tabs=(completed_key,))
 
-    # -------------------------
-    # Persist coroutines (optimistic)
-    # -------------------------
-    async def _persist_create_task(self, title: str, temp_id: int) -> None:
+    @metrics.timed("store.sync_changes")
+    async def _sync_changes(self) -> None:
+        if self._syncing:
+            self._sync_again = True
+            return
+
+        self._syncing = True
         try:
-            created: Task = await asyncio.to_thread(self.service.add_task, title)
-            idx = next((i for i, t in enumerate(self._cache[False]) if t.id == temp_id), -1)
-            if idx != -1:
-                self._cache[False][idx] = created
+            while True:
+                self._sync_again = False
+                since = self._revision
+                changes = await _call(self.service.get_changes_since, since)
+
+                # A full load replaced the baseline meanwhile.
+                if self._revision != since:
+                    break
+                if changes.reset:
+                    # Deletes since our baseline were pruned: only a full load is exact.
+                    self.warm_cache_both()
+                    break
+
+                self._revision = changes.revision
+                self._set_server_counts(changes.counts)
+                if self._apply_changes(changes):
+                    self._notify()
+
+                if not self._sync_again:
+                    break
+
+        except DatabaseUnavailable:
+            self._go_offline()
 
         except Exception as ex:
-            idx = next((i for i, t in enumerate(self._cache[False]) if t.id == temp_id), -1)
-            if idx != -1:
-                self._cache[False].pop(idx)
-            self._error(f"Create failed. Rolled back. ({ex})")
+            self._error(f"Sync failed. ({ex})")
 
         finally:
-            self._pending_ids.discard(temp_id)
+            self._syncing = False
+
+    def _on_feed_event(self, event: TaskEvent) -> None:
+        # Listener thread: hop onto the store's loop.
+        self._schedule(self._apply_feed_event, event)
+
+    async def _apply_feed_event(self, event: TaskEvent) -> None:
+        if event.op == TaskEvent.RESYNC and self._offline:
+            # The listener reconnected, so the database is back: don't wait for the backoff.
+            self._request_probe()
+            return
+
+        if not self._revision:
+            return  # no baseline yet: the pending full load will include it
+
+        if event.op == TaskEvent.RESYNC or (event.op != "DELETE" and event.task is None):
+            self._jobs.submit(Priority.BACKGROUND, self._sync_changes)
+            return
+
+        # Applied like a delta, without moving the sync baseline: the next
+        # delta sync re-reads these rows and skips them as unchanged.
+        changes = TaskChanges(
+            upserts=[event.task] if event.task is not None else [],
+            deleted_ids=[event.task_id] if event.op == "DELETE" else [],
+            revision=self._revision,
+        )
+        if self._apply_changes(changes):
             self._notify()
 
-    async def _persist_delete_task(self, removed: Task, key: bool, original_index: int) -> None:
+    @metrics.timed("store.load_more")
+    async def _load_more_from_db(
+        self, completed_key: bool, cursor: Optional[PageCursor], token: int
+    ) -> None:
         try:
-            await asyncio.to_thread(self.service.delete_task, removed.id)
+            page = await _call(
+                self.service.get_tasks_page, completed_key, self.page_size, cursor
+            )
+
+            # A refresh started meanwhile: its result supersedes this page.
+            if self._refresh_token[completed_key] != token:
+                return
+
+            self._set_page_state(completed_key, page)
+
+            for t in page.tasks:
+                if t.id in self._index or t.id in self._pending_ids:
+                    continue
+                self._index.insert(completed_key, t)
+
+        except DatabaseUnavailable:
+            self._go_offline()
 
         except Exception as ex:
-            insert_at = min(max(original_index, 0), len(self._cache[key]))
-            self._cache[key].insert(insert_at, removed)
-            self._error(f"Delete failed. Rolled back. ({ex})")
+            self._error(f"Could not load more tasks. ({ex})")
 
         finally:
-            self._pending_delete_ids.discard(removed.id)
-            self._pending_ids.discard(removed.id)
-            self._notify()
+            self._loading_more.discard(completed_key)
+            self._notify(tabs=(completed_key,))
 
-    async def _persist_toggle_completed(
-        self,
-        task_id: int,
-        new_completed: bool,
-        old_completed: bool,
-        from_key: bool,
-        from_idx: int,
-        to_key: bool,
-    ) -> None:
+    # -------------------------
+    # Search coroutines
+    # -------------------------
+    async def _search_later(self, seq: int) -> None:
+        await asyncio.sleep(self.search_delay)
+        if seq == self._search_seq:
+            # A newer query cancels the previous one's statement instead of waiting it out.
+            await self._jobs.run(Priority.READ, self._run_search, seq, 0, key="search", supersede=True)
+
+    @metrics.timed("store.search")
+    async def _run_search(self, seq: int, offset: int) -> None:
+        query, tab, revision = self._search_query, self._search_tab, self._revision
         try:
-            await asyncio.to_thread(self.service.toggle_completed, task_id, new_completed)
+            page = await _call(self.service.search, query, tab, self.page_size, offset)
+
+        except DatabaseUnavailable:
+            if seq == self._search_seq:
+                # Offline: the rows already loaded are better than nothing.
+                self._search_page = TaskSearchPage(tasks=self.filter_tasks(query, tab), next_offset=None)
+                self._search_loading = False
+                self._notify(search=True)
+            self._go_offline()
+            return
+
+        except Exception as ex:
+            if seq == self._search_seq:
+                self._search_loading = False
+                self._notify(search=True)
+                self._error(f"Search failed. ({ex})")
+            return
+
+        if seq != self._search_seq:
+            return  # superseded by a newer query
+        if offset and self._search_page is not None:
+            page = TaskSearchPage(tasks=self._search_page.tasks + page.tasks, next_offset=page.next_offset)
+        self._search_page = page
+        self._search_loading = False
+        self._search_cache.put((revision, query, tab), page)
+        self._notify(search=True)
 
+    # -------------------------
+    # Description coroutines
+    # -------------------------
+    @metrics.timed("store.load_descriptions")
+    async def _load_descriptions(self, task_ids: List[int]) -> None:
+        try:
+            found = await _call(self.service.get_descriptions, task_ids)
+        except DatabaseUnavailable:
+            self._go_offline()
+            self._descriptions_failed.update(task_ids)
+            found = {}
         except Exception as ex:
-            dst_idx = next((i for i, t in enumerate(self._cache[to_key]) if t.id == task_id), -1)
-            task = self._cache[to_key].pop(dst_idx) if dst_idx != -1 else None
+            self._error(f"Could not load the description. ({ex})")
+            self._descriptions_failed.update(task_ids)
+            found = {}
+        finally:
+            self._descriptions_loading.difference_update(task_ids)
 
-            if task:
-                task.completed = old_completed
-                insert_at = min(max(from_idx, 0), len(self._cache[from_key]))
-                self._cache[from_key].insert(insert_at, task)
+        for tid, text in found.items():
+            if tid not in self._description_writes:  # a local edit is newer
+                self._descriptions.put(tid, text)
+        self._notify(ids=task_ids)
 
-            self._error(f"Update failed. Rolled back. ({ex})")
+    async def _persist_description(self, task_id: int, description: str, old: Optional[str]) -> None:
+        try:
+            await _call(self.service.update_description, task_id, description)
+        except Exception as ex:
+            if isinstance(ex, DatabaseUnavailable):
+                self._go_offline()
+            if self._descriptions.get(task_id) == description:
+                if old is None:
+                    self._descriptions.pop(task_id)
+                else:
+                    self._descriptions.put(task_id, old)
+            self._error(f"Description not saved. Rolled back. ({ex})")
+        finally:
+            left = self._description_writes.get(task_id, 1) - 1
+            if left:
+                self._description_writes[task_id] = left
+            else:
+                self._description_writes.pop(task_id, None)
+            self._notify(ids=(task_id,))
+
+    # -------------------------
+    # Persist coroutines (optimistic)
+    # -------------------------
+    async def _flush_outbox(self) -> None:
+        # Short window so bursts (double toggles, repeated edits) compact first;
+        # a longer one when the pool was saturated.
+        await asyncio.sleep(self.retry_delay if self._pool_busy else self.flush_window)
+        self._flush_scheduled = False
 
+        if self._offline:
+            return
+        # Holds off other flushes (one batch in flight) while waiting for a slot.
+        self._flushing = True
+        try:
+            await self._jobs.run(Priority.WRITE, self._send_outbox)
         finally:
-            self._pending_ids.discard(task_id)
-            self._notify()
+            if self._flushing:  # nothing was sent
+                self._flushing = False
+                self._request_flush()
+
+    async def _send_outbox(self) -> None:
+        batch, entries = self._outbox.drain()
+        if batch.is_empty():
+            return
+        counts_seq = self._counts_seq
+
+        started = time.perf_counter()
+        self._in_flight_entries = entries
+        ids = [e.task_id for e in entries]
+        self._in_flight_ids.update(ids)
+        self._notify(ids=ids)
 
-    async def _persist_update_subject(self, task_id: int, new_subject: str, old_subject: str) -> None:
         try:
-            await asyncio.to_thread(self.service.update_subject, task_id, new_subject)
+            result = await _call(self.service.apply_batch, batch)
+
+        except DatabaseUnavailable:
+            # Nothing was written: keep every op (and its optimistic state) for later.
+            for entry in entries:
+                entry.offline = True
+            self._outbox.requeue(entries)
+            self._go_offline()
+
+        except PoolTimeout:
+            # Reachable but saturated: nothing was sent, try again shortly.
+            self._outbox.requeue(entries)
+            self._pool_busy = True
 
         except Exception as ex:
-            # Rollback
-            found = self._find_anywhere(task_id)
-            if found:
-                key, idx = found
-                self._cache[key][idx].subject = old_subject
+            # The transaction rolled back as a whole: undo every op in it.
+            for entry in reversed(entries):
+                entry.rollback()
+                self._settle_counts(entry.count_delta, False, counts_seq)
+            self._error(f"{self._describe_failure(entries)} Rolled back. ({ex})")
+
+        else:
+            self._pool_busy = False
+            failed: List[OutboxEntry] = []
+            for entry in entries:
+                if entry.is_create:
+                    created = result.created.get(entry.task_id)
+                    # Takes the placeholder's slot, so the row doesn't jump.
+                    if created is not None:
+                        self._index.replace(entry.task_id, created)
+                        self._remap(entry.task_id, created.id)
+                elif entry.task_id in result.missing_ids and not entry.delete:
+                    # (A delete that matched nothing already has the state it wanted.)
+                    failed.append(entry)
+
+            for entry in entries:
+                self._settle_counts(entry.count_delta, entry not in failed, counts_seq)
+            for entry in failed:
+                entry.rollback()
+            if failed:
+                reason = "deleted elsewhere" if any(e.offline for e in failed) else "Task not found."
+                self._error(f"{self._describe_failure(failed)} Rolled back. ({reason})")
+
+        finally:
+            self._search_cache.clear()  # our own writes don't move the synced revision
+            self._flushing = False
+            self._in_flight_entries = []
+            self._in_flight_ids.difference_update(ids)
+            for tid in ids:
+                self._settle(tid)
+            self._notify(ids=ids, status=True)
+            self._confirm_counts()
+            self._request_flush()
+            if self._reload_needed:
+                self._reload_needed = False
+                self.warm_cache_both()
+            metrics.observe("store.flush_outbox", time.perf_counter() - started)
+
+    @metrics.timed("store.persist_bulk")
+    async def _persist_bulk(self, op: _BulkOp, fn: Callable[..., Any], args: Tuple[Any, ...]) -> None:
+        ids = list(op.undo)
+        failed: Set[int] = set(ids)
+        queue_later = False
+        counts_seq = self._counts_seq
+        try:
+            result = await _call(fn, *args)
+            failed = op.on_done(result) if op.on_done else set()
+            for tid in failed:
+                op.undo[tid]()
+            if failed:
+                self._error(f"{op.label} failed for {len(failed)} task(s). Rolled back. (Task not found.)")
+
+        except DatabaseUnavailable as ex:
+            self._undo_bulk(op)
+            if op.fallback is not None:
+                queue_later = True
+            else:
+                self._error(f"{op.label} failed. Rolled back. ({ex})")
+            self._go_offline()
+
+        except PoolTimeout as ex:
+            # Nothing ran: the outbox retries it (still online) after a short delay.
+            self._undo_bulk(op)
+            self._pool_busy = True
+            if op.fallback is not None:
+                queue_later = True
+            else:
+                self._error(f"{op.label} failed. Rolled back. ({ex})")
 
-            self._error(f"Update failed. Rolled back. ({ex})")
+        except Exception as ex:
+            # One statement, one rollback unit.
+            self._undo_bulk(op)
+            self._error(f"{op.label} failed. Rolled back. ({ex})")
 
         finally:
-            self._pending_ids.discard(task_id)
-            self._notify()
+            self._search_cache.clear()
+            for tid in ids:
+                self._settle_counts(op.deltas.get(tid, {}), tid not in failed, counts_seq)
+            self._in_flight_ids.difference_update(ids)
+            for tid in ids:
+                self._settle(tid)
+            self._notify(ids=ids)
+            self._confirm_counts()
+
+        if queue_later and op.fallback is not None:
+            # Same change through the outbox (journaled while offline), replayed later.
+            op.fallback()
+
+    async def _retry_later(self) -> None:
+        await asyncio.sleep(self._next_retry_delay)
+        self._next_retry_delay = min(self._next_retry_delay * 2, self.max_retry_delay)
+        self._retry_scheduled = False
+        if self._offline:
+            await self._jobs.run(Priority.BACKGROUND, self._probe_connection, key="probe")
+
+    async def _cancel_reads(self) -> None:
+        self._jobs.cancel_reads()
+
+    def _request_probe(self) -> None:
+        self._jobs.submit(Priority.BACKGROUND, self._probe_connection, key="probe")
+
+    async def _probe_connection(self) -> None:
+        try:
+            await _call(self.service.current_revision)
+        except DatabaseUnavailable:
+            self._go_offline()  # next attempt after a longer delay
+            return
+        except PoolTimeout:
+            pass  # every connection busy: the server is reachable
+        self._go_online()
+
+    @staticmethod
+    def _describe_failure(entries: List[OutboxEntry]) -> str:
+        if len(entries) > 1:
+            return f"{len(entries)} changes failed."
+        entry = entries[0]
+        if entry.is_create:
+            return "Create failed."
+        if entry.delete:
+            return "Delete failed."
+        return "Update failed."
@@ -0,0 +1,75 @@
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set
+
+from todoesvan.data.repositories.base import search_words
+
+_EMPTY: Set[int] = set()
+
+
+def _prefixes(words: Iterable[str]) -> Set[str]:
+    """The 1, 2 and 3-char prefixes of each word."""
+    keys: Set[str] = set()
+    for w in words:
+        keys.update(w[:n] for n in range(1, min(len(w), 3) + 1))
+    return keys
+
+
+class TextIndex:
+    """
+    Incremental word-prefix index over task subjects, for type-ahead filtering
+    without a scan. Same semantics as matches_terms and the server's search: every
+    term must prefix some word ("mi" and "milk" find "milk", "ilk" doesn't).
+      - postings are keyed by word prefixes of up to 3 chars; a longer term starts
+        from its 3-char prefix's postings and is verified against the words
+      - add() with an unchanged subject is a no-op, so full reloads stay cheap
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._words: Dict[int, str] = {}  # " " + lower-cased words joined by spaces
+        self._text: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._text)
+
+    def add(self, task_id: int, text: str) -> None:
+        if self._text.get(task_id) == text:
+            return
+        self.remove(task_id)
+        words = search_words(text)
+        self._text[task_id] = text
+        self._words[task_id] = " " + " ".join(words)
+        for key in _prefixes(words):
+            self._postings[key].add(task_id)
+
+    def remove(self, task_id: int) -> None:
+        if self._text.pop(task_id, None) is None:
+            return
+        for key in _prefixes(self._words.pop(task_id).split()):
+            ids = self._postings[key]
+            ids.discard(task_id)
+            if not ids:
+                del self._postings[key]
+
+    def search(self, terms: Iterable[str]) -> Set[int]:
+        """Ids whose subject matches every (lower-cased) term."""
+        plan = [term for term in terms if term]
+        if not plan:
+            return set()
+        # Most selective term first; the others only narrow its candidate set.
+        plan.sort(key=lambda term: len(self._postings.get(term[:3], _EMPTY)))
+
+        result: Optional[Set[int]] = None
+        for term in plan:
+            ids = self._postings.get(term[:3], _EMPTY)
+            result = set(ids) if result is None else result & ids
+            if len(term) > 3:
+                # Only the first 3 chars are indexed: check the word starts with the rest.
+                # (Terms have no spaces, so a match can't straddle two words.)
+                words = self._words
+                needle = " " + term
+                result = {tid for tid in result if needle in words[tid]}
+            if not result:
+                return set()
+        assert result is not None
+        return result
@@ -0,0 +1,20 @@
+import threading
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """
+    Loads .env into os.environ the first time a setting is needed (not at import,
+    so the first frame doesn't wait for it). Variables already set keep their value.
+    """
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            _loaded = True
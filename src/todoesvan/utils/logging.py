@@ -1,9 +1,12 @@
 import logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-)
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Root handler for the app and the CLIs (a no-op if one is already set up)."""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
 
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name)
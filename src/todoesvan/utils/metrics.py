@@ -0,0 +1,331 @@
+"""
+Named timing spans aggregated into histograms, exported in Prometheus text format.
+
+    with metrics.timer("store.flush_outbox"): ...
+    @metrics.timed("store.toggle_completed")
+    await metrics.to_thread(service.get_tasks_page, completed, limit)
+
+Point-in-time values (pool sizes, ...) are exported as gauges, read from the
+collectors passed to register_gauges() at each export.
+
+Disabled by default: timers then cost a flag check. Enable with TODOESVAN_METRICS=1
+(or enable()); TODOESVAN_METRICS_PORT serves /metrics over HTTP on localhost and
+TODOESVAN_METRICS_FILE rewrites a .prom file every TODOESVAN_METRICS_INTERVAL seconds.
+"""
+import asyncio
+import functools
+import inspect
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from todoesvan.utils.env import load_env
+from todoesvan.utils.logging import get_logger
+from todoesvan.utils.storage import atomic_write
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = get_logger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+T = TypeVar("T")
+
+# Seconds; covers in-memory ops (sub-ms) up to slow network round trips.
+BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+_enabled = False
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count", "errors")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * len(BUCKETS)  # non-cumulative; +Inf is `count`
+        self.total = 0.0
+        self.count = 0
+        self.errors = 0
+
+    def observe(self, seconds: float, error: bool = False) -> None:
+        i = bisect_left(BUCKETS, seconds)
+        if i < len(BUCKETS):
+            self.counts[i] += 1
+        self.total += seconds
+        self.count += 1
+        if error:
+            self.errors += 1
+
+
+Gauges = Callable[[], Dict[str, float]]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._spans: Dict[str, Histogram] = {}
+        self._gauges: Dict[str, Gauges] = {}
+
+    def observe(self, span: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            hist = self._spans.get(span)
+            if hist is None:
+                hist = self._spans[span] = Histogram()
+            hist.observe(seconds, error)
+
+    def register_gauges(self, prefix: str, collect: Gauges) -> None:
+        with self._lock:
+            self._gauges[prefix] = collect
+
+    def unregister_gauges(self, prefix: str) -> None:
+        with self._lock:
+            self._gauges.pop(prefix, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+    def render(self) -> str:
+        """Prometheus text exposition (one histogram family, labelled by span)."""
+        with self._lock:
+            spans = sorted(self._spans.items())
+            lines = [
+                "# HELP todoesvan_span_seconds Time spent in instrumented spans.",
+                "# TYPE todoesvan_span_seconds histogram",
+            ]
+            for span, hist in spans:
+                cumulative = 0
+                for bound, n in zip(BUCKETS, hist.counts):
+                    cumulative += n
+                    lines.append(f'todoesvan_span_seconds_bucket{{span="{span}",le="{bound}"}} {cumulative}')
+                lines.append(f'todoesvan_span_seconds_bucket{{span="{span}",le="+Inf"}} {hist.count}')
+                lines.append(f'todoesvan_span_seconds_sum{{span="{span}"}} {hist.total:.9f}')
+                lines.append(f'todoesvan_span_seconds_count{{span="{span}"}} {hist.count}')
+
+            lines.append("# HELP todoesvan_span_errors_total Instrumented spans that raised.")
+            lines.append("# TYPE todoesvan_span_errors_total counter")
+            for span, hist in spans:
+                lines.append(f'todoesvan_span_errors_total{{span="{span}"}} {hist.errors}')
+            gauges = sorted(self._gauges.items())
+
+        # Collectors take their own locks: called outside the registry's.
+        for prefix, collect in gauges:
+            try:
+                values = collect()
+            except Exception:
+                logger.exception("Metrics collector %r failed", prefix)
+                continue
+            for field, value in sorted(values.items()):
+                name = f"todoesvan_{prefix}_{field}"
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+# -------------------------
+# Switch
+# -------------------------
+def enable() -> None:
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+# -------------------------
+# Gauges
+# -------------------------
+def register_gauges(prefix: str, collect: Gauges) -> None:
+    """Exports collect()'s values as todoesvan_<prefix>_<name> gauges (replaces `prefix`)."""
+    REGISTRY.register_gauges(prefix, collect)
+
+
+def unregister_gauges(prefix: str) -> None:
+    REGISTRY.unregister_gauges(prefix)
+
+
+# -------------------------
+# Spans
+# -------------------------
+def observe(span: str, seconds: float, error: bool = False) -> None:
+    if _enabled:
+        REGISTRY.observe(span, seconds, error)
+
+
+@contextmanager
+def _timer(span: str) -> Iterator[None]:
+    start = time.perf_counter()
+    error = False
+    try:
+        yield
+    except BaseException:
+        error = True
+        raise
+    finally:
+        REGISTRY.observe(span, time.perf_counter() - start, error)
+
+
+class _NoopTimer:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NOOP = _NoopTimer()
+
+
+def timer(span: str) -> Any:
+    """Context manager timing its block (a shared no-op when disabled)."""
+    return _timer(span) if _enabled else _NOOP
+
+
+def timed(span: str) -> Callable[[F], F]:
+    """Decorator for sync functions and coroutine functions."""
+
+    def decorate(fn: F) -> F:
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not _enabled:
+                    return await fn(*args, **kwargs)
+                with _timer(span):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _timer(span):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+async def to_thread(fn: Callable[..., T], *args: Any) -> T:
+    """asyncio.to_thread that also records how long the call waited for a worker."""
+    if not _enabled:
+        return await asyncio.to_thread(fn, *args)
+
+    submitted = time.perf_counter()
+
+    def run() -> T:
+        REGISTRY.observe("thread.queue_wait", time.perf_counter() - submitted)
+        return fn(*args)
+
+    return await asyncio.to_thread(run)
+
+
+class InstrumentedRepository:
+    """Proxy timing every public method of a repository as `repo.<method>`."""
+
+    def __init__(self, inner: Any):
+        self._inner = inner
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._inner, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+        wrapped = timed(f"repo.{name}")(attr)
+        setattr(self, name, wrapped)  # cache: later lookups skip __getattr__
+        return wrapped
+
+
+# -------------------------
+# Export
+# -------------------------
+def render() -> str:
+    return REGISTRY.render()
+
+
+def write_file(path: Path) -> None:
+    with atomic_write(path) as f:
+        f.write(render().encode("utf-8"))
+
+
+def start_file_writer(path: Path, interval: float = 15.0) -> threading.Thread:
+    def loop() -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                write_file(path)
+            except OSError as ex:
+                logger.warning("Could not write metrics to %s: %s", path, ex)
+
+    thread = threading.Thread(target=loop, name="metrics-file", daemon=True)
+    thread.start()
+    return thread
+
+
+def serve(port: int, host: str = "127.0.0.1") -> "ThreadingHTTPServer":
+    # http.server pulls in email/html/mimetypes: imported only when metrics are served.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return  # scrapes every few seconds would flood the app log
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    logger.info("Serving metrics on http://%s:%d/metrics", host, server.server_address[1])
+    return server
+
+
+def configure_from_env() -> None:
+    """Applies the TODOESVAN_METRICS* variables (call once, before the repository is built)."""
+    load_env()
+    if os.getenv("TODOESVAN_METRICS", "").strip().lower() not in ("1", "true", "yes", "on"):
+        return
+    enable()
+
+    port: Optional[str] = os.getenv("TODOESVAN_METRICS_PORT")
+    if port:
+        serve(int(port))
+
+    path = os.getenv("TODOESVAN_METRICS_FILE")
+    if path:
+        interval = float(os.getenv("TODOESVAN_METRICS_INTERVAL", "15"))
+        start_file_writer(Path(path), interval)
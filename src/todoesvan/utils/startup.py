@@ -0,0 +1,119 @@
+"""
+Startup timing: how long the app takes to import, draw its first frame and show
+data from the database.
+
+At runtime, milestones are measured from the moment this module is imported (the
+first import in main.py) and logged once when the first data arrives. They're also
+recorded as startup.* metric spans. To get the import cost of each module on the
+startup path, use the CLI:
+
+    PYTHONPATH=src python -m todoesvan.utils.startup          # slowest imports
+    PYTHONPATH=src python -m todoesvan.utils.startup --check  # exit 1 if a deferred module is imported
+
+--check fails when a module that should load only after the first frame (dotenv, the
+database drivers and the modules using them) has been pulled into the startup imports.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from todoesvan.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_START = time.perf_counter()
+
+MILESTONES = ("imports", "first_frame", "first_data")
+
+# Loaded on first use, after the first frame; importing them at startup is a regression.
+DEFERRED_MODULES = (
+    "dotenv",
+    "psycopg2",
+    "todoesvan.data.database",
+    "todoesvan.data.migrate",
+    "todoesvan.data.repositories.postgres_repository",
+    "todoesvan.data.repositories.sqlite_repository",
+)
+
+_marks: Dict[str, float] = {}
+
+
+def mark(milestone: str) -> None:
+    """Records the first time `milestone` is reached (later sessions don't count)."""
+    if milestone in _marks:
+        return
+    _marks[milestone] = time.perf_counter() - _START
+    if milestone == MILESTONES[-1]:
+        _report()
+
+
+def elapsed() -> Dict[str, float]:
+    """Seconds from startup to each milestone reached so far."""
+    return dict(_marks)
+
+
+def _report() -> None:
+    from todoesvan.utils import metrics
+
+    for name, seconds in _marks.items():
+        metrics.observe(f"startup.{name}", seconds)
+    logger.info(
+        "Startup: %s",
+        ", ".join(f"{name} {_marks[name] * 1000:.0f} ms" for name in MILESTONES if name in _marks),
+    )
+
+
+# -------------------------
+# Import profile (CLI)
+# -------------------------
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)\s*$")
+
+
+def import_profile(module: str = "main") -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for every import made by `import <module>`."""
+    src = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src, os.getenv("PYTHONPATH")])))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    rows: List[Tuple[str, int, int]] = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            rows.append((match.group(3), int(match.group(1)), int(match.group(2))))
+    return rows
+
+
+def main(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main", help="entry module to import (default: main)")
+    parser.add_argument("--top", type=int, default=25, help="rows to show")
+    parser.add_argument("--check", action="store_true", help="fail if a deferred module is imported")
+    args = parser.parse_args(argv)
+
+    rows = import_profile(args.module)
+    total = sum(self_us for _, self_us, _ in rows)
+    print(f"{'module':<56} {'self ms':>9} {'cumulative ms':>14}")
+    for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[2], reverse=True)[: args.top]:
+        print(f"{name:<56} {self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}")
+    print(f"\n{len(rows)} modules, {total / 1000:.1f} ms importing {args.module}")
+
+    imported = {name for name, _, _ in rows}
+    eager = [m for m in DEFERRED_MODULES if m in imported]
+    if eager:
+        print(f"Imported at startup but meant to be deferred: {', '.join(eager)}")
+    return 1 if args.check and eager else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
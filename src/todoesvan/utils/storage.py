@@ -0,0 +1,54 @@
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+APP_NAME = "todoesvan"
+
+
+def data_dir() -> Path:
+    """
+    Per-user directory for local app files (created on first use):
+      - TODOESVAN_DATA_DIR if set
+      - FLET_APP_STORAGE_DATA (set by packaged Flet apps)
+      - otherwise the platform's usual user data dir
+    """
+    override = os.getenv("TODOESVAN_DATA_DIR") or os.getenv("FLET_APP_STORAGE_DATA")
+    if override:
+        path = Path(override)
+    elif sys.platform == "win32":
+        path = Path(os.getenv("LOCALAPPDATA") or Path.home() / "AppData" / "Local") / APP_NAME
+    elif sys.platform == "darwin":
+        path = Path.home() / "Library" / "Application Support" / APP_NAME
+    else:
+        path = Path(os.getenv("XDG_DATA_HOME") or Path.home() / ".local" / "share") / APP_NAME
+
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+@contextmanager
+def atomic_write(path: Path, fsync: bool = False) -> Iterator[BinaryIO]:
+    """
+    Binary file that replaces `path` once fully written (temp file + rename). The temp
+    name is unique, so two writers of the same path (sessions, processes) never mix.
+    """
+    # tempfile costs ~20 ms to import: only paid on the first write, not at startup.
+    import tempfile
+
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
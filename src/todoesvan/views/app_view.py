@@ -1,5 +1,6 @@
 from flet import Page
 
+from todoesvan.utils import startup
 from todoesvan.utils.assets import asset_path
 from todoesvan.views.home_view import HomeView
 
@@ -23,6 +24,7 @@ class MainView:
         self.page.views.clear()
         self.page.views.append(HomeView(self.page))
         self.page.update()
+        startup.mark("first_frame")
 
 
 def main(page: Page) -> None:
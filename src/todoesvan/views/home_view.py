@@ -1,12 +1,24 @@
+import os
+from typing import List, Set
+
 import flet as ft
 
 from todoesvan.components.atoms.add_button import AddButton
+from todoesvan.components.atoms.search_box import SearchBox
+from todoesvan.components.atoms.status_banner import StatusBanner
 from todoesvan.components.atoms.todo_input import TodoInput
 from todoesvan.components.atoms.todo_tabs import TodoTabs
+from todoesvan.components.molecules.bulk_actions import BulkActionsBar
+from todoesvan.components.organisms.task_details import TaskDetailsSheet
 from todoesvan.components.organisms.todo_list import TodoList
-from todoesvan.data.repositories.task_repository import TaskRepository
-from todoesvan.services.task_service import TaskService
-from todoesvan.state.task_store import TaskStore
+from todoesvan.data.change_feed import get_change_feed
+from todoesvan.data.repositories.factory import storage_engine
+from todoesvan.services.task_service import AsyncTaskService
+from todoesvan.state.journal import OutboxJournal
+from todoesvan.state.snapshot import SnapshotFile
+from todoesvan.state.task_store import ChangeSet, TaskStore
+from todoesvan.utils import metrics, startup
+from todoesvan.utils.storage import data_dir
 from todoesvan.utils.theme import AppColors
 
 
@@ -15,39 +27,81 @@ class HomeView(ft.View):
         super().__init__(route="/", padding=20, bgcolor=AppColors.BG_PRIMARY)
         self.page = page
 
-        # Data
-        repo = TaskRepository()
-        service = TaskService(repo)
+        # Data (the repository is opened lazily, by the first load)
+        service = AsyncTaskService()
 
         # UI
         self.input_atom = TodoInput(on_submit_action=self.trigger_add)
         self.tabs_atom = TodoTabs(on_change_tab=self.handle_tab_change)
         self.button_atom = AddButton(on_click_action=self.trigger_add)
+        self.status_atom = StatusBanner()
+        self.search_atom = SearchBox(on_search=self.search)
 
         self.todo_list_atom = TodoList(
             on_delete_task=self.delete_task,
             on_status_change=self.change_status,
             on_update_subject=self.update_subject,
+            on_load_more=self.load_more,
+            on_selection_change=self._on_selection_change,
+            on_open_details=self.open_details,
+            on_window_change=self._on_window_change,
+            # Process environment only: .env isn't read before the first frame.
+            virtualized=os.getenv("TASK_LIST_VIRTUALIZED", "0") == "1",
+        )
+
+        self.bulk_bar = BulkActionsBar(
+            on_toggle_selecting=self.toggle_selecting,
+            on_select_all=self.todo_list_atom.select_all,
+            on_set_completed=self.bulk_set_completed,
+            on_delete_selected=self.bulk_delete,
+            on_clear_completed=self.clear_completed,
+        )
+
+        self.details_sheet = TaskDetailsSheet(
+            on_save_description=self.update_description,
+            on_retry_description=self.retry_description,
         )
 
         # Store (cache + refresh + optimistic)
         self.store = TaskStore(
             service=service,
             schedule=self.page.run_task,
-            on_change=self._render_active,
+            on_change=self._on_store_change,
             on_error=self._snack,
+            snapshot=SnapshotFile(data_dir() / "tasks.snapshot.json.gz"),
+            # Desktop only: web sessions would share (and replay) each other's outboxes.
+            journal=None if page.web else OutboxJournal(data_dir() / "outbox.journal.json"),
         )
 
         self.controls = [
             ft.Text("My To-Do List", size=30, weight="bold", color=AppColors.TEXT_PRIMARY),
             ft.Row([self.input_atom, self.button_atom], vertical_alignment=ft.CrossAxisAlignment.START),
+            self.status_atom,
+            self.search_atom,
             self.tabs_atom,
+            self.bulk_bar,
             self.todo_list_atom,
         ]
 
-    def did_mount(self):
+    def did_mount(self) -> None:
         self._render_active()
-        self.store.warm_cache_both()
+        self._render_counts()
+        # Last known tasks and offline writes from a previous session are read off the
+        # loop (the empty shell renders first), then revalidated against the database.
+        self.store.load_local_state()
+        self.page.run_task(self._attach_change_feed)
+
+    async def _attach_change_feed(self) -> None:
+        # Only Postgres pushes changes. With SQLite or memory, writes by other sessions
+        # (web mode shares one database) show up at this session's next refresh.
+        # (storage_engine reads .env: kept off the UI thread.)
+        if await metrics.to_thread(storage_engine) == "postgres":
+            self.store.attach_change_feed(get_change_feed())
+
+    def will_unmount(self) -> None:
+        self.store.detach_change_feed()
+        self.store.cancel_reads()
+        self.store.save_snapshot()
 
     # -------------------------
     # UI helpers
@@ -60,21 +114,99 @@ class HomeView(ft.View):
     def _is_completed_tab(self) -> bool:
         return self.tabs_atom.selected_index == 1
 
+    def _sync_bulk_bar(self) -> None:
+        self.bulk_bar.set_state(
+            selecting=self.todo_list_atom.selecting,
+            selected_count=len(self.todo_list_atom.selected_ids),
+            completed_tab=self._is_completed_tab(),
+        )
+
+    def _on_selection_change(self, selected: Set[int]) -> None:
+        self._sync_bulk_bar()
+
+    def _on_window_change(self, task_ids: List[int]) -> None:
+        # Descriptions of the rows on screen, so opening one is usually instant.
+        self.store.prefetch_descriptions(task_ids)
+
+    def _on_store_change(self, changes: ChangeSet) -> None:
+        if self.store.loaded:
+            startup.mark("first_data")
+        # The hidden tab re-renders when it's selected (handle_tab_change).
+        if changes.search or changes.touches(self._is_completed_tab()):
+            self._render_active()
+        if changes.counts:
+            self._render_counts()
+        if changes.status:
+            self._render_status()
+        task_id = self.details_sheet.task_id
+        if task_id is not None and task_id in changes.ids:
+            self.details_sheet.set_description(
+                self.store.description(task_id), self.store.description_failed(task_id)
+            )
+            if self.details_sheet.page:
+                self.details_sheet.update()
+
+    def _render_counts(self) -> None:
+        self.tabs_atom.set_counts(self.store.count(False), self.store.count(True))
+
+    def _render_status(self) -> None:
+        self.status_atom.set_status(self.store.is_offline, self.store.queued_writes)
+
     def _render_active(self) -> None:
+        if self.store.search_query:
+            self.todo_list_atom.render_tasks(
+                self.store.search_results(),
+                pending_ids=self.store.pending_ids,
+                refreshing=self.store.is_search_loading(),
+                has_more=self.store.search_has_more(),
+            )
+            return
+
         key = self._is_completed_tab()
         self.todo_list_atom.render_tasks(
             self.store.tasks(key),
             pending_ids=self.store.pending_ids,
             refreshing=self.store.is_refreshing(key),
+            has_more=self.store.has_more(key),
+            loading_more=self.store.is_loading_more(key),
         )
 
     # -------------------------
     # Events
     # -------------------------
     def handle_tab_change(self, e: ft.ControlEvent) -> None:
+        # Search is per tab: rerun the query for the tab just selected.
+        self.store.search(self.search_atom.query, self._is_completed_tab())
         self._render_active()
+        self._sync_bulk_bar()
         self.store.refresh_tab(self._is_completed_tab())
 
+    def toggle_selecting(self) -> None:
+        self.todo_list_atom.set_selecting(not self.todo_list_atom.selecting)
+
+    def bulk_set_completed(self) -> None:
+        ids = self.todo_list_atom.selected_ids
+        self.todo_list_atom.set_selecting(False)
+        # Active tab -> mark done; Completed tab -> restore.
+        self.store.bulk_set_completed(list(ids), not self._is_completed_tab())
+
+    def bulk_delete(self) -> None:
+        ids = self.todo_list_atom.selected_ids
+        self.todo_list_atom.set_selecting(False)
+        self.store.bulk_delete(list(ids))
+
+    def clear_completed(self) -> None:
+        self.store.clear_completed()
+
+    def search(self, query: str) -> None:
+        self.store.search(query, self._is_completed_tab())
+
+    def load_more(self) -> None:
+        if self.store.search_query:
+            self.store.load_more_search()
+            return
+        self.store.load_more(self._is_completed_tab())
+
     def trigger_add(self, e: ft.ControlEvent) -> None:
         title = (self.input_atom.value or "").strip()
 
@@ -99,3 +231,23 @@ class HomeView(ft.View):
 
     def update_subject(self, task_id: int, subject: str) -> None:
         self.store.update_subject(task_id, subject)
+
+    def open_details(self, task_id: int) -> None:
+        task = self.store.task(task_id)
+        if task is None:
+            return
+        self.store.load_description(task_id)
+        self.details_sheet.show(
+            task, self.store.description(task_id), self.store.description_failed(task_id)
+        )
+        self.page.open(self.details_sheet)
+
+    def retry_description(self, task_id: int) -> None:
+        self.store.load_description(task_id)
+        self.details_sheet.set_description(
+            self.store.description(task_id), self.store.description_failed(task_id)
+        )
+        self.details_sheet.update()
+
+    def update_description(self, task_id: int, description: str) -> None:
+        self.store.update_description(task_id, description)
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Callable, Coroutine, Tuple
+
+from todoesvan.data.change_feed import TaskEvent
+from todoesvan.data.repositories.cached_repository import SharedCacheRepository
+from todoesvan.data.repositories.memory_repository import InMemoryTaskRepository
+from todoesvan.data.repositories.threaded_repository import ThreadedTaskRepository
+
+
+def run(test: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    asyncio.run(test())
+
+
+def cached(*subjects: str) -> Tuple[SharedCacheRepository, InMemoryTaskRepository]:
+    inner = InMemoryTaskRepository()
+    inner.bulk_create(list(subjects))
+    return SharedCacheRepository(ThreadedTaskRepository(inner)), inner
+
+
+def test_repeated_reads_are_hits_and_hand_out_private_copies() -> None:
+    async def main() -> None:
+        cache, _ = cached("a", "b")
+
+        first = await cache.get_tasks_page(False, 10)
+        first.tasks[0].subject = "edited by a session"
+        second = await cache.get_tasks_page(False, 10)
+
+        assert [t.subject for t in second.tasks] == ["b", "a"]
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    run(main)
+
+
+def test_identical_reads_in_flight_share_one_query() -> None:
+    async def main() -> None:
+        cache, _ = cached("a")
+
+        pages = await asyncio.gather(*(cache.get_tasks_page(False, 10) for _ in range(3)))
+
+        assert all([t.subject for t in p.tasks] == ["a"] for p in pages)
+        stats = cache.stats()
+        assert (stats.misses, stats.coalesced, stats.hits) == (1, 2, 0)
+
+    run(main)
+
+
+def test_a_write_by_one_session_is_seen_by_the_others() -> None:
+    async def main() -> None:
+        cache, _ = cached("a")
+        await cache.get_tasks_page(False, 10)  # session 1 fills the entry
+
+        await cache.create("b")  # session 2 writes
+        page = await cache.get_tasks_page(False, 10)  # session 1 reads again
+
+        assert [t.subject for t in page.tasks] == ["b", "a"]
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.invalidations) == (0, 2, 1)
+
+    run(main)
+
+
+def test_feed_events_drop_entries_and_keep_older_reads_out() -> None:
+    async def main() -> None:
+        cache, inner = cached("a")
+        await cache.get_tasks_page(False, 10)
+
+        # Another process writes: served stale until the change feed says so.
+        created = inner.create("b")
+        assert len((await cache.get_tasks_page(False, 10)).tasks) == 1
+        cache.on_feed_event(TaskEvent("INSERT", created.id, inner.current_revision()))
+        assert len((await cache.get_tasks_page(False, 10)).tasks) == 2
+
+        # A read older than the newest announced revision is handed out, not kept.
+        cache.on_feed_event(TaskEvent("UPDATE", created.id, inner.current_revision() + 1))
+        await cache.get_tasks_page(False, 10)
+        await cache.get_tasks_page(False, 10)
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.entries) == (1, 4, 0)
+
+    run(main)
@@ -0,0 +1,164 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Coroutine, List
+
+from todoesvan.state.jobs import JobQueue, Priority
+
+
+def run(test: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    asyncio.run(test())
+
+
+class Loop:
+    """A `schedule` for JobQueue that keeps the tasks it starts."""
+
+    def __init__(self) -> None:
+        self.tasks: List["asyncio.Task[Any]"] = []
+
+    def __call__(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> None:
+        self.tasks.append(asyncio.ensure_future(fn(*args)))
+
+    async def settle(self) -> None:
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+
+
+async def tick(n: int = 5) -> None:
+    for _ in range(n):
+        await asyncio.sleep(0)
+
+
+def test_waiting_jobs_start_by_priority_then_submission() -> None:
+    async def main() -> None:
+        loop = Loop()
+        queue = JobQueue(loop, limit=1)
+        gate = asyncio.Event()
+        started: List[str] = []
+
+        async def job(name: str) -> None:
+            started.append(name)
+            if name == "blocker":
+                await gate.wait()
+
+        queue.submit(Priority.WRITE, job, "blocker")
+        await tick()
+        queue.submit(Priority.BACKGROUND, job, "prefetch")
+        queue.submit(Priority.READ, job, "refresh")
+        queue.submit(Priority.WRITE, job, "flush")
+        queue.submit(Priority.READ, job, "search")
+        await tick()
+        gate.set()
+        await loop.settle()
+
+        assert started == ["blocker", "flush", "refresh", "search", "prefetch"]
+
+    run(main)
+
+
+def test_reads_leave_a_slot_for_writes() -> None:
+    async def main() -> None:
+        loop = Loop()
+        queue = JobQueue(loop, limit=2)
+        gate = asyncio.Event()
+        started: List[str] = []
+
+        async def job(name: str) -> None:
+            started.append(name)
+            await gate.wait()
+
+        queue.submit(Priority.READ, job, "read 1")
+        queue.submit(Priority.READ, job, "read 2")
+        queue.submit(Priority.WRITE, job, "write")
+        await tick()
+
+        assert started == ["read 1", "write"]
+        assert (queue.running, queue.waiting) == (2, 1)
+        gate.set()
+        await loop.settle()
+        assert started == ["read 1", "write", "read 2"]
+        assert (queue.running, queue.waiting) == (0, 0)
+
+    run(main)
+
+
+def test_identical_job_in_flight_drops_the_new_one() -> None:
+    async def main() -> None:
+        loop = Loop()
+        queue = JobQueue(loop)
+        gate = asyncio.Event()
+        started: List[str] = []
+
+        async def job(name: str) -> None:
+            started.append(name)
+            await gate.wait()
+
+        queue.submit(Priority.READ, job, "first", key="refresh")
+        await tick()
+        queue.submit(Priority.READ, job, "second", key="refresh")
+        await tick()
+        gate.set()
+        await loop.settle()
+
+        assert started == ["first"]
+
+    run(main)
+
+
+def test_supersede_cancels_the_running_job() -> None:
+    async def main() -> None:
+        loop = Loop()
+        queue = JobQueue(loop)
+        gate = asyncio.Event()
+        log: List[str] = []
+
+        async def job(name: str) -> None:
+            log.append(f"start {name}")
+            try:
+                await gate.wait()
+            except asyncio.CancelledError:
+                log.append(f"cancelled {name}")
+                raise
+            log.append(f"end {name}")
+
+        queue.submit(Priority.READ, job, "old", key="search")
+        await tick()
+        queue.submit(Priority.READ, job, "new", key="search", supersede=True)
+        await tick()
+        gate.set()
+        await loop.settle()
+
+        assert sorted(log) == ["cancelled old", "end new", "start new", "start old"]
+        # The queue cancelled it: the job's task ends quietly, not with CancelledError.
+        assert not loop.tasks[0].cancelled()
+        assert queue.running == 0
+
+    run(main)
+
+
+def test_slot_is_released_when_cancelled_right_after_being_granted() -> None:
+    async def main() -> None:
+        loop = Loop()
+        queue = JobQueue(loop, limit=1)
+        gate = asyncio.Event()
+        started: List[str] = []
+
+        async def job(name: str) -> None:
+            started.append(name)
+            if name == "blocker":
+                await gate.wait()
+                # Runs before the waiter wakes up with the slot this job frees.
+                asyncio.get_running_loop().call_soon(loop.tasks[1].cancel)
+
+        queue.submit(Priority.WRITE, job, "blocker")
+        queue.submit(Priority.READ, job, "granted then cancelled")
+        await tick()
+        gate.set()
+        await loop.settle()
+
+        assert loop.tasks[1].cancelled()
+        assert started == ["blocker"]
+        assert queue.running == 0
+
+        queue.submit(Priority.READ, job, "next")
+        await loop.settle()
+        assert started == ["blocker", "next"]
+
+    run(main)
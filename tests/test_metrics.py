@@ -0,0 +1,33 @@
+from typing import Dict
+
+from todoesvan.utils import metrics
+
+
+def test_gauges_are_read_at_each_export() -> None:
+    values: Dict[str, float] = {"size": 2, "in_use": 1}
+    metrics.register_gauges("pool", lambda: values)
+    try:
+        text = metrics.render()
+        assert "# TYPE todoesvan_pool_size gauge\ntodoesvan_pool_size 2\n" in text
+        assert "todoesvan_pool_in_use 1\n" in text
+
+        values["in_use"] = 0
+        assert "todoesvan_pool_in_use 0\n" in metrics.render()
+    finally:
+        metrics.unregister_gauges("pool")
+    assert "todoesvan_pool_" not in metrics.render()
+
+
+def test_a_failing_collector_does_not_break_the_export() -> None:
+    def broken() -> Dict[str, float]:
+        raise RuntimeError("boom")
+
+    metrics.register_gauges("broken", broken)
+    metrics.register_gauges("ok", lambda: {"value": 1})
+    try:
+        text = metrics.render()
+    finally:
+        metrics.unregister_gauges("broken")
+        metrics.unregister_gauges("ok")
+    assert "todoesvan_ok_value 1\n" in text
+    assert "todoesvan_broken" not in text
@@ -0,0 +1,102 @@
+from typing import List
+
+from todoesvan.state.outbox import Outbox, OutboxEntry
+
+NO_DELTA = {False: 0, True: 0}
+
+
+def noop() -> None:
+    pass
+
+
+def test_create_then_delete_leaves_nothing() -> None:
+    outbox = Outbox()
+    outbox.record_create(-1, "Buy milk", noop, {False: 1, True: 0})
+
+    assert outbox.record_delete(-1, noop, {False: -1, True: 0}) is False
+    assert len(outbox) == 0
+    batch, entries = outbox.drain()
+    assert batch.creates == [] and batch.deletes == [] and entries == []
+
+
+def test_toggle_and_toggle_back_cancels_out() -> None:
+    outbox = Outbox()
+    assert outbox.record_toggle(7, True, False, noop, {False: -1, True: 1}) is True
+    assert outbox.record_toggle(7, False, True, noop, {False: 1, True: -1}) is False
+
+    assert 7 not in outbox
+    assert outbox.drain()[0].completed == []
+
+
+def test_edit_back_to_the_base_subject_drops_the_edit() -> None:
+    outbox = Outbox()
+    assert outbox.record_subject(7, "Buy oat milk", "Buy milk", noop) is True
+    assert outbox.record_subject(7, "Buy bread", "Buy oat milk", noop) is True
+    assert outbox.record_subject(7, "Buy milk", "Buy bread", noop) is False
+
+    assert 7 not in outbox
+
+
+def test_edit_back_keeps_a_pending_toggle() -> None:
+    outbox = Outbox()
+    outbox.record_toggle(7, True, False, noop, {False: -1, True: 1})
+    outbox.record_subject(7, "Buy oat milk", "Buy milk", noop)
+    outbox.record_subject(7, "Buy milk", "Buy oat milk", noop)
+
+    batch, _ = outbox.drain()
+    assert batch.completed == [(7, True)]
+    assert batch.subjects == []
+
+
+def test_create_folds_later_edits_and_toggles() -> None:
+    outbox = Outbox()
+    outbox.record_create(-1, "Buy milk", noop, {False: 1, True: 0})
+    outbox.record_subject(-1, "Buy oat milk", "Buy milk", noop)
+    outbox.record_toggle(-1, True, False, noop, {False: -1, True: 1})
+
+    batch, entries = outbox.drain()
+    assert batch.creates == [(-1, "Buy oat milk", True)]
+    assert entries[0].count_delta == {False: 0, True: 1}
+
+
+def test_requeue_puts_drained_entries_back_in_front() -> None:
+    outbox = Outbox()
+    outbox.record_subject(1, "a2", "a", noop)
+    outbox.record_subject(2, "b2", "b", noop)
+    _, drained = outbox.drain()
+
+    outbox.record_subject(3, "c2", "c", noop)
+    outbox.requeue(drained)
+
+    assert [e.task_id for e in outbox.entries()] == [1, 2, 3]
+
+
+def test_requeue_folds_ops_recorded_meanwhile() -> None:
+    undone: List[str] = []
+    outbox = Outbox()
+    outbox.record_toggle(1, True, False, lambda: undone.append("toggle"), {False: -1, True: 1})
+    outbox.record_subject(2, "b2", "b", lambda: undone.append("edit"))
+    _, drained = outbox.drain()
+
+    # Recorded while the batch was in flight, against the optimistic values.
+    outbox.record_toggle(1, False, True, lambda: undone.append("toggle back"), {False: 1, True: -1})
+    outbox.record_subject(2, "b3", "b2", lambda: undone.append("edit again"))
+    outbox.requeue(drained)
+
+    entries = outbox.entries()
+    assert [e.task_id for e in entries] == [2]
+    entry: OutboxEntry = entries[0]
+    assert (entry.subject, entry.base_subject) == ("b3", "b")
+    entry.rollback()
+    assert undone == ["edit again", "edit"]
+
+
+def test_requeue_drops_a_create_deleted_meanwhile() -> None:
+    outbox = Outbox()
+    outbox.record_create(-1, "Buy milk", noop, {False: 1, True: 0})
+    _, drained = outbox.drain()
+
+    outbox.record_delete(-1, noop, {False: -1, True: 0})
+    outbox.requeue(drained)
+
+    assert len(outbox) == 0
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from typing import List
+
+from todoesvan.data.model import Task
+from todoesvan.state.task_index import TaskIndex
+
+T0 = datetime(2025, 1, 1, 12, 0, 0)
+
+
+def task(task_id: int, minutes: int = 0, subject: str = "", completed: bool = False) -> Task:
+    return Task(task_id, subject or f"task {task_id}", completed, T0 + timedelta(minutes=minutes))
+
+
+def ids(index: TaskIndex, tab: bool) -> List[int]:
+    return [t.id for t in index.tasks(tab)]
+
+
+def test_tabs_are_ordered_newest_first_then_by_id() -> None:
+    index = TaskIndex()
+    index.insert(False, task(1, minutes=0))
+    index.insert(False, task(3, minutes=5))
+    index.insert(False, task(2, minutes=5))
+    index.insert(True, task(4, minutes=1, completed=True))
+
+    assert ids(index, False) == [3, 2, 1]
+    assert ids(index, True) == [4]
+    assert (index.count(False), index.count(True)) == (3, 1)
+    assert index.take_dirty() == {False, True}
+    assert index.take_dirty() == set()
+
+
+def test_pinned_rows_sort_before_server_rows_newest_pin_first() -> None:
+    index = TaskIndex()
+    index.insert(False, task(1, minutes=10))
+    index.insert(False, task(-1), index.pin_key())
+    index.insert(False, task(-2), index.pin_key())
+
+    assert ids(index, False) == [-2, -1, 1]
+
+
+def test_move_pins_in_the_new_tab_and_returns_the_old_slot() -> None:
+    index = TaskIndex()
+    for i in range(1, 4):
+        index.insert(False, task(i, minutes=i))
+    index.insert(True, task(9, minutes=99, completed=True))
+    old_key = index.key_of(2)
+
+    moved = index.move(2, True)
+
+    assert moved == (False, old_key)
+    assert ids(index, False) == [3, 1]
+    assert ids(index, True) == [2, 9]  # pinned above newer server rows
+    assert index.tab_of(2) is True
+    assert index.move(42, True) is None
+
+
+def test_move_back_with_the_old_key_restores_the_slot() -> None:
+    index = TaskIndex()
+    for i in range(1, 4):
+        index.insert(False, task(i, minutes=i))
+    moved = index.move(2, True)
+    assert moved is not None
+
+    index.move(2, *moved)
+
+    assert ids(index, False) == [3, 2, 1]
+    assert ids(index, True) == []
+
+
+def test_replace_keeps_the_placeholder_slot() -> None:
+    index = TaskIndex()
+    index.insert(False, task(1, minutes=1))
+    index.insert(False, task(-1, subject="new"), index.pin_key())
+
+    assert index.replace(-1, task(7, minutes=0, subject="new")) is True
+
+    assert ids(index, False) == [7, 1]
+    assert -1 not in index
+    assert index.filter(False, ["new"])[0].id == 7
+    assert index.replace(-1, task(8)) is False
+
+
+def test_replace_tab_drops_rows_missing_from_the_new_content() -> None:
+    index = TaskIndex()
+    for i in range(1, 4):
+        index.insert(False, task(i, minutes=i, subject=f"row{i}"))
+    index.insert(True, task(9, subject="done", completed=True))
+
+    fresh = [task(3, minutes=3, subject="row3"), task(5, minutes=5, subject="row5")]
+    index.replace_tab(False, [(t, TaskIndex.server_key(t)) for t in fresh])
+
+    assert ids(index, False) == [5, 3]
+    assert 1 not in index and 2 not in index
+    assert index.filter(False, ["row1"]) == []
+    assert [t.id for t in index.filter(False, ["row"])] == [5, 3]
+    assert ids(index, True) == [9]
+
+
+def test_refreshed_key_reuses_the_key_unless_pinned_or_changed() -> None:
+    index = TaskIndex()
+    t = task(1, minutes=1)
+    index.insert(False, t)
+    assert index.refreshed_key(Task(1, "x", False, t.created_at)) is index.key_of(1)
+
+    index.move(1, False)  # pinned now
+    assert index.refreshed_key(t) == TaskIndex.server_key(t)
+
+
+def test_filter_follows_edits_and_removal() -> None:
+    index = TaskIndex()
+    t = task(1, subject="Buy milk")
+    index.insert(False, t)
+    index.insert(True, task(2, subject="Buy bread", completed=True))
+
+    assert [x.id for x in index.filter(False, ["buy"])] == [1]
+    t.subject = "Sell milk"
+    index.reindex(1)
+    assert index.filter(False, ["buy"]) == []
+    assert [x.id for x in index.filter(False, ["sell"])] == [1]
+
+    index.remove(1)
+    assert index.filter(False, ["sell"]) == []
+    assert len(index.tasks(False)) == 0
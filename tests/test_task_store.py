@@ -0,0 +1,311 @@
+import asyncio
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Optional
+
+import pytest
+
+from todoesvan.data.model import Task
+from todoesvan.data.repositories.memory_repository import InMemoryTaskRepository
+from todoesvan.services.task_service import TaskService
+from todoesvan.state.journal import OutboxJournal
+from todoesvan.state.outbox import OutboxEntry
+from todoesvan.state.snapshot import Snapshot, SnapshotFile
+from todoesvan.state.task_store import ChangeSet, TaskStore
+
+
+class Harness:
+    """A TaskStore over the in-memory repository, driven by hand on a private loop."""
+
+    def __init__(
+        self,
+        subjects: List[str],
+        page_size: int = 50,
+        snapshot: Optional[SnapshotFile] = None,
+        journal: Optional[OutboxJournal] = None,
+    ) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.repo = InMemoryTaskRepository()
+        self.repo.bulk_create(subjects)
+        self.errors: List[str] = []
+        self.changes: List[ChangeSet] = []
+        self.pending: List["asyncio.Future[Any]"] = []
+        self.store = TaskStore(
+            TaskService(self.repo),
+            self.schedule,
+            self.changes.append,
+            self.errors.append,
+            page_size=page_size,
+            snapshot=snapshot,
+            journal=journal,
+            snapshot_delay=0,
+            flush_window=0,
+            frame_interval=0,
+            search_delay=0,
+            retry_delay=0,
+        )
+
+    def schedule(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> None:
+        self.pending.append(asyncio.ensure_future(fn(*args), loop=self.loop))
+
+    def run(self) -> None:
+        """Runs everything scheduled, including what it schedules in turn."""
+
+        async def drain() -> None:
+            while self.pending:
+                await asyncio.gather(*self.pending[:])
+                self.pending = [f for f in self.pending if not f.done()]
+
+        self.loop.run_until_complete(drain())
+
+    def subjects(self, completed: bool) -> List[str]:
+        return [t.subject for t in self.store.tasks(completed)]
+
+    def find(self, subject: str) -> Task:
+        task = next((t for t in self.store.tasks(False) + self.store.tasks(True) if t.subject == subject), None)
+        assert task is not None, subject
+        return task
+
+    def close(self) -> None:
+        self.loop.close()
+
+
+def loaded(subjects: List[str], page_size: int = 50) -> Harness:
+    h = Harness(subjects, page_size)
+    h.store.warm_cache_both()
+    h.run()
+    return h
+
+
+def test_warm_loads_both_tabs_newest_first() -> None:
+    h = loaded(["a", "b", "c"])
+    assert h.subjects(False) == ["c", "b", "a"]
+    assert h.subjects(True) == []
+    assert (h.store.count(False), h.store.count(True)) == (3, 0)
+    assert h.store.loaded
+    h.close()
+
+
+def test_toggle_moves_the_task_and_persists_it() -> None:
+    h = loaded(["a", "b", "c"])
+    b = h.find("b")
+
+    h.store.toggle_completed(b.id, True)
+    # Optimistic: moved (pinned on top of Completed) before the write lands.
+    assert h.subjects(False) == ["c", "a"]
+    assert h.subjects(True) == ["b"]
+    assert h.store.queued_writes == 1
+    assert (h.store.count(False), h.store.count(True)) == (2, 1)
+
+    h.run()
+    assert h.repo.get_tasks(True)[0].id == b.id
+    assert h.store.queued_writes == 0
+    assert (h.store.count(False), h.store.count(True)) == (2, 1)
+    assert h.errors == []
+    h.close()
+
+
+def test_toggle_of_an_unknown_task_changes_nothing() -> None:
+    h = loaded(["a"])
+    h.store.toggle_completed(999, True)
+    assert h.store.queued_writes == 0
+    h.close()
+
+
+def test_failed_toggle_rolls_back_into_the_old_slot(monkeypatch: pytest.MonkeyPatch) -> None:
+    h = loaded(["a", "b", "c"])
+    b = h.find("b")
+
+    def fail(*args: Any) -> Any:
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(h.repo, "apply_batch", fail)
+    h.store.toggle_completed(b.id, True)
+    h.run()
+
+    assert h.subjects(False) == ["c", "b", "a"]
+    assert b.completed is False
+    assert (h.store.count(False), h.store.count(True)) == (3, 0)
+    assert h.errors
+    h.close()
+
+
+def test_create_shows_a_placeholder_then_the_real_row() -> None:
+    h = loaded(["a"])
+
+    h.store.create_task("new")
+    placeholder = h.store.tasks(False)[0]
+    assert (placeholder.id < 0, placeholder.subject) == (True, "new")
+    assert h.store.count(False) == 2
+
+    h.run()
+    created = h.store.tasks(False)[0]
+    assert created.id > 0 and created.subject == "new"
+    assert h.store.task(placeholder.id) is None
+    assert [t.subject for t in h.repo.get_tasks(False)] == ["new", "a"]
+    assert h.store.queued_writes == 0
+    h.close()
+
+
+def test_create_then_delete_before_the_flush_writes_nothing() -> None:
+    h = loaded(["a"])
+    h.store.create_task("gone")
+    h.store.delete_task(h.store.tasks(False)[0].id)
+    h.run()
+
+    assert h.subjects(False) == ["a"]
+    assert [t.subject for t in h.repo.get_tasks(False)] == ["a"]
+    assert h.store.count(False) == 1
+    h.close()
+
+
+def test_load_more_appends_the_next_page() -> None:
+    h = loaded([f"t{i}" for i in range(7)], page_size=3)
+    assert h.subjects(False) == ["t6", "t5", "t4"]
+    assert h.store.has_more(False)
+
+    h.store.load_more(False)
+    assert h.store.is_loading_more(False)
+    h.run()
+    assert h.subjects(False) == ["t6", "t5", "t4", "t3", "t2", "t1"]
+
+    h.store.load_more(False)
+    h.run()
+    assert h.subjects(False) == [f"t{i}" for i in range(6, -1, -1)]
+    assert not h.store.has_more(False)
+    assert h.store.count(False) == 7
+    h.close()
+
+
+def test_refresh_keeps_unsaved_local_changes() -> None:
+    h = loaded(["a", "b", "c"])
+    b = h.find("b")
+    # Someone else edits another row while our toggle is still queued.
+    h.repo.update_subject(h.find("a").id, "a2")
+    h.store.toggle_completed(b.id, True)
+
+    merged = h.store._merge_with_local_overrides(False, h.repo.get_tasks(False))
+    assert [t.subject for t, _ in merged] == ["c", "a2"]  # the pending toggle isn't resurrected
+    merged = h.store._merge_with_local_overrides(True, h.repo.get_tasks(True))
+    assert [t.subject for t, _ in merged] == ["b"]  # ... and stays in Completed
+
+    h.store.refresh_tab(False)
+    h.run()
+    assert h.subjects(False) == ["c", "a2"]
+    assert h.subjects(True) == ["b"]
+    h.close()
+
+
+def test_refresh_keeps_a_placeholder_pinned_on_top() -> None:
+    h = loaded(["a", "b"])
+    h.store.create_task("new")
+    merged = h.store._merge_with_local_overrides(False, h.repo.get_tasks(False))
+    assert [t.subject for t, _ in merged] == ["new", "b", "a"]
+    h.run()
+    h.close()
+
+
+def test_changes_are_announced() -> None:
+    h = loaded(["a"])
+    h.changes.clear()
+    h.store.create_task("new")
+    h.run()
+    assert any(c.counts for c in h.changes)
+    assert any(c.touches(False) for c in h.changes)
+    h.close()
+
+
+def test_local_state_shows_the_snapshot_until_the_database_answers(tmp_path: Path) -> None:
+    snapshot_file = SnapshotFile(tmp_path / "tasks.snapshot.json.gz")
+    snapshot = Snapshot()
+    snapshot.tasks[False] = [Task(7, "cached", False)]
+    snapshot.counts[False] = 1
+    snapshot_file.save(snapshot)
+    h = Harness(["a", "b"], snapshot=snapshot_file)
+
+    # Files are read and applied first; the revalidation is only queued.
+    h.loop.run_until_complete(h.store._load_local_state())
+    assert h.subjects(False) == ["cached"]
+    assert not h.store.loaded
+
+    h.run()
+    assert h.subjects(False) == ["b", "a"]
+    assert h.store.count(False) == 2
+    h.close()
+
+
+def test_journaled_writes_replay_alongside_ones_made_before_they_load(tmp_path: Path) -> None:
+    journal = OutboxJournal(tmp_path / "outbox.journal.json")
+    journal.save([OutboxEntry(task_id=-1, create_subject="offline")])
+    h = Harness(["a"], journal=journal)
+
+    # Recorded before the journal is read: its placeholder takes temp id -1 too.
+    h.store.create_task("new")
+    h.store.load_local_state()
+    h.run()
+
+    assert sorted(t.subject for t in h.repo.get_tasks(False)) == ["a", "new", "offline"]
+    assert sorted(h.subjects(False)) == ["a", "new", "offline"]
+    assert h.store.queued_writes == 0
+    assert not journal.path.exists()
+    h.close()
+
+
+def results(h: Harness) -> List[str]:
+    return [t.subject for t in h.store.search_results()]
+
+
+def test_search_shows_cached_matches_until_the_server_answers() -> None:
+    h = loaded(["buy milk", "walk dog", "milk cow", "call mom"], page_size=2)
+    assert h.subjects(False) == ["call mom", "milk cow"]
+
+    h.store.search("Milk", False)
+    assert h.store.search_query == "milk"
+    assert results(h) == ["milk cow"]  # loaded rows only
+
+    h.run()
+    assert results(h) == ["milk cow", "buy milk"]
+    assert not h.store.is_search_loading()
+    h.close()
+
+
+def test_filter_follows_edits_and_deletes() -> None:
+    h = loaded(["buy milk", "buy bread"])
+
+    h.store.update_subject(h.find("buy milk").id, "sell milk")
+    assert [t.subject for t in h.store.filter_tasks("buy", False)] == ["buy bread"]
+    assert [t.subject for t in h.store.filter_tasks("sell", False)] == ["sell milk"]
+
+    h.store.delete_task(h.find("buy bread").id)
+    assert h.store.filter_tasks("buy", False) == []
+    h.run()
+    h.close()
+
+
+def test_acting_on_a_hit_past_the_loaded_pages_adopts_it() -> None:
+    h = loaded(["buy milk", "walk dog", "call mom"], page_size=1)
+    h.store.search("milk", False)
+    h.run()
+    hit = h.store.search_results()[0]
+    assert hit.subject == "buy milk"
+    assert h.subjects(False) == ["call mom"]  # past the loaded page
+
+    h.store.toggle_completed(hit.id, True)
+    # Indexed, moved to Completed, and no longer a hit in Pending.
+    assert h.subjects(True) == ["buy milk"]
+    assert results(h) == []
+
+    h.run()
+    assert [t.subject for t in h.repo.get_tasks(True)] == ["buy milk"]
+    h.close()
+
+
+def test_search_results_show_local_edits_and_hide_pending_deletes() -> None:
+    h = loaded(["buy milk", "buy bread"])
+    h.store.search("buy", False)
+    h.run()
+
+    h.store.update_subject(h.find("buy milk").id, "buy oat milk")
+    h.store.delete_task(h.find("buy bread").id)
+    assert results(h) == ["buy oat milk"]
+    h.run()
+    h.close()
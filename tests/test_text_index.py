@@ -0,0 +1,71 @@
+from typing import Set
+
+from todoesvan.data.repositories.base import search_terms
+from todoesvan.state.text_index import TextIndex
+
+
+def find(index: TextIndex, query: str) -> Set[int]:
+    return index.search(search_terms(query))
+
+
+def indexed(*subjects: str) -> TextIndex:
+    index = TextIndex()
+    for task_id, subject in enumerate(subjects, start=1):
+        index.add(task_id, subject)
+    return index
+
+
+def test_terms_match_word_prefixes_only() -> None:
+    index = indexed("Buy milk", "Milkshake", "Call Camille")
+
+    assert find(index, "mi") == {1, 2}
+    assert find(index, "milk") == {1, 2}
+    assert find(index, "milks") == {2}
+    # Inside a word is no match, even past the indexed 3-char prefix.
+    assert find(index, "ilk") == set()
+    assert find(index, "mille") == set()
+
+
+def test_every_term_must_match_some_word() -> None:
+    index = indexed("Buy milk", "Buy bread", "Milk the cow")
+
+    assert find(index, "buy milk") == {1}
+    assert find(index, "milk buy") == {1}
+    assert find(index, "buy cow") == set()
+    assert find(index, "") == set()
+    assert find(index, "!!") == set()
+
+
+def test_case_folds_accented_letters_too() -> None:
+    index = indexed("CAFÉ con leche", "Reunión del AÑO")
+
+    assert find(index, "café") == {1}
+    assert find(index, "Ca") == {1}
+    assert find(index, "reunión año") == {2}
+    assert find(index, "AÑO") == {2}
+    # Accents are kept (like the server's 'simple' text search).
+    assert find(index, "reunion") == set()
+
+
+def test_update_replaces_the_old_words() -> None:
+    index = indexed("Buy milk")
+
+    index.add(1, "Sell bread")
+    assert find(index, "milk") == set()
+    assert find(index, "bre") == {1}
+    assert find(index, "bread") == {1}
+    assert len(index) == 1
+
+
+def test_remove_drops_the_task_from_every_posting() -> None:
+    index = indexed("Buy milk", "Buy bread")
+
+    index.remove(1)
+    assert find(index, "buy") == {2}
+    assert find(index, "milk") == set()
+    assert len(index) == 1
+
+    index.remove(1)  # unknown ids are ignored
+    index.remove(2)
+    assert find(index, "b") == set()
+    assert index._postings == {}